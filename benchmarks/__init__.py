@@ -0,0 +1,22 @@
+"""Offline benchmarks of the transaction parser and the order books."""
+
+from benchmarks.suite import (
+    Case,
+    compare_results,
+    measure,
+    recorded_cases,
+    run_suite,
+    synthetic_cases,
+)
+from benchmarks.synthetic import SyntheticData, SyntheticOrderBook
+
+__all__ = [
+    "Case",
+    "SyntheticData",
+    "SyntheticOrderBook",
+    "compare_results",
+    "measure",
+    "recorded_cases",
+    "run_suite",
+    "synthetic_cases",
+]
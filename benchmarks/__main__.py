@@ -0,0 +1,136 @@
+"""
+Runs the benchmarks and writes their results as JSON.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --quick --baseline results.json
+    python -m benchmarks --recorded transactions.jsonl --only normalize_nodes
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional
+
+from benchmarks.suite import (
+    BOOK_DEPTHS,
+    QUICK_BOOK_DEPTHS,
+    QUICK_TRANSACTION_SIZES,
+    QUICK_UNIVERSE_SIZES,
+    TRANSACTION_SIZES,
+    UNIVERSE_SIZES,
+    Case,
+    compare_results,
+    recorded_cases,
+    run_suite,
+    synthetic_cases,
+)
+
+
+def _parse_arguments(arguments: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks of the transaction parser and the order books.",
+    )
+    parser.add_argument(
+        "--output", help="File the JSON results are written to. Defaults to stdout."
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Measure smaller order books, universes and transactions.",
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per case.")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="Minimal seconds per round."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the data.")
+    parser.add_argument(
+        "--only", action="append", help="Measure only this benchmark. Repeatable."
+    )
+    parser.add_argument(
+        "--recorded",
+        action="append",
+        default=[],
+        help="File of recorded transactions, one JSON transaction per line. "
+        "Repeatable.",
+    )
+    parser.add_argument(
+        "--no-synthetic", action="store_true", help="Skip the synthetic data."
+    )
+    parser.add_argument(
+        "--baseline", help="JSON results of an earlier run to compare against."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Share a median may grow by before it counts as regression.",
+    )
+    return parser.parse_args(arguments)
+
+
+def _report(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['benchmark']} [{result['source']}] {result['params']}: "
+        f"{result['median'] * 1e6:.1f} us",
+        file=sys.stderr,
+    )
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    """
+    Args:
+        arguments: The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        The exit status, 1 if the run regressed against the baseline.
+    """
+    options = _parse_arguments(arguments=arguments)
+    cases: List[Iterable[Case]] = []
+    if not options.no_synthetic:
+        cases.append(
+            synthetic_cases(
+                seed=options.seed,
+                depths=QUICK_BOOK_DEPTHS if options.quick else BOOK_DEPTHS,
+                universes=QUICK_UNIVERSE_SIZES if options.quick else UNIVERSE_SIZES,
+                sizes=QUICK_TRANSACTION_SIZES if options.quick else TRANSACTION_SIZES,
+            )
+        )
+    cases.extend(recorded_cases(path=path) for path in options.recorded)
+    results = run_suite(
+        cases=chain.from_iterable(cases),
+        rounds=options.rounds,
+        min_time=options.min_time,
+        only=options.only,
+        progress=_report,
+    )
+    results["config"]["seed"] = options.seed
+    results["config"]["quick"] = options.quick
+    status = 0
+    if options.baseline is not None:
+        with open(options.baseline) as file:
+            regressions = compare_results(
+                baseline=json.load(file), current=results, tolerance=options.tolerance
+            )
+        results["regressions"] = regressions
+        for regression in regressions:
+            print(
+                f"regression: {regression['benchmark']} [{regression['source']}] "
+                f"{regression['params']}: {regression['ratio']:.2f}x",
+                file=sys.stderr,
+            )
+        status = 1 if regressions else 0
+    if options.output is not None:
+        with open(options.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
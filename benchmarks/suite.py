@@ -0,0 +1,536 @@
+"""
+Benchmarks of the parser and order book hot paths on synthetic and recorded
+transactions. The results are plain dictionaries that serialize to JSON, so
+runs can be stored and compared to catch regressions.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from itertools import cycle
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from benchmarks.synthetic import SyntheticData, SyntheticOrderBook
+from xrpl_trading_bot.order_books import OrderBook, OrderBooks
+from xrpl_trading_bot.order_books.columns import numpy_available
+from xrpl_trading_bot.txn_parser import (
+    OrderBookSide,
+    ParsedTransaction,
+    Quality,
+    SubscriptionRawTxnType,
+    derive_order_book_side,
+    parse_final_balances,
+    parse_final_order_book,
+    parse_order_book_changes,
+)
+from xrpl_trading_bot.txn_parser.utils import normalize_nodes
+
+FORMAT_VERSION = 1
+"""Version of the result format."""
+BOOK_DEPTHS = (10, 100, 1000, 10000)
+"""Offers per side of the order books `parse_final_order_book` runs on."""
+UNIVERSE_SIZES = (10, 100, 1000)
+"""Number of order books `OrderBooks.update_order_books` chooses from."""
+TRANSACTION_SIZES = (1, 10, 50, 200)
+"""Affected nodes of the transactions the parsers run on."""
+QUICK_BOOK_DEPTHS = (10, 100, 1000)
+QUICK_UNIVERSE_SIZES = (10, 100)
+QUICK_TRANSACTION_SIZES = (1, 10, 50)
+UNIVERSE_DEPTH = 20
+"""Offers per side of every order book of a universe."""
+ORDER_BOOK_TRANSACTION_SIZE = 10
+"""Affected nodes of the transactions applied to order books."""
+TRANSACTION_KINDS = ("offer_create", "payment")
+"""The synthetic transaction types."""
+MAX_NUMBER = 100000
+"""Upper bound of the calls measured per round."""
+
+
+@dataclass
+class Case:
+    """A benchmark with one set of parameters."""
+
+    benchmark: str
+    """The name of the measured function."""
+    params: Dict[str, Any]
+    """The parameters the data was generated with."""
+    run: Callable[[Any], Any]
+    """The measured call."""
+    data: Any = None
+    """The input of `run`, if `run` leaves it unchanged."""
+    setup: Optional[Callable[[], Any]] = None
+    """
+    Builds the input of `run` before every call, if `run` changes its input.
+    Not measured.
+    """
+    source: str = field(default="synthetic")
+    """Where the data comes from, `synthetic` or the name of the recorded file."""
+
+
+def _time_call(case: Case, state: Any) -> float:
+    start = perf_counter()
+    case.run(state)
+    return perf_counter() - start
+
+
+def measure(case: Case, rounds: int, min_time: float) -> Dict[str, Any]:
+    """
+    Measures a case. Every round calls `run` often enough to take at least
+    `min_time` and records the mean time of a call. The garbage collector is
+    disabled while measuring, like `timeit` does.
+
+    Args:
+        case: The case.
+        rounds: The number of rounds.
+        min_time: The minimal time of a round in seconds.
+
+    Returns:
+        The statistics of the seconds per call over all rounds.
+    """
+    state = case.setup() if case.setup is not None else case.data
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # the first call warms up caches and calibrates the calls per round
+        first = _time_call(case=case, state=state)
+        number = max(1, min(MAX_NUMBER, int(min_time / first) if first else 1))
+        samples = []
+        for _ in range(rounds):
+            elapsed = 0.0
+            for _ in range(number):
+                if case.setup is not None:
+                    state = case.setup()
+                elapsed += _time_call(case=case, state=state)
+            samples.append(elapsed / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    median = statistics.median(samples)
+    return {
+        "benchmark": case.benchmark,
+        "source": case.source,
+        "params": case.params,
+        "rounds": rounds,
+        "number": number,
+        "min": min(samples),
+        "median": median,
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_second": 1 / median if median else None,
+    }
+
+
+def _parse_snapshot(state: Tuple[SyntheticOrderBook, Dict[str, Any]]) -> Any:
+    book, transaction = state
+    return parse_final_order_book(
+        asks=book.asks,
+        bids=book.bids,
+        transaction=cast(SubscriptionRawTxnType, transaction),
+        to_xrp=True,
+        currency_pair=book.currency_pair,
+    )
+
+
+def _copy_sides(
+    asks: OrderBookSide, bids: OrderBookSide, book: SyntheticOrderBook
+) -> Tuple[OrderBookSide, OrderBookSide, SyntheticOrderBook]:
+    # updates replace offers instead of changing them, so copies share them
+    return (
+        OrderBookSide(offers=list(asks), unit=asks.unit),
+        OrderBookSide(offers=list(bids), unit=bids.unit),
+        book,
+    )
+
+
+def _parse_sides(
+    transaction: Dict[str, Any],
+    state: Tuple[OrderBookSide, OrderBookSide, SyntheticOrderBook],
+) -> Any:
+    asks, bids, book = state
+    return parse_final_order_book(
+        asks=asks,
+        bids=bids,
+        transaction=cast(SubscriptionRawTxnType, transaction),
+        to_xrp=True,
+        currency_pair=book.currency_pair,
+    )
+
+
+def _order_book_cases(data: SyntheticData, depths: Iterable[int]) -> Iterator[Case]:
+    for depth in depths:
+        book = data.order_book(depth=depth)
+        transaction = data.offer_create(
+            book=book, affected_nodes=ORDER_BOOK_TRANSACTION_SIZE
+        )
+        # sides given as lists are derived on every call, like a fresh snapshot
+        yield Case(
+            benchmark="parse_final_order_book",
+            params={"depth": depth, "sides": "snapshot"},
+            data=(book, transaction),
+            run=_parse_snapshot,
+        )
+        # derived sides are updated in place, like the sides of `OrderBooks`
+        yield Case(
+            benchmark="parse_final_order_book",
+            params={"depth": depth, "sides": "derived"},
+            setup=partial(
+                _copy_sides,
+                derive_order_book_side(
+                    offers=book.asks, pair=book.currency_pair, to_xrp=True
+                ),
+                derive_order_book_side(
+                    offers=book.bids, pair=book.currency_pair, to_xrp=True
+                ),
+                book,
+            ),
+            run=partial(_parse_sides, transaction),
+        )
+
+
+def _transaction_cases(
+    benchmark: str,
+    run: Callable[[Any], Any],
+    data: SyntheticData,
+    sizes: Iterable[int],
+) -> Iterator[Case]:
+    book = data.order_book(depth=max(sizes))
+    for size in sizes:
+        for kind in TRANSACTION_KINDS:
+            transaction = getattr(data, kind)(book=book, affected_nodes=size)
+            yield Case(
+                benchmark=benchmark,
+                params={"affected_nodes": size, "transaction_type": kind},
+                data=transaction,
+                run=run,
+            )
+
+
+def _update_cases(data: SyntheticData, universes: Iterable[int]) -> Iterator[Case]:
+    for universe in universes:
+        books = data.universe(pairs=universe, depth=UNIVERSE_DEPTH)
+        order_books = OrderBooks()
+        for book in books:
+            order_books.set_order_book(
+                OrderBook.from_snapshot(
+                    asks=book.asks, bids=book.bids, currency_pair=book.currency_pair
+                )
+            )
+        # the transactions touch the order books round robin
+        rotation = cycle(
+            [
+                (
+                    book,
+                    data.offer_create(
+                        book=book, affected_nodes=ORDER_BOOK_TRANSACTION_SIZE
+                    ),
+                )
+                for book in data.random.sample(books, min(len(books), 50))
+            ]
+        )
+
+        def setup(
+            order_books: OrderBooks = order_books,
+            rotation: Iterator[Tuple[SyntheticOrderBook, Dict[str, Any]]] = rotation,
+        ) -> Tuple[OrderBooks, Dict[str, Any]]:
+            book, transaction = next(rotation)
+            # restore the snapshot of the order book the transaction touches
+            order_books.set_order_book(
+                OrderBook.from_snapshot(
+                    asks=book.asks, bids=book.bids, currency_pair=book.currency_pair
+                )
+            )
+            return order_books, transaction
+
+        yield Case(
+            benchmark="OrderBooks.update_order_books",
+            params={"universe": universe, "depth": UNIVERSE_DEPTH},
+            setup=setup,
+            run=lambda state: state[0].update_order_books(transaction=state[1]),
+        )
+
+
+PARSERS: Dict[str, Callable[[Any], Any]] = {
+    "parse_order_book_changes": lambda transaction: parse_order_book_changes(
+        transaction=transaction
+    ),
+    "parse_final_balances": lambda transaction: parse_final_balances(
+        transaction=transaction
+    ),
+    "normalize_nodes": lambda transaction: normalize_nodes(
+        transaction_data=transaction
+    ),
+}
+"""The benchmarks of parsers that take a single raw transaction."""
+
+
+def synthetic_cases(
+    seed: int = 0,
+    depths: Sequence[int] = BOOK_DEPTHS,
+    universes: Sequence[int] = UNIVERSE_SIZES,
+    sizes: Sequence[int] = TRANSACTION_SIZES,
+) -> Iterator[Case]:
+    """
+    Generates the cases on synthetic data. The data of a case is generated
+    when the case is reached, so large order books are not kept alive.
+
+    Args:
+        seed: The seed of the generated data. Defaults to 0.
+        depths: Offers per side of the parsed order books.
+        universes: Number of order books transactions are applied to.
+        sizes: Affected nodes of the parsed transactions.
+
+    Yields:
+        The cases.
+    """
+    data = SyntheticData(seed=seed)
+    yield from _order_book_cases(data=data, depths=depths)
+    for benchmark, run in PARSERS.items():
+        yield from _transaction_cases(
+            benchmark=benchmark, run=run, data=data, sizes=sizes
+        )
+    yield from _update_cases(data=data, universes=universes)
+
+
+def load_transactions(path: str) -> List[Dict[str, Any]]:
+    """
+    Loads a file of recorded transactions, one JSON transaction per line, as
+    `parse_transaction_files` reads them.
+
+    Args:
+        path: The file.
+
+    Returns:
+        The raw transactions.
+    """
+    with open(path, "rb") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def _run_all(run: Callable[[Any], Any], transactions: List[Any]) -> List[Any]:
+    return [run(transaction) for transaction in transactions]
+
+
+def _currency(amount: Any) -> str:
+    if isinstance(amount, dict):
+        return f"{amount['currency']}.{amount['issuer']}"
+    return "XRP"
+
+
+def _previous_offers(
+    transactions: List[ParsedTransaction], currency_pairs: Iterable[str]
+) -> Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    # the offers a recording touches before it creates them existed before it
+    # started; their previous state rebuilds the asks and bids it ran against
+    offers: Dict[str, Dict[str, Any]] = {}
+    created = set()
+    for transaction in transactions:
+        for affected_node in transaction.offer_nodes:
+            diff_type, node = next(iter(affected_node.items()))
+            index = node["LedgerIndex"]
+            if index in offers or index in created:
+                continue
+            if diff_type == "CreatedNode":
+                created.add(index)
+                continue
+            offer = {**node["FinalFields"], **node.get("PreviousFields", {})}
+            for name in ("PreviousTxnID", "PreviousTxnLgrSeq"):
+                # modified nodes carry them next to their fields
+                if name in node:
+                    offer[name] = node[name]
+            offer["index"] = index
+            offer["quality"] = "{:f}".format(
+                Quality.from_book_directory(book_directory=offer["BookDirectory"])
+                .to_amount()
+                .to_decimal()
+            )
+            offers[index] = offer
+    sides: Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+    for currency_pair in currency_pairs:
+        base = currency_pair.split("/")[0]
+        pair_offers = [
+            offer
+            for offer in offers.values()
+            if f"{_currency(offer['TakerGets'])}/{_currency(offer['TakerPays'])}"
+            in (currency_pair, "/".join(reversed(currency_pair.split("/"))))
+        ]
+        sides[currency_pair] = (
+            [offer for offer in pair_offers if _currency(offer["TakerGets"]) == base],
+            [offer for offer in pair_offers if _currency(offer["TakerGets"]) != base],
+        )
+    return sides
+
+
+def recorded_cases(path: str) -> Iterator[Case]:
+    """
+    Generates the cases on a file of recorded transactions. Every call runs
+    on all transactions of the file in order.
+
+    Args:
+        path: The file.
+
+    Yields:
+        The cases.
+    """
+    transactions = load_transactions(path=path)
+    parsed = [ParsedTransaction.of(transaction=txn) for txn in transactions]
+    # `normalize_nodes` takes transactions in JSON mode
+    normalized = [transaction.transaction for transaction in parsed]
+    source = os.path.basename(path)
+    params = {"transactions": len(transactions)}
+    for benchmark, run in PARSERS.items():
+        yield Case(
+            benchmark=benchmark,
+            params=params,
+            data=normalized if benchmark == "normalize_nodes" else transactions,
+            run=partial(_run_all, run),
+            source=source,
+        )
+    currency_pairs = sorted(
+        set().union(*(transaction.affected_currency_pairs for transaction in parsed))
+    )
+
+    sides = _previous_offers(transactions=parsed, currency_pairs=currency_pairs)
+
+    def setup() -> OrderBooks:
+        order_books = OrderBooks()
+        for currency_pair, (asks, bids) in sides.items():
+            order_books.set_order_book(
+                OrderBook.from_snapshot(
+                    asks=deepcopy(asks),
+                    bids=deepcopy(bids),
+                    currency_pair=currency_pair,
+                )
+            )
+        return order_books
+
+    yield Case(
+        benchmark="OrderBooks.update_order_books",
+        params={**params, "order_books": len(currency_pairs)},
+        setup=setup,
+        run=lambda order_books: [
+            order_books.update_order_books(transaction=transaction)
+            for transaction in transactions
+        ],
+        source=source,
+    )
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Returns:
+        The interpreter and the platform the benchmarks ran on.
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy_available(),
+    }
+
+
+def run_suite(
+    cases: Iterable[Case],
+    rounds: int = 5,
+    min_time: float = 0.05,
+    only: Optional[Sequence[str]] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Measures the cases.
+
+    Args:
+        cases: The cases.
+        rounds: The number of rounds of every case. Defaults to 5.
+        min_time: The minimal time of a round in seconds. Defaults to 0.05.
+        only: Measure only these benchmarks. Defaults to all benchmarks.
+        progress: Gets called with the result of every case. Defaults to None.
+
+    Returns:
+        The results with the environment, ready to be dumped as JSON.
+    """
+    results = []
+    for case in cases:
+        if only is not None and case.benchmark not in only:
+            continue
+        result = measure(case=case, rounds=rounds, min_time=min_time)
+        if progress is not None:
+            progress(result)
+        results.append(result)
+    return {
+        "version": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "config": {"rounds": rounds, "min_time": min_time},
+        "results": results,
+    }
+
+
+def _result_key(result: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (
+        result["benchmark"],
+        result["source"],
+        json.dumps(result["params"], sort_keys=True),
+    )
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.25
+) -> List[Dict[str, Any]]:
+    """
+    Compares the medians of two runs. Cases that only one of the runs
+    measured are ignored.
+
+    Args:
+        baseline: The results of the earlier run.
+        current: The results of the new run.
+        tolerance: The share a median may grow by before it counts as
+            regression. Defaults to 0.25.
+
+    Returns:
+        The regressions with the medians of both runs and their ratio.
+    """
+    baseline_results = {
+        _result_key(result=result): result for result in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        previous = baseline_results.get(_result_key(result=result))
+        if previous is None or not previous["median"]:
+            continue
+        ratio = result["median"] / previous["median"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                {
+                    "benchmark": result["benchmark"],
+                    "source": result["source"],
+                    "params": result["params"],
+                    "baseline": previous["median"],
+                    "current": result["median"],
+                    "ratio": ratio,
+                }
+            )
+    return regressions
@@ -0,0 +1,624 @@
+"""
+Synthetic order books and transactions shaped like the data the XRP Ledger
+answers with, so the parser and the order books can be measured offline.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from hashlib import sha512
+from random import Random
+from typing import Any, Dict, List, Optional, Tuple
+
+from xrpl.core.addresscodec import encode_classic_address
+
+from xrpl_trading_bot.txn_parser import CURRENCY_AMOUNT_TYPE
+
+Currency = Optional[Tuple[str, str]]
+"""An issued currency as currency code and issuer, or None for XRP."""
+
+ACCOUNT_ZERO = "rrrrrrrrrrrrrrrrrrrrBZbvji"
+"""The issuer of the balance of a trust line."""
+PRICE_STEP = 1.0005
+"""The factor between the prices of two neighbouring offers of a side."""
+NODES_PER_OFFER = 3
+"""An offer node and the nodes of both currencies of the offer owner."""
+FIXED_NODES = 3
+"""
+The first node of a transaction (the created offer of an OfferCreate or the
+destination balance of a Payment) and the nodes of both currencies of the
+sender.
+"""
+
+
+def currency_name(currency: Currency) -> str:
+    """
+    Args:
+        currency: The currency.
+
+    Returns:
+        The currency as `currency.issuer` or `XRP`.
+    """
+    return "XRP" if currency is None else f"{currency[0]}.{currency[1]}"
+
+
+def encode_quality(quality: Decimal) -> str:
+    """
+    Encodes a quality the way the last 64 bits of a book directory do:
+    8 bits exponent (offset by 100) followed by 56 bits mantissa.
+
+    Args:
+        quality: TakerPays divided by TakerGets, XRP in drops.
+
+    Returns:
+        The encoded quality as upper case hex.
+    """
+    _, digits, exponent = quality.normalize().as_tuple()
+    mantissa = int("".join(str(digit) for digit in digits))
+    exponent = int(exponent)
+    while mantissa < 10**15:
+        mantissa *= 10
+        exponent -= 1
+    while mantissa >= 10**16:
+        mantissa //= 10
+        exponent += 1
+    return "{:016X}".format(((exponent + 100) << 56) | mantissa)
+
+
+def _ledger_value(amount: CURRENCY_AMOUNT_TYPE) -> Decimal:
+    return Decimal(amount["value"] if isinstance(amount, dict) else amount)
+
+
+@dataclass
+class SyntheticOrderBook:
+    """An order book snapshot in the format of a `book_offers` response."""
+
+    base: Currency
+    """The base currency."""
+    counter: Currency
+    """The counter currency."""
+    mid_price: float
+    """The price between the best ask and the best bid, counter per base."""
+    ledger_index: int
+    """The ledger the snapshot was taken at."""
+    asks: List[Dict[str, Any]] = field(default_factory=list)
+    """Offers that sell the base currency, best first."""
+    bids: List[Dict[str, Any]] = field(default_factory=list)
+    """Offers that buy the base currency, best first."""
+
+    @property
+    def currency_pair(self: SyntheticOrderBook) -> str:
+        """The currency pair as `base/counter`."""
+        return f"{currency_name(self.base)}/{currency_name(self.counter)}"
+
+
+class SyntheticData:
+    """
+    Generates order books and transactions from a seed, so every run measures
+    the same data.
+    """
+
+    def __init__(self: SyntheticData, seed: int = 0) -> None:
+        """
+        Args:
+            seed: The seed of the random generator. Defaults to 0.
+        """
+        self.random = Random(seed)
+        self._currencies = 0
+        self._sequence = 1000
+        self._ledger_index = 70000000
+
+    def account(self: SyntheticData) -> str:
+        """
+        Returns:
+            A new classic address.
+        """
+        return encode_classic_address(
+            bytes(self.random.getrandbits(8) for _ in range(20))
+        )
+
+    def hash(self: SyntheticData) -> str:
+        """
+        Returns:
+            A new 256 bit hash as upper case hex, e.g. a ledger index.
+        """
+        return "{:064X}".format(self.random.getrandbits(256))
+
+    def currency(self: SyntheticData) -> Tuple[str, str]:
+        """
+        Returns:
+            A new issued currency.
+        """
+        index = self._currencies
+        self._currencies += 1
+        code = "".join(
+            chr(ord("A") + index // 26**position % 26) for position in (2, 1, 0)
+        )
+        return code, self.account()
+
+    def amount(self: SyntheticData, currency: Currency, value: Decimal) -> Any:
+        """
+        Args:
+            currency: The currency.
+            value: The value, XRP in XRP.
+
+        Returns:
+            The currency amount as the ledger expresses it.
+        """
+        if currency is None:
+            return str(int(value * 1000000))
+        return {
+            "currency": currency[0],
+            "issuer": currency[1],
+            "value": "{:f}".format(value.quantize(Decimal("0.000001")).normalize()),
+        }
+
+    def _sequence_number(self: SyntheticData) -> int:
+        self._sequence += 1
+        return self._sequence
+
+    def _book_directory(
+        self: SyntheticData,
+        taker_gets: CURRENCY_AMOUNT_TYPE,
+        taker_pays: CURRENCY_AMOUNT_TYPE,
+        book: str,
+    ) -> str:
+        quality = _ledger_value(amount=taker_pays) / _ledger_value(amount=taker_gets)
+        return sha512(book.encode()).hexdigest()[:48].upper() + encode_quality(
+            quality=quality
+        )
+
+    def offer(
+        self: SyntheticData,
+        taker_gets_currency: Currency,
+        taker_pays_currency: Currency,
+        taker_gets_value: Decimal,
+        price: float,
+        ledger_index: int,
+    ) -> Dict[str, Any]:
+        """
+        Builds an offer in the format of a `book_offers` response.
+
+        Args:
+            taker_gets_currency: The currency the offer sells.
+            taker_pays_currency: The currency the offer buys.
+            taker_gets_value: The value the offer sells, XRP in XRP.
+            price: TakerPays per TakerGets.
+            ledger_index: The ledger the offer was last modified in.
+
+        Returns:
+            The offer.
+        """
+        taker_gets = self.amount(currency=taker_gets_currency, value=taker_gets_value)
+        taker_pays = self.amount(
+            currency=taker_pays_currency,
+            value=taker_gets_value * Decimal(repr(price)),
+        )
+        book = (
+            f"{currency_name(taker_pays_currency)}/"
+            f"{currency_name(taker_gets_currency)}"
+        )
+        return {
+            "Account": self.account(),
+            "BookDirectory": self._book_directory(
+                taker_gets=taker_gets, taker_pays=taker_pays, book=book
+            ),
+            "BookNode": "0",
+            "Flags": 0,
+            "LedgerEntryType": "Offer",
+            "OwnerNode": "0",
+            "PreviousTxnID": self.hash(),
+            "PreviousTxnLgrSeq": ledger_index,
+            "Sequence": self._sequence_number(),
+            "TakerGets": taker_gets,
+            "TakerPays": taker_pays,
+            "index": self.hash(),
+            "owner_funds": str(
+                int(_ledger_value(amount=taker_gets) * self.random.randint(1, 20))
+            ),
+            "quality": str(
+                _ledger_value(amount=taker_pays) / _ledger_value(amount=taker_gets)
+            ),
+        }
+
+    def order_book(
+        self: SyntheticData,
+        depth: int,
+        base: Currency = None,
+        counter: Optional[Tuple[str, str]] = None,
+    ) -> SyntheticOrderBook:
+        """
+        Builds an order book whose offers get more expensive the further they
+        are from the tip, so the sides never cross.
+
+        Args:
+            depth: The number of offers of each side.
+            base: The base currency. Defaults to XRP.
+            counter: The counter currency. Defaults to a new issued currency.
+
+        Returns:
+            The order book.
+        """
+        counter = counter if counter is not None else self.currency()
+        self._ledger_index += 1
+        book = SyntheticOrderBook(
+            base=base,
+            counter=counter,
+            mid_price=self.random.uniform(0.1, 10),
+            ledger_index=self._ledger_index,
+        )
+        for position in range(1, depth + 1):
+            ask_price = book.mid_price * PRICE_STEP**position
+            book.asks.append(
+                self.offer(
+                    taker_gets_currency=base,
+                    taker_pays_currency=counter,
+                    taker_gets_value=Decimal(self.random.randint(1, 1000)),
+                    price=ask_price,
+                    ledger_index=book.ledger_index - self.random.randint(0, 1000),
+                )
+            )
+            bid_price = book.mid_price / PRICE_STEP**position
+            base_value = Decimal(self.random.randint(1, 1000))
+            book.bids.append(
+                self.offer(
+                    taker_gets_currency=counter,
+                    taker_pays_currency=base,
+                    taker_gets_value=(base_value * Decimal(repr(bid_price))).quantize(
+                        Decimal("0.000001")
+                    ),
+                    price=1 / bid_price,
+                    ledger_index=book.ledger_index - self.random.randint(0, 1000),
+                )
+            )
+        return book
+
+    def universe(
+        self: SyntheticData, pairs: int, depth: int
+    ) -> List[SyntheticOrderBook]:
+        """
+        Builds the order books of several currency pairs. Every fourth pair
+        trades two issued currencies, the others trade XRP.
+
+        Args:
+            pairs: The number of currency pairs.
+            depth: The number of offers of each side of each order book.
+
+        Returns:
+            The order books.
+        """
+        return [
+            self.order_book(
+                depth=depth, base=self.currency() if position % 4 == 3 else None
+            )
+            for position in range(pairs)
+        ]
+
+    def _balance_node(
+        self: SyntheticData, account: str, currency: Currency, change: Decimal
+    ) -> Dict[str, Any]:
+        if currency is None:
+            final = Decimal(self.random.randint(10**8, 10**12))
+            return {
+                "ModifiedNode": {
+                    "FinalFields": {
+                        "Account": account,
+                        "Balance": str(int(final)),
+                        "Flags": 0,
+                        "OwnerCount": self.random.randint(1, 20),
+                        "Sequence": self._sequence_number(),
+                    },
+                    "LedgerEntryType": "AccountRoot",
+                    "LedgerIndex": self.hash(),
+                    "PreviousFields": {"Balance": str(int(final - change * 1000000))},
+                    "PreviousTxnID": self.hash(),
+                    "PreviousTxnLgrSeq": self._ledger_index,
+                }
+            }
+        final = Decimal(self.random.randint(1000, 10**7))
+        return {
+            "ModifiedNode": {
+                "FinalFields": {
+                    "Balance": self.amount(
+                        currency=(currency[0], ACCOUNT_ZERO), value=final
+                    ),
+                    "Flags": 131072,
+                    "HighLimit": self.amount(
+                        currency=(currency[0], currency[1]), value=Decimal(0)
+                    ),
+                    "HighNode": "0",
+                    "LowLimit": self.amount(
+                        currency=(currency[0], account), value=Decimal(10**9)
+                    ),
+                    "LowNode": "0",
+                },
+                "LedgerEntryType": "RippleState",
+                "LedgerIndex": self.hash(),
+                "PreviousFields": {
+                    "Balance": self.amount(
+                        currency=(currency[0], ACCOUNT_ZERO), value=final - change
+                    )
+                },
+                "PreviousTxnID": self.hash(),
+                "PreviousTxnLgrSeq": self._ledger_index,
+            }
+        }
+
+    def _directory_node(self: SyntheticData, owner: str) -> Dict[str, Any]:
+        index = self.hash()
+        return {
+            "ModifiedNode": {
+                "FinalFields": {
+                    "Flags": 0,
+                    "IndexNext": "0",
+                    "IndexPrevious": "0",
+                    "Owner": owner,
+                    "RootIndex": index,
+                },
+                "LedgerEntryType": "DirectoryNode",
+                "LedgerIndex": index,
+            }
+        }
+
+    def _consumed_offer_node(
+        self: SyntheticData, offer: Dict[str, Any], filled: bool
+    ) -> Dict[str, Any]:
+        fields = {
+            name: offer[name]
+            for name in (
+                "Account",
+                "BookDirectory",
+                "BookNode",
+                "Flags",
+                "OwnerNode",
+                "Sequence",
+            )
+        }
+        ratio = Decimal(0) if filled else Decimal("0.5")
+        taker_gets = _ledger_value(amount=offer["TakerGets"]) * ratio
+        taker_pays = _ledger_value(amount=offer["TakerPays"]) * ratio
+        fields["TakerGets"] = (
+            {**offer["TakerGets"], "value": "{:f}".format(taker_gets.normalize())}
+            if isinstance(offer["TakerGets"], dict)
+            else str(int(taker_gets))
+        )
+        fields["TakerPays"] = (
+            {**offer["TakerPays"], "value": "{:f}".format(taker_pays.normalize())}
+            if isinstance(offer["TakerPays"], dict)
+            else str(int(taker_pays))
+        )
+        previous_fields = {
+            "TakerGets": offer["TakerGets"],
+            "TakerPays": offer["TakerPays"],
+        }
+        if filled:
+            return {
+                "DeletedNode": {
+                    "FinalFields": {
+                        **fields,
+                        "PreviousTxnID": offer["PreviousTxnID"],
+                        "PreviousTxnLgrSeq": offer["PreviousTxnLgrSeq"],
+                    },
+                    "LedgerEntryType": "Offer",
+                    "LedgerIndex": offer["index"],
+                    "PreviousFields": previous_fields,
+                }
+            }
+        return {
+            "ModifiedNode": {
+                "FinalFields": fields,
+                "LedgerEntryType": "Offer",
+                "LedgerIndex": offer["index"],
+                "PreviousFields": previous_fields,
+                "PreviousTxnID": offer["PreviousTxnID"],
+                "PreviousTxnLgrSeq": offer["PreviousTxnLgrSeq"],
+            }
+        }
+
+    def _consume(
+        self: SyntheticData,
+        book: SyntheticOrderBook,
+        offers: int,
+        partially: bool,
+    ) -> List[Dict[str, Any]]:
+        """
+        Builds the nodes of ask offers a taker consumes, with the balances of
+        their owners.
+
+        Args:
+            book: The order book.
+            offers: The number of consumed offers.
+            partially: If the last offer is only partially filled.
+
+        Returns:
+            The affected nodes.
+        """
+        nodes = []
+        for position, offer in enumerate(book.asks[:offers]):
+            nodes.append(
+                self._consumed_offer_node(
+                    offer=offer, filled=not partially or position < offers - 1
+                )
+            )
+            nodes.append(
+                self._balance_node(
+                    account=offer["Account"],
+                    currency=book.base,
+                    change=-_ledger_value(amount=offer["TakerGets"]),
+                )
+            )
+            nodes.append(
+                self._balance_node(
+                    account=offer["Account"],
+                    currency=book.counter,
+                    change=_ledger_value(amount=offer["TakerPays"]),
+                )
+            )
+        return nodes
+
+    def _transaction(
+        self: SyntheticData,
+        fields: Dict[str, Any],
+        nodes: List[Dict[str, Any]],
+        ledger_index: int,
+    ) -> Dict[str, Any]:
+        return {
+            "engine_result": "tesSUCCESS",
+            "engine_result_code": 0,
+            "engine_result_message": "The transaction was applied. Only final in a "
+            "validated ledger.",
+            "ledger_hash": self.hash(),
+            "ledger_index": ledger_index,
+            "meta": {
+                "AffectedNodes": nodes,
+                "TransactionIndex": self.random.randint(0, 200),
+                "TransactionResult": "tesSUCCESS",
+            },
+            "status": "closed",
+            "transaction": {
+                "Fee": "12",
+                "Flags": 0,
+                "Sequence": self._sequence_number(),
+                "SigningPubKey": self.hash()[:66],
+                "TxnSignature": self.hash() + self.hash(),
+                "date": 704557641,
+                "hash": self.hash(),
+                **fields,
+            },
+            "type": "transaction",
+            "validated": True,
+        }
+
+    def _node_counts(
+        self: SyntheticData, book: SyntheticOrderBook, affected_nodes: int
+    ) -> Tuple[int, int]:
+        offers = min(
+            max(affected_nodes - FIXED_NODES, 0) // NODES_PER_OFFER, len(book.asks)
+        )
+        padding = max(affected_nodes - FIXED_NODES - NODES_PER_OFFER * offers, 0)
+        return offers, padding
+
+    def offer_create(
+        self: SyntheticData, book: SyntheticOrderBook, affected_nodes: int
+    ) -> Dict[str, Any]:
+        """
+        Builds an OfferCreate, in the format of a transaction stream, that
+        buys the base currency. It fills the best asks completely and places
+        the rest of its offer on the bid side.
+
+        Args:
+            book: The order book.
+            affected_nodes: The number of affected nodes of the transaction.
+
+        Returns:
+            The transaction.
+        """
+        account = self.account()
+        offers, padding = self._node_counts(book=book, affected_nodes=affected_nodes)
+        # the rest of the offer rests at the price of the last filled ask
+        price = book.mid_price * PRICE_STEP**offers
+        base_value = Decimal(self.random.randint(1, 1000))
+        counter_value = (base_value * Decimal(repr(price))).quantize(
+            Decimal("0.000001")
+        )
+        created = self.offer(
+            taker_gets_currency=book.counter,
+            taker_pays_currency=book.base,
+            taker_gets_value=counter_value,
+            price=1 / price,
+            ledger_index=book.ledger_index + 1,
+        )
+        nodes = [
+            {
+                "CreatedNode": {
+                    "LedgerEntryType": "Offer",
+                    "LedgerIndex": created["index"],
+                    "NewFields": {
+                        name: created[name]
+                        for name in (
+                            "Account",
+                            "BookDirectory",
+                            "Sequence",
+                            "TakerGets",
+                            "TakerPays",
+                        )
+                    },
+                }
+            }
+        ]
+        nodes[0]["CreatedNode"]["NewFields"]["Account"] = account
+        nodes.extend(self._consume(book=book, offers=offers, partially=False))
+        nodes.append(
+            self._balance_node(account=account, currency=book.base, change=base_value)
+        )
+        nodes.append(
+            self._balance_node(
+                account=account, currency=book.counter, change=-counter_value
+            )
+        )
+        nodes.extend(self._directory_node(owner=account) for _ in range(padding))
+        return {
+            **self._transaction(
+                fields={
+                    "Account": account,
+                    "TakerGets": created["TakerGets"],
+                    "TakerPays": created["TakerPays"],
+                    "TransactionType": "OfferCreate",
+                },
+                nodes=nodes[:affected_nodes],
+                ledger_index=book.ledger_index + 1,
+            ),
+            "owner_funds": created["owner_funds"],
+        }
+
+    def payment(
+        self: SyntheticData, book: SyntheticOrderBook, affected_nodes: int
+    ) -> Dict[str, Any]:
+        """
+        Builds a cross currency Payment, in the format of a transaction stream,
+        that delivers the base currency through the ask side. It fills the
+        best asks and the last of them partially.
+
+        Args:
+            book: The order book.
+            affected_nodes: The number of affected nodes of the transaction.
+
+        Returns:
+            The transaction.
+        """
+        account = self.account()
+        destination = self.account()
+        offers, padding = self._node_counts(book=book, affected_nodes=affected_nodes)
+        delivered = Decimal(self.random.randint(1, 1000))
+        nodes = [
+            self._balance_node(
+                account=destination, currency=book.base, change=delivered
+            )
+        ]
+        nodes.extend(self._consume(book=book, offers=offers, partially=True))
+        nodes.append(
+            self._balance_node(
+                account=account, currency=book.counter, change=-delivered
+            )
+        )
+        nodes.append(
+            self._balance_node(
+                account=account, currency=None, change=Decimal("-0.000012")
+            )
+        )
+        nodes.extend(self._directory_node(owner=account) for _ in range(padding))
+        return self._transaction(
+            fields={
+                "Account": account,
+                "Amount": self.amount(currency=book.base, value=delivered),
+                "Destination": destination,
+                "SendMax": self.amount(
+                    currency=book.counter,
+                    value=delivered * Decimal(repr(book.mid_price)) * 2,
+                ),
+                "TransactionType": "Payment",
+            },
+            nodes=nodes[:affected_nodes],
+            ledger_index=book.ledger_index + 1,
+        )
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from asyncio import run, sleep
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from xrpl_trading_bot.clients import MarketDataEngine
+from xrpl_trading_bot.order_books import OrderBooks
+
+
+class _Wallet:
+    classic_address = "rAccount"
+    balances = {"XRP": "100"}
+
+
+class _Nodes:
+    async def probe_all(self):
+        pass
+
+    async def run(self):
+        await sleep(60)
+
+
+class TestMarketDataEngine(TestCase):
+    def test_failing_stream_cancels_all_tasks(self: TestMarketDataEngine):
+        cancelled = []
+
+        async def fetch_balances(wallet, nodes):
+            pass
+
+        async def fetch_fees(wallet, nodes):
+            return {"rIssuer": Decimal("0.002")}
+
+        async def account_stream(wallet, nodes):
+            try:
+                await sleep(60)
+            finally:
+                cancelled.append(True)
+
+        class Subscriptions:
+            def __init__(self, all_order_books, connections, snapshots, batch, nodes):
+                pass
+
+            async def run(self, subscribe_books):
+                raise ConnectionError("closed")
+
+        gateway_fees = {}
+        engine = MarketDataEngine(
+            wallet=_Wallet(),
+            all_order_books=OrderBooks(),
+            gateway_fees=gateway_fees,
+            nodes=_Nodes(),
+            full_history_nodes=_Nodes(),
+        )
+        with patch.multiple(
+            "xrpl_trading_bot.clients.engine",
+            get_current_account_balances_async=fetch_balances,
+            get_gateway_fees_async=fetch_fees,
+            stream_account_balances_async=account_stream,
+            BookSubscriptionManager=Subscriptions,
+        ):
+            with self.assertRaises(ConnectionError):
+                run(engine.run(subscribe_books=[[]]))
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(engine.running_tasks, 0)
+        self.assertEqual(gateway_fees, {"rIssuer": Decimal("0.002")})
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+from copy import deepcopy
+from unittest import TestCase
+
+from tests.txn_parser import test_final_txn_parser
+from xrpl_trading_bot.clients import (
+    book_filter,
+    default_decoder,
+    peek_ledger_index,
+    peek_type,
+    type_filter,
+)
+
+# nodes write the keys of a message in sorted order
+TXN_FRAME = json.dumps(deepcopy(test_final_txn_parser.TXN), sort_keys=True)
+LEDGER_FRAME = json.dumps(
+    {"ledger_hash": "ABC", "ledger_index": 71316522, "type": "ledgerClosed"},
+    sort_keys=True,
+)
+SNAPSHOT_FRAME = json.dumps(
+    {
+        "id": 1,
+        "result": {"asks": deepcopy(test_final_txn_parser.ASKS)},
+        "status": "success",
+        "type": "response",
+    }
+)
+ISSUER = "rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+
+
+class TestIngest(TestCase):
+    def test_peek(self: TestIngest):
+        self.assertEqual(peek_type(TXN_FRAME), "transaction")
+        self.assertEqual(peek_type(LEDGER_FRAME.encode()), "ledgerClosed")
+        self.assertEqual(peek_type(SNAPSHOT_FRAME), "response")
+        self.assertIsNone(peek_type("{}"))
+        self.assertEqual(
+            peek_ledger_index(TXN_FRAME), test_final_txn_parser.TXN["ledger_index"]
+        )
+        self.assertEqual(peek_ledger_index(LEDGER_FRAME), 71316522)
+        self.assertIsNone(peek_ledger_index(SNAPSHOT_FRAME))
+
+    def test_filters(self: TestIngest):
+        accept = book_filter(issuers=[ISSUER])
+        self.assertTrue(accept(TXN_FRAME))
+        self.assertTrue(accept(LEDGER_FRAME))
+        self.assertFalse(accept(SNAPSHOT_FRAME))
+        self.assertFalse(book_filter(issuers=["rOther"])(TXN_FRAME))
+        self.assertTrue(type_filter("response")(SNAPSHOT_FRAME))
+        self.assertFalse(type_filter("transaction")(LEDGER_FRAME))
+
+    def test_default_decoder(self: TestIngest):
+        self.assertEqual(default_decoder()(TXN_FRAME), json.loads(TXN_FRAME))
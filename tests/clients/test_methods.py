@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+from asyncio import run
+from unittest import TestCase
+from unittest.mock import patch
+
+from websockets.server import serve
+from xrpl.models import XRP, IssuedCurrency
+from xrpl.models.requests.subscribe import SubscribeBook
+
+from tests.txn_parser.test_parsed_transaction import binary_transaction
+from xrpl_trading_bot.clients import (
+    NodeManager,
+    close_pools,
+    get_ledger_transactions_async,
+    subscribe_to_order_books_async,
+)
+from xrpl_trading_bot.order_books import OrderBook, OrderBooks
+
+
+class TestLedgerTransactions(TestCase):
+    def test_binary(self: TestLedgerTransactions):
+        requests = []
+        transaction = binary_transaction()
+        del transaction["ledger_index"]
+
+        async def handler(websocket, path=None):
+            async for message in websocket:
+                request = json.loads(message)
+                requests.append(request)
+                result = {"ledger": {"transactions": [transaction]}}
+                await websocket.send(
+                    json.dumps(
+                        {
+                            "id": request["id"],
+                            "type": "response",
+                            "status": "success",
+                            "result": result,
+                        }
+                    )
+                )
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                nodes = NodeManager(uris=[f"ws://127.0.0.1:{port}"])
+                transactions = await get_ledger_transactions_async(
+                    ledger_index=71316522, nodes=nodes
+                )
+                await close_pools()
+                return transactions
+
+        transactions = run(main())
+        self.assertTrue(requests[0]["binary"])
+        self.assertEqual(len(transactions), 1)
+        self.assertEqual(transactions[0].ledger_index, 71316522)
+        self.assertEqual(len(transactions[0].order_changes), 2)
+
+
+class TestSubscribeToOrderBooks(TestCase):
+    def test_snapshots_of_loader(self: TestSubscribeToOrderBooks):
+        books = [
+            SubscribeBook(
+                taker_pays=XRP(),
+                taker_gets=IssuedCurrency(currency=currency, issuer="rIssuer"),
+                taker="rAccount",
+            )
+            for currency in ("USD", "EUR")
+        ]
+        sent = []
+
+        class Snapshots:
+            async def load(self, subscribe_books):
+                return [
+                    OrderBook.from_snapshot(
+                        asks=[], bids=[], currency_pair="XRP/USD.rIssuer"
+                    )
+                ], subscribe_books[1:]
+
+        class Client:
+            def __init__(self, url):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+            async def send(self, request):
+                sent.append(request)
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                raise StopAsyncIteration
+
+        order_books = OrderBooks()
+        logger = "xrpl_trading_bot.clients.methods"
+        with patch(f"{logger}.AsyncWebsocketClient", Client), self.assertLogs(
+            logger
+        ) as logs:
+            run(
+                subscribe_to_order_books_async(
+                    all_order_books=order_books,
+                    subscribe_books=books,
+                    snapshots=Snapshots(),
+                )
+            )
+        self.assertEqual(order_books.get_all_currency_pairs(), ["XRP/USD.rIssuer"])
+        self.assertIn("XRP/EUR.rIssuer", logs.output[0])
+        self.assertEqual(sent[0].books, books)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from asyncio import run, sleep
+from unittest import TestCase
+
+from websockets.server import serve
+from xrpl.models import Ledger, Subscribe
+
+from xrpl_trading_bot.clients import NodeManager, NonFullHistoryNodes
+from xrpl_trading_bot.clients.pool import close_pools
+
+
+def _node(
+    delay=0.0, ledger_index=100, messages=(), close=False, received=None, silent=False
+):
+    async def handler(websocket, path=None):
+        async for message in websocket:
+            request = json.loads(message)
+            if received is not None:
+                received.append(request["command"])
+            if silent:
+                continue
+            await sleep(delay)
+            await websocket.send(
+                json.dumps(
+                    {
+                        "id": request.get("id"),
+                        "type": "response",
+                        "status": "success",
+                        "result": {"ledger_index": ledger_index},
+                    }
+                )
+            )
+            if request["command"] == "subscribe":
+                for stream_message in messages:
+                    await websocket.send(json.dumps(stream_message))
+                if close:
+                    await sleep(0.1)
+                    await websocket.close()
+                    return
+
+    return serve(handler, "127.0.0.1", 0)
+
+
+def _uri(server):
+    return f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+class TestNodeManager(TestCase):
+    def test_rank_by_latency_and_ledger(self: TestNodeManager):
+        async def main():
+            async with _node(delay=0.05) as slow, _node() as fast, _node(
+                ledger_index=90
+            ) as lagging:
+                nodes = NodeManager(uris=[_uri(slow), _uri(lagging), _uri(fast)])
+                await nodes.probe_all()
+                self.assertEqual(
+                    nodes.ranked_nodes(), [_uri(fast), _uri(slow), _uri(lagging)]
+                )
+                self.assertFalse(nodes.is_healthy(uri=_uri(lagging)))
+                self.assertEqual(nodes.statuses[_uri(fast)].uptime, 1.0)
+                nodes.mark_failed(uri=_uri(fast))
+                self.assertEqual(nodes.best_node(), _uri(slow))
+                await close_pools()
+
+        run(main())
+
+    def test_stream_fails_over(self: TestNodeManager):
+        received = []
+        reconnects = []
+
+        async def on_reconnect():
+            reconnects.append(True)
+
+        async def main():
+            async with _node(
+                messages=[{"type": "transaction", "node": 1}], close=True
+            ) as first, _node(
+                messages=[{"type": "transaction", "node": 2}], received=received
+            ) as second:
+                nodes = NodeManager(
+                    uris=[_uri(first), _uri(second)], health_check_interval=0.05
+                )
+                messages = []
+                stream = nodes.stream(
+                    requests=[Subscribe(streams=["ledger"])],
+                    on_reconnect=on_reconnect,
+                )
+                async for message in stream:
+                    if message.get("type") == "transaction":
+                        messages.append(message["node"])
+                    if len(messages) == 2:
+                        break
+                await stream.aclose()
+                return messages
+
+        self.assertEqual(run(main()), [1, 2])
+        self.assertEqual(received, ["subscribe"])
+        self.assertEqual(reconnects, [True])
+
+    def test_request_fails_over(self: TestNodeManager):
+        async def main():
+            async with _node(silent=True) as silent, _node() as answering:
+                nodes = NodeManager(
+                    uris=[_uri(silent), _uri(answering)], request_timeout=0.2
+                )
+                response = await nodes.request(Ledger(ledger_index="validated"))
+                await close_pools()
+                self.assertTrue(response.is_successful())
+                self.assertFalse(nodes.statuses[_uri(silent)].available)
+                self.assertEqual(nodes.best_node(), _uri(answering))
+
+        run(main())
+
+    def test_from_nodes(self: TestNodeManager):
+        nodes = NodeManager.from_nodes(nodes=NonFullHistoryNodes)
+        self.assertEqual(nodes.best_node(), NonFullHistoryNodes.LIMPIDCRYPTO)
+        self.assertEqual(len(nodes.uris), 3)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+from asyncio import run, sleep
+from unittest import TestCase
+
+from websockets.server import serve
+from xrpl.models import Ledger
+
+from xrpl_trading_bot.clients.pool import ConnectionPool, close_pools, get_pool
+
+
+class TestConnectionPool(TestCase):
+    def test_connections_are_reused(self: TestConnectionPool):
+        connections = []
+
+        async def handler(websocket, path=None):
+            connections.append(websocket)
+            async for message in websocket:
+                request = json.loads(message)
+                await sleep(0.01)
+                await websocket.send(
+                    json.dumps(
+                        {
+                            "id": request["id"],
+                            "type": "response",
+                            "status": "success",
+                            "result": {"ledger_index": 1},
+                        }
+                    )
+                )
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                pool = ConnectionPool(uri=f"ws://127.0.0.1:{port}", size=2)
+                for _ in range(3):
+                    responses = await pool.request_many(
+                        [Ledger(ledger_index="validated") for _ in range(20)]
+                    )
+                    self.assertEqual(len(responses), 20)
+                    self.assertTrue(all(r.is_successful() for r in responses))
+                self.assertEqual(pool.open_connections, 2)
+                await pool.close()
+                self.assertEqual(pool.open_connections, 0)
+
+        run(main())
+        self.assertEqual(len(connections), 2)
+
+    def test_pools_per_event_loop(self: TestConnectionPool):
+        async def main():
+            pool = get_pool(uri="ws://127.0.0.1:1")
+            self.assertIs(get_pool(uri="ws://127.0.0.1:1"), pool)
+            await close_pools()
+            self.assertIsNot(get_pool(uri="ws://127.0.0.1:1"), pool)
+            return pool
+
+        self.assertIsNot(run(main()), run(main()))
+
+    def test_retry_after_dropped_connection(self: TestConnectionPool):
+        connections = []
+
+        async def handler(websocket, path=None):
+            connections.append(websocket)
+            async for message in websocket:
+                request = json.loads(message)
+                if len(connections) == 1:
+                    # dropped while the request waits for its response
+                    await websocket.close()
+                    return
+                await websocket.send(
+                    json.dumps(
+                        {
+                            "id": request["id"],
+                            "type": "response",
+                            "status": "success",
+                            "result": {"ledger_index": 1},
+                        }
+                    )
+                )
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                pool = ConnectionPool(uri=f"ws://127.0.0.1:{port}", timeout=5)
+                response = await pool.request(Ledger(ledger_index="validated", id=7))
+                await pool.close()
+                return response
+
+        response = run(main())
+        self.assertTrue(response.is_successful())
+        self.assertEqual(response.id, 7)
+        self.assertEqual(len(connections), 2)
+
+    def test_retry_after_timeout(self: TestConnectionPool):
+        connections = []
+
+        async def handler(websocket, path=None):
+            connections.append(websocket)
+            async for message in websocket:
+                request = json.loads(message)
+                if len(connections) == 1:
+                    continue  # the node stopped answering
+                await websocket.send(
+                    json.dumps(
+                        {
+                            "id": request["id"],
+                            "type": "response",
+                            "status": "success",
+                            "result": {"ledger_index": 1},
+                        }
+                    )
+                )
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                pool = ConnectionPool(uri=f"ws://127.0.0.1:{port}", timeout=0.2)
+                response = await pool.request(Ledger(ledger_index="validated"))
+                pending = [
+                    len(connection._responses) for connection in pool._connections
+                ]
+                await pool.close()
+                return response, pending
+
+        response, pending = run(main())
+        self.assertTrue(response.is_successful())
+        self.assertEqual(len(connections), 2)
+        # answered requests leave nothing behind on their connection
+        self.assertEqual(pending, [0])
+
+    def test_failing_node(self: TestConnectionPool):
+        async def handler(websocket, path=None):
+            async for _ in websocket:
+                await websocket.close()
+                return
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                pool = ConnectionPool(uri=f"ws://127.0.0.1:{port}", timeout=1)
+                try:
+                    await pool.request(Ledger(ledger_index="validated"))
+                finally:
+                    await pool.close()
+
+        with self.assertRaises(ConnectionError):
+            run(main())
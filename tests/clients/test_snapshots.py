@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from asyncio import run
+from unittest import TestCase
+
+from websockets.server import serve
+from xrpl.models import XRP, IssuedCurrency
+from xrpl.models.requests.subscribe import SubscribeBook
+
+from tests.txn_parser import test_final_txn_parser
+from xrpl_trading_bot.clients import SnapshotLoader, close_pools
+
+USD = IssuedCurrency(currency="USD", issuer="rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq")
+EUR = IssuedCurrency(currency="EUR", issuer="rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq")
+ASK = test_final_txn_parser.ASKS[0]
+
+
+def _respond(request, result=None, error=None):
+    response = {"id": request["id"], "type": "response"}
+    if error is not None:
+        response.update(status="error", error=error)
+    else:
+        response.update(status="success", result=result)
+    return json.dumps(response)
+
+
+class TestSnapshotLoader(TestCase):
+    def test_load(self: TestSnapshotLoader):
+        requests = []
+
+        async def handler(websocket, path=None):
+            async for message in websocket:
+                request = json.loads(message)
+                requests.append(request)
+                if request["command"] == "ledger":
+                    result = {"ledger_index": 100}
+                    await websocket.send(_respond(request, result=result))
+                elif request["taker_gets"].get("currency") == "EUR":
+                    await websocket.send(_respond(request, error="tooBusy"))
+                elif request["taker_gets"] == {"currency": "XRP"}:
+                    # asks of XRP/USD, two pages
+                    page = {"offers": [ASK]}
+                    if "marker" not in request:
+                        page["marker"] = "next"
+                    await websocket.send(_respond(request, result=page))
+                else:
+                    await websocket.send(_respond(request, result={"offers": []}))
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                loader = SnapshotLoader(
+                    uri=f"ws://127.0.0.1:{port}", retries=1, retry_delay=0
+                )
+                books = [
+                    SubscribeBook(taker_pays=XRP(), taker_gets=USD, taker="rAccount"),
+                    SubscribeBook(taker_pays=USD, taker_gets=EUR, taker="rAccount"),
+                ]
+                result = await loader.load(subscribe_books=books)
+                await close_pools()
+                return books, result
+
+        books, (order_books, failed_books) = run(main())
+        self.assertEqual(len(order_books), 1)
+        self.assertEqual(order_books[0].currency_pair, f"XRP/USD.{USD.issuer}")
+        self.assertEqual(len(order_books[0].asks), 2)
+        self.assertEqual(len(order_books[0].bids), 0)
+        self.assertEqual(failed_books, books[1:])
+        book_offers = [r for r in requests if r["command"] == "book_offers"]
+        self.assertTrue(all(r["ledger_index"] == 100 for r in book_offers))
+        # the failing side is requested once and retried once
+        self.assertEqual(
+            len([r for r in book_offers if r["taker_gets"].get("currency") == "EUR"]),
+            2,
+        )
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from asyncio import run, sleep
+from copy import deepcopy
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from xrpl.models import XRP, IssuedCurrency
+from xrpl.models.requests.subscribe import SubscribeBook
+
+from tests.txn_parser import test_final_txn_parser
+from xrpl_trading_bot.clients import BookSubscriptionManager
+from xrpl_trading_bot.order_books import OrderBook, OrderBooks
+
+# the parser tests modify their fixtures in place
+ASKS = deepcopy(test_final_txn_parser.ASKS)
+BIDS = deepcopy(test_final_txn_parser.BIDS)
+TXN = deepcopy(test_final_txn_parser.TXN)
+
+XRP_USD = "XRP/USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+
+
+class TestBookSubscriptionManager(TestCase):
+    def setUp(self: TestBookSubscriptionManager):
+        self.order_books = OrderBooks()
+        self.order_books.set_order_book(
+            OrderBook(
+                asks=deepcopy(ASKS),
+                bids=deepcopy(BIDS),
+                currency_pair=XRP_USD,
+                exchange_rate=Decimal(0),
+            )
+        )
+        self.manager = BookSubscriptionManager(
+            all_order_books=self.order_books, connections=2
+        )
+
+    def test_dispatch_drops_duplicates(self: TestBookSubscriptionManager):
+        self.assertTrue(self.manager.dispatch(message=deepcopy(TXN)))
+        self.assertFalse(self.manager.dispatch(message=deepcopy(TXN)))
+        self.assertFalse(self.manager.dispatch(message={"result": {}}))
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(len(order_book.asks), 2)
+        self.assertEqual(len(order_book.bids), 1)
+
+    def test_assign_books(self: TestBookSubscriptionManager):
+        books = [
+            SubscribeBook(
+                taker_pays=XRP(),
+                taker_gets=IssuedCurrency(currency=f"C{num:02}", issuer="rIssuer"),
+                taker="rAccount",
+            )
+            for num in range(25)
+        ]
+        assigned = self.manager.assign_books(subscribe_books=books)
+        self.assertEqual([len(connection) for connection in assigned], [13, 12])
+        self.assertEqual(
+            BookSubscriptionManager(
+                all_order_books=self.order_books, connections=4
+            ).assign_books(subscribe_books=books[:1]),
+            [books[:1]],
+        )
+
+    def test_track_ledger(self: TestBookSubscriptionManager):
+        self.order_books.get_order_book(XRP_USD).snapshot_ledger_index = 100
+        last = self.manager.track_ledger(None, 101, [XRP_USD])
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [])
+        last = self.manager.track_ledger(last, 102, [XRP_USD])
+        self.assertEqual(last, 102)
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [])
+        self.manager.track_ledger(last, 104, [XRP_USD])
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [XRP_USD])
+
+    def test_track_first_ledger_after_snapshot(self: TestBookSubscriptionManager):
+        self.order_books.get_order_book(XRP_USD).snapshot_ledger_index = 100
+        self.manager.track_ledger(None, 103, [XRP_USD])
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [XRP_USD])
+
+    def test_resync_failures(self: TestBookSubscriptionManager):
+        book = SubscribeBook(
+            taker_pays=XRP(),
+            taker_gets=IssuedCurrency(
+                currency="USD", issuer="rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+            ),
+            taker="rAccount",
+        )
+        errors = [ConnectionError("closed"), KeyError("ledger_index")]
+
+        class Snapshots:
+            async def validated_ledger_index(self):
+                if errors:
+                    raise errors.pop(0)
+                return 10
+
+            async def load(self, subscribe_books, ledger_index):
+                return [], subscribe_books
+
+        self.manager.snapshots = Snapshots()
+        self.manager._books = {XRP_USD: book}
+        self.order_books.mark_stale(currency_pairs=[XRP_USD])
+        logger = "xrpl_trading_bot.clients.subscriptions"
+        with patch(f"{logger}.RESYNC_INTERVAL", 0), self.assertLogs(logger) as logs:
+            # only the expected network errors are retried
+            with self.assertRaises(KeyError):
+                run(self.manager._resync_all())
+            self.assertEqual(run(self.manager.resync()), 0)
+        self.assertEqual(self.manager.resync_failures, 2)
+        self.assertIn("Resync of stale order books failed", logs.output[0])
+        self.assertIn(XRP_USD, logs.output[1])
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [XRP_USD])
+
+    def test_batch_waits_for_all_connections(self: TestBookSubscriptionManager):
+        manager = BookSubscriptionManager(
+            all_order_books=self.order_books, connections=2, batch=True
+        )
+        manager.batcher.connections = 2
+        ledger_index = TXN["ledger_index"]
+        for connection in (0, 1):
+            manager.dispatch(
+                message={"type": "ledgerClosed", "ledger_index": ledger_index},
+                connection=connection,
+            )
+        manager.dispatch(
+            message={"type": "ledgerClosed", "ledger_index": ledger_index + 1},
+            connection=0,
+        )
+        # connection 1 still delivers the transactions of the ledger
+        manager.dispatch(message=deepcopy(TXN), connection=1)
+        self.assertEqual(len(self.order_books.get_order_book(XRP_USD).asks), 1)
+        manager.dispatch(
+            message={"type": "ledgerClosed", "ledger_index": ledger_index + 1},
+            connection=1,
+        )
+        self.assertEqual(len(self.order_books.get_order_book(XRP_USD).asks), 2)
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [])
+
+    def test_failed_snapshots_get_resynced(self: TestBookSubscriptionManager):
+        book = SubscribeBook(
+            taker_pays=XRP(),
+            taker_gets=IssuedCurrency(currency="EUR", issuer="rIssuer"),
+            taker="rAccount",
+        )
+        pair = "XRP/EUR.rIssuer"
+        snapshot = OrderBook.from_snapshot(
+            asks=[], bids=[], currency_pair=pair, ledger_index=10
+        )
+        loads = [([], [book]), ([snapshot], [])]
+
+        class Snapshots:
+            async def validated_ledger_index(self):
+                return 10
+
+            async def load(self, subscribe_books, ledger_index=None):
+                return loads.pop(0)
+
+        self.manager.snapshots = Snapshots()
+        self.manager._books = {pair: book}
+        logger = "xrpl_trading_bot.clients.subscriptions"
+        with self.assertLogs(logger, level="WARNING") as logs:
+            run(self.manager._load_snapshots(subscribe_books=[book]))
+        self.assertIn(pair, logs.output[0])
+        self.assertEqual(self.manager.failed_books, [book])
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [pair])
+        self.assertEqual(run(self.manager.resync()), 1)
+        self.assertIs(self.order_books.get_order_book(pair), snapshot)
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [])
+
+    def test_first_snapshots_at_first_ledger(self: TestBookSubscriptionManager):
+        book = SubscribeBook(
+            taker_pays=XRP(),
+            taker_gets=IssuedCurrency(
+                currency="USD", issuer="rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+            ),
+            taker="rAccount",
+        )
+        ledger_index = TXN["ledger_index"]
+        loaded = []
+
+        class Snapshots:
+            async def load(self, subscribe_books, ledger_index=None):
+                loaded.append(ledger_index)
+                snapshot = OrderBook.from_snapshot(
+                    asks=deepcopy(ASKS),
+                    bids=deepcopy(BIDS),
+                    currency_pair=XRP_USD,
+                    ledger_index=ledger_index,
+                )
+                return [snapshot], []
+
+        class Nodes:
+            async def stream(self, requests, on_reconnect, accept, decoder):
+                for index in (ledger_index - 1, ledger_index):
+                    yield {"type": "ledgerClosed", "ledger_index": index}
+                # received before the snapshot and replayed after it
+                yield deepcopy(TXN)
+                await sleep(0.01)
+                yield {"type": "ledgerClosed", "ledger_index": ledger_index + 1}
+                await sleep(0.01)
+                raise ConnectionError("closed")
+
+        manager = BookSubscriptionManager(
+            all_order_books=self.order_books, connections=1
+        )
+        manager.snapshots = Snapshots()
+        manager.nodes = Nodes()
+        with self.assertRaises(ConnectionError):
+            run(manager.run(subscribe_books=[book]))
+        self.assertEqual(loaded, [ledger_index - 1])
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(order_book.snapshot_ledger_index, ledger_index - 1)
+        self.assertEqual(len(order_book.asks), 2)
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [])
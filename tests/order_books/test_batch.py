@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from decimal import Decimal
+from unittest import TestCase
+
+from tests.txn_parser import test_final_txn_parser
+from xrpl_trading_bot.order_books import LedgerBatcher, OrderBook, OrderBooks
+
+# the parser tests modify their fixtures in place
+ASKS = deepcopy(test_final_txn_parser.ASKS)
+BIDS = deepcopy(test_final_txn_parser.BIDS)
+TXN = deepcopy(test_final_txn_parser.TXN)
+
+XRP_USD = "XRP/USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+
+
+class _RecordingOrderBooks(OrderBooks):
+    def update_order_books_batch(self, transactions):
+        self.__class__.batches.append(
+            [transaction["meta"]["TransactionIndex"] for transaction in transactions]
+        )
+
+
+def _txn(ledger_index: int, transaction_index: int):
+    txn = deepcopy(TXN)
+    txn["ledger_index"] = ledger_index
+    txn["meta"]["TransactionIndex"] = transaction_index
+    return txn
+
+
+class TestLedgerBatcher(TestCase):
+    def setUp(self: TestLedgerBatcher):
+        self.order_books = OrderBooks()
+        self.order_books.set_order_book(
+            OrderBook(
+                asks=deepcopy(ASKS),
+                bids=deepcopy(BIDS),
+                currency_pair=XRP_USD,
+                exchange_rate=Decimal(0),
+            )
+        )
+        self.batcher = LedgerBatcher(all_order_books=self.order_books)
+
+    def test_apply_on_ledger_close(self: TestLedgerBatcher):
+        ledger_index = TXN["ledger_index"]
+        self.batcher.add(transaction=deepcopy(TXN))
+        self.assertEqual(self.batcher.close_ledger(ledger_index=ledger_index), 0)
+        self.assertEqual(len(self.order_books.get_order_book(XRP_USD).asks), 1)
+        self.assertEqual(self.batcher.close_ledger(ledger_index=ledger_index + 1), 1)
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(len(order_book.asks), 2)
+        self.assertEqual(len(order_book.bids), 1)
+        self.assertEqual(self.batcher.buffered_transactions, 0)
+
+    def test_transaction_index_order(self: TestLedgerBatcher):
+        _RecordingOrderBooks.batches = []
+        batcher = LedgerBatcher(all_order_books=_RecordingOrderBooks())
+        for ledger_index, transaction_index in [(11, 0), (10, 7), (10, 2), (12, 1)]:
+            batcher.add(transaction=_txn(ledger_index, transaction_index))
+        self.assertEqual(batcher.close_ledger(ledger_index=12), 3)
+        self.assertEqual(_RecordingOrderBooks.batches, [[2, 7, 0]])
+        self.assertEqual(batcher.flush(), 1)
+        self.assertEqual(batcher.buffered_transactions, 0)
+
+    def test_wait_for_all_connections(self: TestLedgerBatcher):
+        _RecordingOrderBooks.batches = []
+        batcher = LedgerBatcher(all_order_books=_RecordingOrderBooks(), connections=2)
+        batcher.close_ledger(ledger_index=10, connection=0)
+        self.assertEqual(batcher.close_ledger(ledger_index=10, connection=1), 0)
+        batcher.add(transaction=_txn(10, 7))
+        # ledger 10 is complete on connection 0 only
+        self.assertEqual(batcher.close_ledger(ledger_index=11, connection=0), 0)
+        batcher.add(transaction=_txn(10, 2))
+        self.assertEqual(batcher.buffered_transactions, 2)
+        self.assertEqual(batcher.close_ledger(ledger_index=11, connection=1), 2)
+        self.assertEqual(_RecordingOrderBooks.batches, [[2, 7]])
+
+    def test_late_transaction_marks_stale(self: TestLedgerBatcher):
+        ledger_index = TXN["ledger_index"]
+        self.batcher.close_ledger(ledger_index=ledger_index + 1)
+        self.batcher.add(transaction=deepcopy(TXN))
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [XRP_USD])
+        self.assertEqual(len(order_book.pending_transactions), 1)
+        self.assertEqual(len(order_book.asks), 1)
+
+
+class TestUpdateOrderBooksBatch(TestCase):
+    def test_batch_matches_single_update(self: TestUpdateOrderBooksBatch):
+        single, batch = OrderBooks(), OrderBooks()
+        for order_books in (single, batch):
+            order_books.set_order_book(
+                OrderBook(
+                    asks=deepcopy(ASKS),
+                    bids=deepcopy(BIDS),
+                    currency_pair=XRP_USD,
+                    exchange_rate=Decimal(0),
+                )
+            )
+        single.update_order_books(deepcopy(TXN))
+        batch.update_order_books_batch([deepcopy(TXN)])
+        self.assertEqual(single.get_order_book(XRP_USD), batch.get_order_book(XRP_USD))
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest import TestCase, skipUnless
+
+from xrpl_trading_bot.order_books import OrderBook, OrderBooks
+from xrpl_trading_bot.order_books.columns import numpy_available
+
+USD = {"currency": "USD", "issuer": "rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"}
+
+
+def _offer(index: str, taker_gets, taker_pays):
+    return {
+        "Account": "rAccount",
+        "BookDirectory": "00" * 32,
+        "BookNode": "0",
+        "Flags": 0,
+        "LedgerEntryType": "Offer",
+        "OwnerNode": "0",
+        "PreviousTxnID": f"TXN{index}",
+        "PreviousTxnLgrSeq": 1,
+        "Sequence": 1,
+        "TakerGets": taker_gets,
+        "TakerPays": taker_pays,
+        "index": index,
+    }
+
+
+@skipUnless(numpy_available(), "numpy is not installed")
+class TestOrderBookSideColumns(TestCase):
+    def setUp(self: TestOrderBookSideColumns):
+        self.order_book = OrderBook(
+            asks=[
+                _offer("A", "10000000", {**USD, "value": "5"}),
+                _offer("B", "20000000", {**USD, "value": "12"}),
+            ],
+            bids=[_offer("C", {**USD, "value": "4"}, "10000000")],
+            currency_pair=f"XRP/USD.{USD['issuer']}",
+            exchange_rate=Decimal(0),
+        )
+
+    def test_columns(self: TestOrderBookSideColumns):
+        asks = self.order_book.ask_columns
+        self.assertEqual(asks.quality.tolist(), [0.5, 0.6])
+        self.assertEqual(asks.cumulative_depth().tolist(), [10.0, 30.0])
+        self.assertEqual(self.order_book.bid_columns.quality.tolist(), [0.4])
+        self.assertEqual(self.order_book.bid_columns.base_amounts.tolist(), [10.0])
+
+    def test_vwap_and_price_impact(self: TestOrderBookSideColumns):
+        asks = self.order_book.ask_columns
+        vwap = asks.vwap(sizes=[5, 20, 40])
+        self.assertAlmostEqual(vwap[0], 0.5)
+        self.assertAlmostEqual(vwap[1], 0.55)
+        self.assertTrue(vwap[2] != vwap[2])  # NaN, the side is too thin
+        self.assertAlmostEqual(asks.price_impact(sizes=[20])[0], 10.0)
+
+    def test_columns_follow_side(self: TestOrderBookSideColumns):
+        columns = self.order_book.ask_columns
+        self.assertIs(self.order_book.ask_columns, columns)
+        asks = self.order_book.asks
+        asks.remove(offer=asks.find(index="A"))
+        self.assertEqual(self.order_book.ask_columns.quality.tolist(), [0.6])
+
+    def test_partially_funded_bid(self: TestOrderBookSideColumns):
+        order_books = OrderBooks()
+        order_books.set_order_book(self.order_book)
+        order_books.update_order_books(
+            transaction={
+                "transaction": {
+                    "Account": "rAccount",
+                    "TransactionType": "OfferCreate",
+                    "hash": "TXND",
+                    "owner_funds": "50",
+                },
+                "ledger_index": 2,
+                "meta": {
+                    "AffectedNodes": [
+                        {
+                            "CreatedNode": {
+                                "LedgerEntryType": "Offer",
+                                "LedgerIndex": "D",
+                                "NewFields": {
+                                    "Account": "rAccount",
+                                    "BookDirectory": "00" * 32,
+                                    "Sequence": 2,
+                                    "TakerGets": {**USD, "value": "100"},
+                                    "TakerPays": "200000000",
+                                },
+                            }
+                        }
+                    ],
+                    "TransactionIndex": 0,
+                    "TransactionResult": "tesSUCCESS",
+                },
+            }
+        )
+        bids = order_books.get_order_book(
+            currency_pair=self.order_book.currency_pair
+        ).bid_columns
+        # 50 of 100 USD are funded, so 100 of 200 XRP can be bought
+        self.assertEqual(sorted(bids.counter_amounts.tolist()), [4.0, 50.0])
+        self.assertEqual(sorted(bids.base_amounts.tolist()), [10.0, 100.0])
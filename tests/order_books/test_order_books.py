@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from decimal import Decimal
+from unittest import TestCase
+
+from tests.txn_parser import test_final_txn_parser
+from xrpl_trading_bot.order_books import OrderBook, OrderBooks
+
+# the parser tests modify their fixtures in place
+ASKS = deepcopy(test_final_txn_parser.ASKS)
+BIDS = deepcopy(test_final_txn_parser.BIDS)
+TXN = deepcopy(test_final_txn_parser.TXN)
+
+XRP_USD = "XRP/USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+XRP_EUR = "XRP/EUR.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+
+
+class TestOrderBooks(TestCase):
+    def setUp(self: TestOrderBooks):
+        self.order_books = OrderBooks()
+        self.order_books.set_order_book(
+            OrderBook(
+                asks=deepcopy(ASKS),
+                bids=deepcopy(BIDS),
+                currency_pair=XRP_USD,
+                exchange_rate=Decimal(0),
+            )
+        )
+        self.untouched = OrderBook(
+            asks=[],
+            bids=[],
+            currency_pair=XRP_EUR,
+            exchange_rate=Decimal(0),
+        )
+        self.order_books.set_order_book(self.untouched)
+
+    def test_update_touched_order_book(self: TestOrderBooks):
+        self.order_books.update_order_books(deepcopy(TXN))
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(len(order_book.asks), 2)
+        self.assertEqual(len(order_book.bids), 1)
+        self.assertIs(self.order_books.get_order_book(XRP_EUR), self.untouched)
+
+    def test_drop_failed_transaction(self: TestOrderBooks):
+        txn = deepcopy(TXN)
+        txn["meta"]["TransactionResult"] = "tecUNFUNDED_OFFER"
+        self.order_books.update_order_books(txn)
+        self.assertEqual(len(self.order_books.get_order_book(XRP_USD).asks), 1)
+
+    def test_snapshot_offers_derived_once(self: TestOrderBooks):
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(order_book.asks[0]["TakerGets"], "1380.000000")
+        self.assertEqual(order_book.asks[0]["quality"], "0.620146500000")
+        self.order_books.update_order_books(deepcopy(TXN))
+        self.assertEqual(order_book.asks[0]["TakerGets"], "1380.000000")
+
+    def test_update_empty_order_book(self: TestOrderBooks):
+        self.order_books.set_order_book(
+            OrderBook(
+                asks=[],
+                bids=[],
+                currency_pair=XRP_USD,
+                exchange_rate=Decimal(0),
+            )
+        )
+        self.order_books.update_order_books(deepcopy(TXN))
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(len(order_book.asks), 1)
+        self.assertEqual(order_book.asks[0]["quality"], "0.637440000000")
+
+    def test_spread(self: TestOrderBooks):
+        self.assertEqual(
+            self.order_books.get_order_book(XRP_USD).spread,
+            Decimal("17.56730385086477921916174807"),
+        )
+
+    def test_track_ledger_indexes(self: TestOrderBooks):
+        self.order_books.set_order_book(
+            OrderBook.from_snapshot(
+                asks=deepcopy(ASKS),
+                bids=deepcopy(BIDS),
+                currency_pair=XRP_USD,
+                ledger_index=TXN["ledger_index"] - 1,
+            )
+        )
+        self.order_books.update_order_books(deepcopy(TXN))
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertEqual(order_book.snapshot_ledger_index, TXN["ledger_index"] - 1)
+        self.assertEqual(order_book.last_ledger_index, TXN["ledger_index"])
+
+    def test_skip_transactions_of_snapshot(self: TestOrderBooks):
+        snapshot = OrderBook.from_snapshot(
+            asks=deepcopy(ASKS),
+            bids=deepcopy(BIDS),
+            currency_pair=XRP_USD,
+            ledger_index=TXN["ledger_index"],
+        )
+        self.order_books.set_order_book(snapshot)
+        self.order_books.update_order_books(deepcopy(TXN))
+        self.assertIs(self.order_books.get_order_book(XRP_USD), snapshot)
+
+    def test_resync_stale_order_book(self: TestOrderBooks):
+        self.assertEqual(self.order_books.mark_stale([XRP_USD, "XRP/GBP"]), [XRP_USD])
+        self.assertEqual(self.order_books.mark_stale([XRP_USD]), [])
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [XRP_USD])
+        old_txn, new_txn = deepcopy(TXN), deepcopy(TXN)
+        old_txn["ledger_index"] -= 1
+        self.order_books.update_order_books(old_txn)
+        self.order_books.update_order_books(new_txn)
+        # stale order books keep their transactions
+        self.assertEqual(len(self.order_books.get_order_book(XRP_USD).asks), 1)
+        replayed = self.order_books.resync_order_book(
+            OrderBook.from_snapshot(
+                asks=deepcopy(ASKS),
+                bids=deepcopy(BIDS),
+                currency_pair=XRP_USD,
+                ledger_index=TXN["ledger_index"] - 1,
+            )
+        )
+        self.assertEqual(replayed, 1)
+        order_book = self.order_books.get_order_book(XRP_USD)
+        self.assertFalse(order_book.is_stale)
+        self.assertEqual(len(order_book.asks), 2)
+        self.assertEqual(order_book.last_ledger_index, TXN["ledger_index"])
+        self.assertEqual(self.order_books.get_stale_currency_pairs(), [])
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from copy import deepcopy
+from unittest import TestCase
+
+from benchmarks import (
+    SyntheticData,
+    compare_results,
+    recorded_cases,
+    run_suite,
+    synthetic_cases,
+)
+from xrpl_trading_bot.txn_parser import parse_final_order_book
+
+
+class TestSyntheticData(TestCase):
+    def test_affected_nodes(self: TestSyntheticData):
+        data = SyntheticData(seed=1)
+        book = data.order_book(depth=20)
+        for size in (1, 10, 50):
+            for transaction in (
+                data.offer_create(book=book, affected_nodes=size),
+                data.payment(book=book, affected_nodes=size),
+            ):
+                self.assertEqual(
+                    len(transaction["meta"]["AffectedNodes"]), size, msg=size
+                )
+
+    def test_same_seed_same_data(self: TestSyntheticData):
+        self.assertEqual(
+            SyntheticData(seed=3).order_book(depth=5),
+            SyntheticData(seed=3).order_book(depth=5),
+        )
+
+    def test_transactions_apply(self: TestSyntheticData):
+        data = SyntheticData(seed=2)
+        book = data.order_book(depth=20)
+        transaction = data.offer_create(book=book, affected_nodes=10)
+        result = parse_final_order_book(
+            asks=deepcopy(book.asks),
+            bids=deepcopy(book.bids),
+            transaction=transaction,
+            to_xrp=True,
+            currency_pair=book.currency_pair,
+        )
+        consumed = {
+            node["DeletedNode"]["LedgerIndex"]
+            for node in transaction["meta"]["AffectedNodes"]
+            if "DeletedNode" in node
+        }
+        self.assertTrue(consumed)
+        self.assertFalse(consumed & {offer.index for offer in result["asks"]})
+        self.assertEqual(len(result["asks"]), len(book.asks) - len(consumed))
+        self.assertGreater(result["spread"], 0)
+
+
+class TestSuite(TestCase):
+    def test_run_and_compare(self: TestSuite):
+        results = run_suite(
+            cases=synthetic_cases(depths=(10,), universes=(10,), sizes=(1,)),
+            rounds=1,
+            min_time=0,
+        )
+        json.dumps(results)
+        self.assertEqual(
+            {result["benchmark"] for result in results["results"]},
+            {
+                "parse_final_order_book",
+                "parse_order_book_changes",
+                "parse_final_balances",
+                "normalize_nodes",
+                "OrderBooks.update_order_books",
+            },
+        )
+        self.assertEqual(compare_results(baseline=results, current=results), [])
+        slower = deepcopy(results)
+        slower["results"][0]["median"] *= 2
+        regressions = compare_results(baseline=results, current=slower)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]["ratio"], 2)
+
+    def test_recorded(self: TestSuite):
+        data = SyntheticData(seed=4)
+        book = data.order_book(depth=10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "transactions.jsonl")
+            with open(path, "w") as file:
+                for size in (3, 10):
+                    json.dump(data.payment(book=book, affected_nodes=size), file)
+                    file.write("\n")
+            results = run_suite(cases=recorded_cases(path=path), rounds=1, min_time=0)
+        self.assertEqual(len(results["results"]), 4)
+        self.assertTrue(
+            all(
+                result["source"] == "transactions.jsonl"
+                for result in results["results"]
+            )
+        )
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from asyncio import run, sleep
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+from xrpl.wallet import Wallet
+
+
+class _Nodes:
+    @classmethod
+    def from_nodes(cls, nodes):
+        return cls()
+
+    async def probe_all(self):
+        pass
+
+    async def run(self):
+        await sleep(60)
+
+
+class TestMain(TestCase):
+    def test_books_built_after_balances(self: TestMain):
+        with patch("getpass.getpass", return_value=Wallet.create().seed):
+            from xrpl_trading_bot import main
+
+        subscribed = []
+
+        async def fetch_balances(wallet, nodes):
+            wallet.balances = {"XRP": "100", "USD.rIssuer": "10"}
+
+        async def fetch_fees(wallet, nodes):
+            return {"rIssuer": Decimal("0.002")}
+
+        async def account_stream(wallet, nodes):
+            await sleep(60)
+
+        class Subscriptions:
+            def __init__(self, all_order_books, connections, snapshots, batch, nodes):
+                pass
+
+            async def run(self, subscribe_books):
+                subscribed.extend(subscribe_books)
+                raise ConnectionError("closed")
+
+        with patch.multiple(
+            "xrpl_trading_bot.clients.engine",
+            NodeManager=_Nodes,
+            get_current_account_balances_async=fetch_balances,
+            get_gateway_fees_async=fetch_fees,
+            stream_account_balances_async=account_stream,
+            BookSubscriptionManager=Subscriptions,
+        ):
+            with self.assertRaises(ConnectionError):
+                run(main.main())
+        self.assertEqual(len(subscribed), 1)
+        self.assertEqual(subscribed[0].taker, main.WALLET.classic_address)
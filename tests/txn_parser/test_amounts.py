@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest import TestCase
+
+from xrpl_trading_bot.txn_parser import Amount, Quality
+
+
+class TestAmount(TestCase):
+    def test_parse(self: TestAmount):
+        amount = Amount.from_currency_amount(
+            {"currency": "USD", "issuer": "rIssuer", "value": "-1.25e-3"}
+        )
+        self.assertEqual((amount.mantissa, amount.exponent), (-125, -5))
+        self.assertEqual(amount.issuer, "rIssuer")
+        self.assertEqual(Amount.from_currency_amount("1380000000").mantissa, 1380000000)
+
+    def test_compare(self: TestAmount):
+        self.assertEqual(Amount.from_value("1.50"), Amount.from_value("1.5"))
+        self.assertLess(Amount.from_value("0.999999999999999"), Amount.from_value("1"))
+        self.assertGreater(Amount.from_value("1e-3"), Amount.from_value("0.0009"))
+
+    def test_normalized(self: TestAmount):
+        self.assertEqual(
+            Amount.from_value("855.80217").normalized(), (8558021700000000, -13)
+        )
+
+    def test_divide_matches_decimal(self: TestAmount):
+        for numerator, denominator in [("1380.000000", "855.80217"), ("520", "1000")]:
+            self.assertEqual(
+                str(
+                    Amount.from_value(numerator)
+                    .divide(Amount.from_value(denominator), precision=28)
+                    .to_decimal()
+                ),
+                str(Decimal(numerator) / Decimal(denominator)),
+            )
+
+    def test_multiply_rounds_half_even(self: TestAmount):
+        product = Amount.from_value("1.25").multiply(Amount.from_value("1"), 2)
+        self.assertEqual(product.to_decimal(), Decimal("1.2"))
+
+
+class TestQuality(TestCase):
+    def test_from_book_directory(self: TestQuality):
+        quality = Quality.from_book_directory(
+            "79C54A4EBD69AB2EADCE313042F36092BE432423CC6A4F784E16A57BA7A80000"
+        )
+        self.assertEqual((quality.mantissa, quality.exponent), (6374400000000000, -22))
+        self.assertEqual(str(quality), "0.00000063744")
+
+    def test_order(self: TestQuality):
+        lower = Quality.from_book_directory("4E16083316697A00")
+        higher = Quality.from_book_directory("4E16A57BA7A80000")
+        self.assertLess(lower, higher)
+        self.assertLess(Quality.from_book_directory("4D16A57BA7A80000"), lower)
+        self.assertGreater(Quality.from_book_directory("5016083316697A00"), higher)
+
+    def test_crosses(self: TestQuality):
+        # ask: 0.62 USD per XRP, bid: 0.52 USD per XRP (1923076.923076923 drops per USD)
+        ask = Quality.from_book_directory("4E16083316697A00")
+        bid = Quality.from_book_directory("5B06D5073CE0313B")
+        self.assertFalse(ask.crosses(bid))
+        self.assertTrue(Quality.from_book_directory("4E11C37937E08000").crosses(bid))
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import os
+from copy import deepcopy
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from tests.txn_parser.test_final_txn_parser import TXN
+from xrpl_trading_bot.txn_parser import (
+    format_balances,
+    parse_balance_changes,
+    parse_transaction_files,
+)
+
+
+def _transaction(ledger_index):
+    transaction = deepcopy(TXN)
+    transaction["ledger_index"] = ledger_index
+    return transaction
+
+
+class TestBulk(TestCase):
+    def test_ordered_results(self: TestBulk):
+        with TemporaryDirectory() as directory:
+            paths = []
+            for number in range(2):
+                path = os.path.join(directory, f"{number}.jsonl")
+                with open(path, "w") as file:
+                    for ledger_index in range(number * 10, number * 10 + 10):
+                        file.write(json.dumps(_transaction(ledger_index)) + "\n")
+                    file.write("not json\n")
+                paths.append(path)
+
+            results = list(
+                parse_transaction_files(paths=paths, processes=2, shard_size=1)
+            )
+            inline = list(
+                parse_transaction_files(
+                    paths=paths, kinds=["balance_changes"], processes=1
+                )
+            )
+
+        self.assertEqual(
+            [result["ledger_index"] for result in results], list(range(20))
+        )
+        self.assertEqual(
+            results[0]["balance_changes"],
+            format_balances(parse_balance_changes(transaction=deepcopy(TXN))),
+        )
+        self.assertEqual(len(results[0]["order_book_changes"]), 1)
+        self.assertEqual(
+            [result["balance_changes"] for result in inline],
+            [result["balance_changes"] for result in results],
+        )
+        self.assertNotIn("final_balances", inline[0])
+        with self.assertRaises(ValueError):
+            next(parse_transaction_files(paths=[], kinds=["unknown"]))
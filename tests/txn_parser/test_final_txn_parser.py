@@ -232,7 +232,7 @@ class TestFinalOrderBookParser(TestCase):
                     },
                     "index": "CFF4CFB39DD62FFCF45E89AEBB128BC78C0D51D7969955D467A42"
                     "DCBF0E9BF15",
-                    "owner_funds": "12925147440",
+                    "owner_funds": "12925.147440",
                     "quality": "0.620146500000",
                 },
                 {
@@ -288,3 +288,26 @@ class TestFinalOrderBookParser(TestCase):
             "spread": Decimal("17.56730385086477921916174807"),
         }
         self.assertEqual(first=actual, second=expected)
+
+    def test_units(self: TestFinalOrderBookParser):
+        actual = parse_final_order_book(
+            asks=ASKS, bids=BIDS, transaction=TXN, to_xrp=True
+        )
+        self.assertEqual(actual["asks"].unit, "XRP")
+        self.assertTrue(all(offer.unit == "XRP" for offer in actual["asks"]))
+        # offers of the snapshot and of the transaction share the unit
+        self.assertEqual(
+            [offer["owner_funds"] for offer in actual["asks"].to_list(unit="drops")],
+            ["12925147440", "53930109305"],
+        )
+        self.assertEqual(
+            actual["bids"].to_list(unit="drops")[0]["TakerPays"],
+            BIDS[0]["TakerPays"],
+        )
+        # sides that are derived already keep their unit
+        self.assertEqual(
+            parse_final_order_book(
+                asks=actual["asks"], bids=actual["bids"], transaction=None
+            )["asks"].unit,
+            "XRP",
+        )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+from xrpl_trading_bot.txn_parser import Amount, Offer, OrderBookSide
+
+
+def _offer(
+    index: str,
+    previous_txn_id: str,
+    previous_txn_lgr_seq: int,
+    book_directory: str = "00" * 32,
+):
+    return Offer(
+        Account="rAccount",
+        BookDirectory=book_directory,
+        BookNode="0",
+        Flags=0,
+        OwnerNode="0",
+        PreviousTxnID=previous_txn_id,
+        PreviousTxnLgrSeq=previous_txn_lgr_seq,
+        Sequence=1,
+        TakerGets="1",
+        TakerPays={"currency": "USD", "issuer": "rIssuer", "value": "1"},
+        index=index,
+        quality="1",
+    )
+
+
+class TestOrderBookSide(TestCase):
+    def setUp(self: TestOrderBookSide):
+        self.side = OrderBookSide(
+            offers=[_offer("A", "TXN1", 1), _offer("B", "TXN2", 2)]
+        )
+
+    def test_find(self: TestOrderBookSide):
+        self.assertEqual(self.side.find(index="B").PreviousTxnID, "TXN2")
+        self.assertEqual(self.side.find(identifiers=("TXN1", 1)).index, "A")
+        self.assertIsNone(self.side.find(index="C", identifiers=("TXN1", 2)))
+
+    def test_replace(self: TestOrderBookSide):
+        offer = self.side.find(index="A")
+        self.side.replace(offer=offer, new_offer=_offer("A", "TXN3", 3))
+        self.assertIsNone(self.side.find(identifiers=("TXN1", 1)))
+        self.assertEqual(self.side.find(identifiers=("TXN3", 3)).index, "A")
+        self.assertEqual(self.side[0].PreviousTxnID, "TXN3")
+
+    def test_remove(self: TestOrderBookSide):
+        self.side.remove(offer=self.side.find(index="A"))
+        self.assertEqual(self.side, [_offer("B", "TXN2", 2).to_dict()])
+        self.assertIsNone(self.side.find(identifiers=("TXN1", 1)))
+
+    def test_sorted_insertion(self: TestOrderBookSide):
+        side = OrderBookSide(
+            offers=[
+                _offer("A", "TXN1", 1, book_directory="00" * 24 + "5A" * 8),
+                _offer("B", "TXN2", 2, book_directory="00" * 24 + "55" * 8),
+            ]
+        )
+        side.append(_offer("C", "TXN3", 3, book_directory="00" * 24 + "55" * 8))
+        side.append(_offer("D", "TXN4", 4, book_directory="00" * 24 + "50" * 8))
+        self.assertEqual([offer.index for offer in side], ["D", "B", "C", "A"])
+        side.replace(
+            offer=side.find(index="B"),
+            new_offer=_offer("B", "TXN5", 5, book_directory="00" * 24 + "55" * 8),
+        )
+        self.assertEqual([offer.index for offer in side], ["D", "B", "C", "A"])
+        side.remove(offer=side.find(index="D"))
+        self.assertEqual(side[0].index, "B")
+
+
+class TestOffer(TestCase):
+    def test_dict_round_trip(self: TestOffer):
+        offer = _offer("A", "TXN1", 1)
+        self.assertEqual(Offer.from_dict(offer=offer.to_dict()), offer)
+        self.assertNotIn("owner_funds", offer.to_dict())
+        self.assertEqual(offer["TakerGets"], "1")
+        with self.assertRaises(KeyError):
+            offer["owner_funds"]
+
+    def test_shared_strings(self: TestOffer):
+        offer = Offer.from_dict(offer=_offer("A", "TXN1", 1).to_dict())
+        other = Offer.from_dict(offer=_offer("B", "TXN2", 2).to_dict())
+        self.assertIs(offer.Account, other.Account)
+        self.assertIs(offer.TakerPays["issuer"], other.TakerPays["issuer"])
+        self.assertFalse(hasattr(offer, "__dict__"))
+
+    def test_parsed_amounts(self: TestOffer):
+        offer = _offer("A", "TXN1", 1)
+        self.assertEqual(offer.taker_gets_amount, Amount(mantissa=1))
+        self.assertEqual(
+            offer.taker_pays_amount,
+            Amount(mantissa=1, currency="USD", issuer="rIssuer"),
+        )
+        self.assertNotIn("taker_gets_amount", offer.to_dict())
+        side = OrderBookSide(offers=[offer])
+        self.assertIs(side.tip_quality(), offer.quality_amount)
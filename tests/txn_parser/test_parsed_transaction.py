@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from copy import deepcopy
+from unittest import TestCase
+
+from xrpl.core.binarycodec import encode
+
+from tests.txn_parser.test_final_txn_parser import ASKS, BIDS, TXN
+from xrpl_trading_bot.txn_parser import (
+    OrderChange,
+    ParsedTransaction,
+    derive_affected_currency_pairs,
+    format_balances,
+    parse_balance_changes,
+    parse_final_balances,
+    parse_final_order_book,
+    parse_order_book_changes,
+)
+from xrpl_trading_bot.txn_parser.utils.order_book_changes_utils import NormalizedOffer
+from xrpl_trading_bot.txn_parser.utils.transaction_data_utils import normalize_node
+from xrpl_trading_bot.txn_parser.utils.types import AccountBalance
+
+
+class TestParsedTransaction(TestCase):
+    def test_same_results_as_raw(self: TestParsedTransaction):
+        parsed = ParsedTransaction(transaction=deepcopy(TXN))
+        self.assertEqual(
+            parse_final_order_book(
+                asks=ASKS, bids=BIDS, transaction=parsed, to_xrp=True
+            ),
+            parse_final_order_book(
+                asks=ASKS, bids=BIDS, transaction=deepcopy(TXN), to_xrp=True
+            ),
+        )
+        self.assertEqual(
+            parse_balance_changes(transaction=parsed),
+            parse_balance_changes(transaction=deepcopy(TXN)),
+        )
+        self.assertEqual(
+            parse_final_balances(transaction=parsed),
+            parse_final_balances(transaction=deepcopy(TXN)),
+        )
+        self.assertEqual(
+            parse_order_book_changes(transaction=parsed),
+            parse_order_book_changes(transaction=deepcopy(TXN)),
+        )
+
+    def test_parsed_once(self: TestParsedTransaction):
+        parsed = ParsedTransaction(transaction=deepcopy(TXN))
+        self.assertIs(ParsedTransaction.of(transaction=parsed), parsed)
+        self.assertEqual(
+            parsed.affected_currency_pairs,
+            {
+                "XRP/USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq",
+                "USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq/XRP",
+            },
+        )
+        offers = parsed.offers(
+            currency_pair="XRP/USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq", to_xrp=True
+        )
+        self.assertIs(
+            parsed.offers(
+                currency_pair="XRP/USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq",
+                to_xrp=True,
+            ),
+            offers,
+        )
+        self.assertIs(parsed.final_balances, parsed.final_balances)
+
+    def test_failed_transaction_touches_no_order_book(self: TestParsedTransaction):
+        transaction = deepcopy(TXN)
+        transaction["meta"]["TransactionResult"] = "tecUNFUNDED_OFFER"
+        self.assertEqual(derive_affected_currency_pairs(transaction=transaction), set())
+        self.assertEqual(
+            ParsedTransaction(transaction=transaction).affected_currency_pairs, set()
+        )
+
+    def test_result_types(self: TestParsedTransaction):
+        account = "r3Vh9ZmQxd3C5CPEB8q7VbRuMPxwuC634n"
+        changes = parse_order_book_changes(transaction=deepcopy(TXN))[account]
+        self.assertTrue(all(isinstance(change, OrderChange) for change in changes))
+        created = changes[1].to_dict()
+        self.assertEqual(created["status"], "created")
+        self.assertNotIn("expiration", created)
+        self.assertEqual(created["total_paid"], created["taker_gets"])
+        self.assertEqual(
+            format_balances(parse_balance_changes(transaction=deepcopy(TXN))),
+            {account: [{"Counterparty": "", "Currency": "XRP", "Value": "-0.000020"}]},
+        )
+
+    def test_address_scoped_balances(self: TestParsedTransaction):
+        account = "r3Vh9ZmQxd3C5CPEB8q7VbRuMPxwuC634n"
+        self.assertEqual(
+            parse_final_balances(transaction=deepcopy(TXN), addresses={account}),
+            parse_final_balances(transaction=deepcopy(TXN)),
+        )
+        self.assertEqual(
+            parse_balance_changes(transaction=deepcopy(TXN), addresses={"rOther"}),
+            {},
+        )
+        parsed = ParsedTransaction(transaction=deepcopy(TXN))
+        parsed.final_balances
+        self.assertEqual(parsed.final_balances_of(addresses={"rOther"}), {})
+
+
+def binary_transaction():
+    fields = {
+        name: value
+        for name, value in TXN["transaction"].items()
+        if name not in ("date", "hash", "owner_funds")
+    }
+    return {
+        "tx_blob": encode(fields),
+        "meta": encode(TXN["meta"]),
+        "ledger_index": TXN["ledger_index"],
+    }
+
+
+class TestBinaryTransaction(TestCase):
+    def test_same_results_as_json(self: TestBinaryTransaction):
+        binary = ParsedTransaction(transaction=binary_transaction())
+        parsed = ParsedTransaction(transaction=deepcopy(TXN))
+        self.assertEqual(binary.hash, TXN["transaction"]["hash"])
+        self.assertIsNone(binary._fields)
+        self.assertEqual(binary.order_changes, parsed.order_changes)
+        self.assertEqual(binary.balance_changes, parsed.balance_changes)
+        pair = "XRP/USD.rhub8VRN55s94qWKDv6jmDy1pUykJzF3wq"
+        # binary responses carry no owner_funds, so no funded amounts
+        fields = [
+            field
+            for field in NormalizedOffer.__slots__
+            if field not in ("owner_funds", "taker_gets_funded", "taker_pays_funded")
+        ]
+        self.assertEqual(
+            [
+                [getattr(offer, field) for field in fields]
+                for offer in binary.offers(currency_pair=pair, to_xrp=True)
+            ],
+            [
+                [getattr(offer, field) for field in fields]
+                for offer in parsed.offers(currency_pair=pair, to_xrp=True)
+            ],
+        )
+        self.assertEqual(binary.fields["Account"], TXN["transaction"]["Account"])
+
+
+class TestNormalizedNode(TestCase):
+    def test_lazy_fields(self: TestNormalizedNode):
+        node = normalize_node(
+            affected_node={
+                "ModifiedNode": {
+                    "LedgerEntryType": "RippleState",
+                    "LedgerIndex": "ABC",
+                    "FinalFields": {
+                        "Balance": {
+                            "currency": "USD",
+                            "issuer": "rrrrrrrrrrrrrrrrrrrrBZbvji",
+                            "value": "-10",
+                        },
+                    },
+                }
+            }
+        )
+        self.assertEqual(node.diff_type, "ModifiedNode")
+        self.assertEqual(node.entry_type, "RippleState")
+        self.assertIsNone(node.new_fields)
+        self.assertIsNone(node.previous_fields)
+        self.assertTrue(hasattr(node.final_fields, "TakerPays"))
+        self.assertIsNone(node.final_fields.TakerPays)
+        self.assertEqual(
+            node.final_fields.Balance,
+            AccountBalance(
+                counterparty="rrrrrrrrrrrrrrrrrrrrBZbvji", currency="USD", value="-10"
+            ),
+        )
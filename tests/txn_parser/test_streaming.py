@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from asyncio import run
+from copy import deepcopy
+from unittest import TestCase
+
+from tests.txn_parser.test_final_txn_parser import ASKS, BIDS, TXN
+from xrpl_trading_bot.txn_parser import (
+    XRPLTxnFieldsException,
+    aiter_order_book_states,
+    iter_balance_changes,
+    iter_order_book_changes,
+    iter_order_book_states,
+    parse_final_order_book,
+)
+
+MALFORMED = {"meta": {"AffectedNodes": []}}
+
+
+class TestStreaming(TestCase):
+    def test_iter_changes(self: TestStreaming):
+        transactions = iter([deepcopy(TXN), MALFORMED])
+        changes = iter_order_book_changes(
+            transactions=transactions, skip_malformed=True
+        )
+        parsed, order_changes = next(changes)
+        self.assertEqual(parsed.hash, TXN["transaction"]["hash"])
+        self.assertEqual(len(order_changes["r3Vh9ZmQxd3C5CPEB8q7VbRuMPxwuC634n"]), 2)
+        self.assertEqual(list(changes), [])
+        with self.assertRaises(XRPLTxnFieldsException):
+            list(iter_balance_changes(transactions=[MALFORMED]))
+
+    def test_order_book_states(self: TestStreaming):
+        expected = parse_final_order_book(
+            asks=deepcopy(ASKS), bids=deepcopy(BIDS), transaction=TXN, to_xrp=True
+        )
+        states = list(
+            iter_order_book_states(
+                asks=deepcopy(ASKS),
+                bids=deepcopy(BIDS),
+                transactions=[deepcopy(TXN)],
+                to_xrp=True,
+            )
+        )
+        self.assertEqual(len(states), 1)
+        self.assertEqual(states[0][1], expected)
+
+        async def transactions():
+            yield deepcopy(TXN)
+
+        async def main():
+            return [
+                order_book
+                async for _, order_book in aiter_order_book_states(
+                    asks=deepcopy(ASKS),
+                    bids=deepcopy(BIDS),
+                    transactions=transactions(),
+                    to_xrp=True,
+                )
+            ]
+
+        self.assertEqual(run(main()), [expected])
@@ -1,15 +1,59 @@
+from xrpl_trading_bot.clients.engine import MarketDataEngine
+from xrpl_trading_bot.clients.ingest import (
+    Decoder,
+    Frame,
+    FrameFilter,
+    book_filter,
+    default_decoder,
+    orjson_available,
+    peek_ledger_index,
+    peek_type,
+    type_filter,
+)
 from xrpl_trading_bot.clients.main import xrp_request_async
 from xrpl_trading_bot.clients.methods import (
     get_gateway_fees,
+    get_gateway_fees_async,
+    get_ledger_transactions,
+    get_ledger_transactions_async,
     subscribe_to_account_balances,
+    subscribe_to_account_balances_async,
     subscribe_to_order_books,
+    subscribe_to_order_books_async,
 )
+from xrpl_trading_bot.clients.nodes import NodeManager, NodeStatus
+from xrpl_trading_bot.clients.pool import ConnectionPool, close_pools, get_pool
+from xrpl_trading_bot.clients.snapshots import SnapshotLoader, XRPLSnapshotException
+from xrpl_trading_bot.clients.subscriptions import BookSubscriptionManager
 from xrpl_trading_bot.clients.websocket_uri import FullHistoryNodes, NonFullHistoryNodes
 
 __all__ = [
     "get_gateway_fees",
+    "get_gateway_fees_async",
+    "get_ledger_transactions",
+    "get_ledger_transactions_async",
     "subscribe_to_account_balances",
+    "subscribe_to_account_balances_async",
     "subscribe_to_order_books",
+    "subscribe_to_order_books_async",
+    "MarketDataEngine",
+    "BookSubscriptionManager",
+    "Decoder",
+    "Frame",
+    "FrameFilter",
+    "book_filter",
+    "default_decoder",
+    "orjson_available",
+    "peek_ledger_index",
+    "peek_type",
+    "type_filter",
+    "NodeManager",
+    "NodeStatus",
+    "ConnectionPool",
+    "close_pools",
+    "get_pool",
+    "SnapshotLoader",
+    "XRPLSnapshotException",
     "xrp_request_async",
     "FullHistoryNodes",
     "NonFullHistoryNodes",
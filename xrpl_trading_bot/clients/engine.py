@@ -0,0 +1,166 @@
+"""Runs all market data streams of the bot as tasks of one event loop."""
+
+from __future__ import annotations
+
+from asyncio import FIRST_EXCEPTION, Task, create_task, gather, sleep, wait
+from decimal import Decimal
+from typing import Any, Coroutine, Dict, List, Optional
+
+from xrpl.models.requests.subscribe import SubscribeBook
+
+from xrpl_trading_bot.clients.methods import (
+    get_current_account_balances_async,
+    get_gateway_fees_async,
+    stream_account_balances_async,
+)
+from xrpl_trading_bot.clients.nodes import NodeManager
+from xrpl_trading_bot.clients.pool import close_pools
+from xrpl_trading_bot.clients.snapshots import SNAPSHOT_CONCURRENCY, SnapshotLoader
+from xrpl_trading_bot.clients.subscriptions import (
+    SUBSCRIPTION_CONNECTIONS,
+    BookSubscriptionManager,
+)
+from xrpl_trading_bot.clients.websocket_uri import FullHistoryNodes, NonFullHistoryNodes
+from xrpl_trading_bot.order_books import OrderBooks, build_subscription_books
+from xrpl_trading_bot.wallet import XRPWallet
+
+FEE_REFRESH_INTERVAL = 3600
+"""Seconds between two refreshes of the gateway fees."""
+
+
+class MarketDataEngine:
+    """
+    Receives the account balances, the order books and the gateway fees.
+    Snapshots, subscriptions, the account stream and the fee refreshes are
+    tasks of one event loop, so the number of threads does not grow with the
+    number of currency pairs. The order book subscriptions share a few
+    connections. Requests and subscriptions go to the best of the listed
+    nodes, which are probed by tasks of the engine as well. If one task fails
+    or the engine gets stopped, all other tasks get cancelled.
+    """
+
+    def __init__(
+        self: MarketDataEngine,
+        wallet: XRPWallet,
+        all_order_books: OrderBooks,
+        gateway_fees: Dict[str, Decimal],
+        fee_refresh_interval: float = FEE_REFRESH_INTERVAL,
+        snapshot_concurrency: int = SNAPSHOT_CONCURRENCY,
+        subscription_connections: int = SUBSCRIPTION_CONNECTIONS,
+        batch_ledgers: bool = False,
+        nodes: Optional[NodeManager] = None,
+        full_history_nodes: Optional[NodeManager] = None,
+    ) -> None:
+        """
+        Args:
+            wallet: The wallet.
+            all_order_books: All order books.
+            gateway_fees: The transfer fees of the issuers, kept up to date.
+            fee_refresh_interval: Seconds between two refreshes of the gateway
+                fees. Defaults to 3600.
+            snapshot_concurrency: Number of snapshot requests that run at the
+                same time. Defaults to 5.
+            subscription_connections: Number of connections the order book
+                subscriptions are spread over. Defaults to 2.
+            batch_ledgers: If order book updates are applied once per closed
+                ledger. Defaults to False.
+            nodes: The nodes of the subscriptions and account requests.
+                Defaults to all `NonFullHistoryNodes`.
+            full_history_nodes: The nodes of the snapshot requests.
+                Defaults to all `FullHistoryNodes`.
+        """
+        self.wallet = wallet
+        self.all_order_books = all_order_books
+        self.gateway_fees = gateway_fees
+        self.fee_refresh_interval = fee_refresh_interval
+        self.snapshot_concurrency = snapshot_concurrency
+        self.subscription_connections = subscription_connections
+        self.batch_ledgers = batch_ledgers
+        self.nodes = (
+            nodes
+            if nodes is not None
+            else NodeManager.from_nodes(nodes=NonFullHistoryNodes)
+        )
+        self.full_history_nodes = (
+            full_history_nodes
+            if full_history_nodes is not None
+            else NodeManager.from_nodes(nodes=FullHistoryNodes)
+        )
+        self._tasks: List[Task[Any]] = []
+
+    async def _refresh_gateway_fees(self: MarketDataEngine) -> None:
+        while True:
+            await sleep(self.fee_refresh_interval)
+            self.gateway_fees.update(
+                await get_gateway_fees_async(wallet=self.wallet, nodes=self.nodes)
+            )
+
+    def _start(self: MarketDataEngine, coroutine: Coroutine[Any, Any, Any]) -> None:
+        self._tasks.append(create_task(coroutine))
+
+    async def run(
+        self: MarketDataEngine,
+        subscribe_books: Optional[List[List[SubscribeBook]]] = None,
+    ) -> None:
+        """
+        Probes the nodes and receives the balances and gateway fees once, then
+        runs all streams until one of them fails or the engine gets stopped.
+
+        Args:
+            subscribe_books: Chunks of max. 10 SubscribeBook objects. Defaults
+                to the order books of all currencies the wallet holds, built
+                once the balances are received.
+
+        Raises:
+            BaseException: The exception of the first task that failed.
+        """
+        await gather(self.nodes.probe_all(), self.full_history_nodes.probe_all())
+        await get_current_account_balances_async(wallet=self.wallet, nodes=self.nodes)
+        self.gateway_fees.update(
+            await get_gateway_fees_async(wallet=self.wallet, nodes=self.nodes)
+        )
+        if subscribe_books is None:
+            subscribe_books = build_subscription_books(wallet=self.wallet)
+        subscriptions = BookSubscriptionManager(
+            all_order_books=self.all_order_books,
+            connections=self.subscription_connections,
+            snapshots=SnapshotLoader(
+                concurrency=self.snapshot_concurrency, nodes=self.full_history_nodes
+            ),
+            batch=self.batch_ledgers,
+            nodes=self.nodes,
+        )
+        self._start(self.nodes.run())
+        self._start(self.full_history_nodes.run())
+        self._start(stream_account_balances_async(wallet=self.wallet, nodes=self.nodes))
+        self._start(self._refresh_gateway_fees())
+        self._start(
+            subscriptions.run(
+                subscribe_books=[book for chunk in subscribe_books for book in chunk]
+            )
+        )
+        try:
+            done, _ = await wait(self._tasks, return_when=FIRST_EXCEPTION)
+            for task in done:
+                exception = None if task.cancelled() else task.exception()
+                if exception is not None:
+                    raise exception
+        finally:
+            await self.stop()
+
+    async def stop(self: MarketDataEngine) -> None:
+        """
+        Cancels all running tasks, waits until they are finished and closes the
+        pooled connections.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await wait(tasks)
+        await close_pools()
+
+    @property
+    def running_tasks(self: MarketDataEngine) -> int:
+        """The number of tasks that are still running."""
+        return len([task for task in self._tasks if not task.done()])
@@ -0,0 +1,122 @@
+"""Raw websocket frames, peeked at before they are decoded."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency
+    orjson = None  # type: ignore
+
+Frame = Union[str, bytes]
+"""A raw websocket frame."""
+Decoder = Callable[[Frame], Any]
+"""Decodes a raw websocket frame."""
+FrameFilter = Callable[[Frame], bool]
+"""Decides if a raw websocket frame gets decoded."""
+
+_TYPE = re.compile(r'"type"\s*:\s*"(\w+)"')
+_LEDGER_INDEX = re.compile(r'"ledger_index"\s*:\s*(\d+)')
+
+
+def _text(frame: Frame) -> str:
+    return frame.decode() if isinstance(frame, bytes) else frame
+
+
+def orjson_available() -> bool:
+    """
+    Returns:
+        If orjson is installed.
+    """
+    return orjson is not None
+
+
+def default_decoder() -> Decoder:
+    """
+    Returns:
+        `orjson.loads` if orjson is installed, else `json.loads`.
+    """
+    if orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+def peek_type(frame: Frame) -> Optional[str]:
+    """
+    Reads the message type of a frame without decoding it. Messages of the
+    subscription streams have no nested `type` field, and nodes write the keys
+    of a message in sorted order, so the type is searched from the end.
+
+    Args:
+        frame: The raw frame.
+
+    Returns:
+        The message type, e.g. `transaction`, `ledgerClosed` or `response`.
+    """
+    text = _text(frame)
+    match = _TYPE.match(text, max(text.rfind('"type"'), 0))
+    if match is None:
+        match = _TYPE.search(text)
+    return match.group(1) if match is not None else None
+
+
+def peek_ledger_index(frame: Frame) -> Optional[int]:
+    """
+    Reads the ledger index of a frame without decoding it.
+
+    Args:
+        frame: The raw frame.
+
+    Returns:
+        The ledger index or None if the frame has none.
+    """
+    match = _LEDGER_INDEX.search(_text(frame))
+    return int(match.group(1)) if match is not None else None
+
+
+def type_filter(*message_types: str) -> FrameFilter:
+    """
+    Builds a filter that accepts frames of the given message types.
+
+    Args:
+        message_types: The accepted message types.
+
+    Returns:
+        The filter.
+    """
+    accepted = set(message_types)
+
+    def accept(frame: Frame) -> bool:
+        return peek_type(frame) in accepted
+
+    return accept
+
+
+def book_filter(issuers: Iterable[str]) -> FrameFilter:
+    """
+    Builds a filter for the streams of order book subscriptions. It accepts
+    `ledgerClosed` messages and the transactions that mention one of the
+    issuers. Every order book has at least one issued currency, so a
+    transaction that touched a followed order book mentions its issuer.
+
+    Args:
+        issuers: The issuers of the currencies of the followed order books.
+
+    Returns:
+        The filter.
+    """
+    needles = set(issuers)
+
+    def accept(frame: Frame) -> bool:
+        text = _text(frame)
+        message_type = peek_type(text)
+        if message_type == "ledgerClosed":
+            return True
+        return message_type == "transaction" and any(
+            needle in text for needle in needles
+        )
+
+    return accept
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
-from asyncio import gather
 from typing import List
 
-from xrpl.asyncio.clients import AsyncWebsocketClient
 from xrpl.models.requests import Request
 from xrpl.models.response import Response
 
+from xrpl_trading_bot.clients.pool import get_pool
+
 
 async def xrp_request_async(
     requests: List[Request],
     uri: str = "wss://limpidcrypto.de:6005/",
 ) -> List[Response]:
     """Call mutiple request async.
+    The requests are sent over the pooled connections to the node, see
+    `clients.pool.close_pools` to close them.
 
     Args:
         uri (str): Websocket uri.
@@ -31,8 +33,4 @@ async def xrp_request_async(
         )
         print(results)
     """
-    async with AsyncWebsocketClient(url=uri) as client:
-        requests_for_gather = [client.request(request) for request in requests]
-        responses = await gather(*requests_for_gather)
-
-        return list(responses)
+    return await get_pool(uri=uri).request_many(requests=requests)
@@ -1,37 +1,92 @@
+import logging
 from asyncio import run
 from decimal import Decimal
-from typing import Dict, List, cast
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar, cast
 
-from websockets.exceptions import ConnectionClosedError
-from xrpl.clients import WebsocketClient
-from xrpl.models import AccountInfo, AccountLines, IssuedCurrency, Response, Subscribe
+from xrpl import XRPLException
+from xrpl.asyncio.clients import AsyncWebsocketClient
+from xrpl.models import (
+    AccountInfo,
+    AccountLines,
+    Ledger,
+    Request,
+    Response,
+    Subscribe,
+)
 from xrpl.models.requests.subscribe import SubscribeBook
 from xrpl.utils import drops_to_xrp
 
+from xrpl_trading_bot.clients.ingest import type_filter
 from xrpl_trading_bot.clients.main import xrp_request_async
-from xrpl_trading_bot.clients.utils import _is_order_book
+from xrpl_trading_bot.clients.nodes import NodeManager
+from xrpl_trading_bot.clients.pool import close_pools
+from xrpl_trading_bot.clients.snapshots import SnapshotLoader
+from xrpl_trading_bot.clients.utils import (
+    _derive_subscribe_book_currency_pair,
+    _is_order_book,
+)
 from xrpl_trading_bot.clients.websocket_uri import FullHistoryNodes, NonFullHistoryNodes
-from xrpl_trading_bot.order_books import OrderBook, OrderBooks
-from xrpl_trading_bot.txn_parser import SubscriptionRawTxnType, parse_final_balances
+from xrpl_trading_bot.order_books import OrderBooks
+from xrpl_trading_bot.txn_parser import (
+    ParsedTransaction,
+    SubscriptionRawTxnType,
+    parse_final_balances,
+)
 from xrpl_trading_bot.wallet import XRPWallet
 
 TRANSFER_FEE_PRECISION = 1000000000
 
+_LOGGER = logging.getLogger(__name__)
 
-def get_current_account_balances(wallet: XRPWallet) -> None:
+T = TypeVar("T")
+
+
+def _run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine in a new event loop and closes the pooled connections
+    it has opened.
+
+    Args:
+        coroutine: The coroutine.
+
+    Returns:
+        The result of the coroutine.
+    """
+
+    async def run_and_close() -> T:
+        try:
+            return await coroutine
+        finally:
+            await close_pools()
+
+    return run(run_and_close())
+
+
+async def _request_many(
+    requests: List[Request], nodes: Optional[NodeManager]
+) -> List[Response]:
+    if nodes is None:
+        return await xrp_request_async(requests=requests)
+    return await nodes.request_many(requests=requests)
+
+
+async def get_current_account_balances_async(
+    wallet: XRPWallet, nodes: Optional[NodeManager] = None
+) -> None:
     """
     Get all currency balances the given account holds in a standard format.
 
     Args:
-        account: The accounts address.
-    """
-    account_info, account_lines = run(
-        xrp_request_async(
-            requests=[
-                AccountInfo(account=wallet.classic_address),
-                AccountLines(account=wallet.classic_address),
-            ]
-        )
+        wallet: The wallet.
+        nodes: The nodes the requests are sent to.
+            Defaults to `NonFullHistoryNodes.LIMPIDCRYPTO`.
+    """
+    account_info, account_lines = await _request_many(
+        nodes=nodes,
+        requests=[
+            AccountInfo(account=wallet.classic_address),
+            AccountLines(account=wallet.classic_address),
+        ],
     )
 
     xrp_amount = {
@@ -50,124 +105,122 @@ def get_current_account_balances(wallet: XRPWallet) -> None:
     wallet.balances = account_balances
 
 
-def subscribe_to_account_balances(wallet: XRPWallet) -> None:
+def get_current_account_balances(wallet: XRPWallet) -> None:
     """
-    Receive the accounts balances once then subscribe to the account.
-    The subscribtion receives transaction metadata everytime a transaction
-    affects the account. It then parses the final balances and adjusts the
-    balances of the wallet.
+    Get all currency balances the given account holds in a standard format.
 
     Args:
         wallet: The wallet.
     """
-    get_current_account_balances(wallet=wallet)
+    _run(get_current_account_balances_async(wallet=wallet))
 
-    with WebsocketClient(url=NonFullHistoryNodes.LIMPIDCRYPTO) as client:
-        try:
-            client.send(Subscribe(accounts=[wallet.classic_address]))
-            for message in client:
-                if "result" not in message:
-                    txn = cast(SubscriptionRawTxnType, message)
-                    final_balances = parse_final_balances(transaction=txn)
-                    account_balances = final_balances[wallet.classic_address]
-                    for balance in account_balances:
-                        if balance["Currency"] == "XRP":
-                            wallet.balances["XRP"] = balance["Value"]
-                        else:
-                            token = f"{balance['Currency']}.{balance['Counterparty']}"
-                            wallet.balances[token] = balance["Value"]
-                else:
-                    pass
-        except ConnectionClosedError:
-            return None
 
+async def stream_account_balances_async(
+    wallet: XRPWallet, nodes: Optional[NodeManager] = None
+) -> None:
+    """
+    Subscribe to the account. The subscribtion receives transaction metadata
+    everytime a transaction affects the account. It then parses the final
+    balances and adjusts the balances of the wallet. If the connection gets
+    closed, the subscription continues on the best available node and the
+    balances are received once more.
 
-def _get_snapshots_once(subscribe_books: List[SubscribeBook]) -> List[OrderBook]:
-    responses = run(
-        xrp_request_async(
-            requests=[Subscribe(books=[book]) for book in subscribe_books],
-            uri=FullHistoryNodes.XRPLF,
-        )
-    )
-    assert len(responses) == len(subscribe_books)
-    assert all([response.is_successful() for response in responses])
-    order_books = [
-        OrderBook.from_response(response=response)
-        for response in responses
-        if response.result["asks"] or response.result["bids"]
-    ]
-    successful_currency_pairs = set(
-        order_book.currency_pair for order_book in order_books
-    )
-    subscribe_books_currency_pairs = []
-    for book in subscribe_books:
-        base = (
-            f"{book.taker_pays.currency}.{book.taker_pays.issuer}"
-            if (isinstance(book.taker_pays, IssuedCurrency))
-            else "XRP"
-        )
-        counter = (
-            f"{book.taker_gets.currency}.{book.taker_gets.issuer}"
-            if (isinstance(book.taker_gets, IssuedCurrency))
-            else "XRP"
-        )
-        currency_pair = f"{base}/{counter}"
-        subscribe_books_currency_pairs.append(currency_pair)
-    currency_pairs_diff = set(subscribe_books_currency_pairs).difference(
-        successful_currency_pairs
-    )
-    order_books.extend(
-        [
-            OrderBook(
-                asks=[],
-                bids=[],
-                currency_pair=pair,
-                exchange_rate=Decimal(0),
+    Args:
+        wallet: The wallet.
+        nodes: The nodes the subscription is sent to.
+            Defaults to `NonFullHistoryNodes.LIMPIDCRYPTO`.
+    """
+    if nodes is None:
+        nodes = NodeManager(uris=[NonFullHistoryNodes.LIMPIDCRYPTO])
+
+    async def on_reconnect() -> None:
+        # balance changes may have been missed while the connection was closed
+        await get_current_account_balances_async(wallet=wallet, nodes=nodes)
+
+    async for message in nodes.stream(
+        requests=[Subscribe(accounts=[wallet.classic_address])],
+        on_reconnect=on_reconnect,
+        accept=type_filter("transaction"),
+    ):
+        if "result" not in message:
+            txn = cast(SubscriptionRawTxnType, message)
+            final_balances = parse_final_balances(
+                transaction=txn, addresses={wallet.classic_address}
             )
-            for pair in currency_pairs_diff
-        ]
-    )
-    assert len(order_books) == len(subscribe_books)
+            account_balances = final_balances.get(wallet.classic_address, [])
+            for balance in account_balances:
+                if balance.currency == "XRP":
+                    wallet.balances["XRP"] = balance.value
+                else:
+                    token = f"{balance.currency}.{balance.counterparty}"
+                    wallet.balances[token] = balance.value
+        else:
+            pass
+
 
-    return order_books
+async def subscribe_to_account_balances_async(
+    wallet: XRPWallet, nodes: Optional[NodeManager] = None
+) -> None:
+    """
+    Receive the accounts balances once then subscribe to the account.
 
+    Args:
+        wallet: The wallet.
+        nodes: The nodes the requests are sent to.
+            Defaults to `NonFullHistoryNodes.LIMPIDCRYPTO`.
+    """
+    await get_current_account_balances_async(wallet=wallet, nodes=nodes)
+    await stream_account_balances_async(wallet=wallet, nodes=nodes)
 
-def subscribe_to_order_books(
-    all_order_books: OrderBooks, subscribe_books: List[SubscribeBook]
+
+def subscribe_to_account_balances(wallet: XRPWallet) -> None:
+    """
+    Receive the accounts balances once then subscribe to the account.
+    Blocks until the subscription gets cancelled.
+
+    Args:
+        wallet: The wallet.
+    """
+    _run(subscribe_to_account_balances_async(wallet=wallet))
+
+
+async def subscribe_to_order_books_async(
+    all_order_books: OrderBooks,
+    subscribe_books: List[SubscribeBook],
+    snapshots: Optional[SnapshotLoader] = None,
 ) -> List[SubscribeBook]:
     """
     Receive all snapshots once and then receive all transactions
     that affected one order book and parse the new order books.
+    Books whose snapshot could not be loaded are still subscribed, but have
+    no order book to update.
 
     Args:
         all_order_books:
             All order books.
         subscribe_books:
             Max. 10 SubscribeBook objects.
+        snapshots:
+            Loads the snapshots. Share one loader to limit how many snapshot
+            requests run at the same time. Defaults to a new `SnapshotLoader`.
     """
     assert len(subscribe_books) <= 10
-    order_books = _get_snapshots_once(
-        subscribe_books=subscribe_books,
-    )
+    snapshots = snapshots if snapshots is not None else SnapshotLoader()
+    order_books, failed_books = await snapshots.load(subscribe_books=subscribe_books)
     for order_book in order_books:
         all_order_books.set_order_book(order_book=order_book)
-
-    all_subscription_book_currency_pairs = set()
-    for book in subscribe_books:
-        base = (
-            f"{book.taker_pays.currency}.{book.taker_pays.issuer}"
-            if (isinstance(book.taker_pays, IssuedCurrency))
-            else "XRP"
-        )
-        counter = (
-            f"{book.taker_gets.currency}.{book.taker_gets.issuer}"
-            if (isinstance(book.taker_gets, IssuedCurrency))
-            else "XRP"
+    if failed_books:
+        _LOGGER.warning(
+            "Snapshots of %d order books could not be loaded: %s",
+            len(failed_books),
+            ", ".join(
+                _derive_subscribe_book_currency_pair(book=book) for book in failed_books
+            ),
         )
-        all_subscription_book_currency_pairs.add(f"{base}/{counter}")
-    with WebsocketClient(url=NonFullHistoryNodes.LIMPIDCRYPTO) as client:
-        client.send(Subscribe(books=subscribe_books))
-        for message in client:
+
+    async with AsyncWebsocketClient(url=NonFullHistoryNodes.LIMPIDCRYPTO) as client:
+        await client.send(Subscribe(books=subscribe_books))
+        async for message in client:
             if _is_order_book(message=message):
                 continue
             else:
@@ -177,12 +230,46 @@ def subscribe_to_order_books(
     return subscribe_books
 
 
-def get_gateway_fees(wallet: XRPWallet) -> Dict[str, Decimal]:
+def subscribe_to_order_books(
+    all_order_books: OrderBooks, subscribe_books: List[SubscribeBook]
+) -> List[SubscribeBook]:
+    """
+    Receive all snapshots once and then receive all transactions
+    that affected one order book and parse the new order books.
+    Blocks until the subscription ends.
+
+    Args:
+        all_order_books:
+            All order books.
+        subscribe_books:
+            Max. 10 SubscribeBook objects.
+    """
+    return _run(
+        subscribe_to_order_books_async(
+            all_order_books=all_order_books, subscribe_books=subscribe_books
+        )
+    )
+
+
+async def get_gateway_fees_async(
+    wallet: XRPWallet, nodes: Optional[NodeManager] = None
+) -> Dict[str, Decimal]:
+    """
+    Get the transfer fees of the issuers of all currencies the wallet holds.
+
+    Args:
+        wallet: The wallet.
+        nodes: The nodes the requests are sent to.
+            Defaults to `NonFullHistoryNodes.LIMPIDCRYPTO`.
+
+    Returns:
+        The transfer fee of each issuer.
+    """
     balances = wallet.balances
     currencies = balances.keys()
     issuers = [currency.split(".")[1] for currency in currencies if currency != "XRP"]
-    account_infos: List[Response] = run(
-        xrp_request_async([AccountInfo(account=issuer) for issuer in issuers])
+    account_infos: List[Response] = await _request_many(
+        requests=[AccountInfo(account=issuer) for issuer in issuers], nodes=nodes
     )
     transfer_rates: Dict[str, Decimal] = {}
     for info in account_infos:
@@ -192,3 +279,62 @@ def get_gateway_fees(wallet: XRPWallet) -> Dict[str, Decimal]:
         ) / TRANSFER_FEE_PRECISION
 
     return transfer_rates
+
+
+def get_gateway_fees(wallet: XRPWallet) -> Dict[str, Decimal]:
+    return _run(get_gateway_fees_async(wallet=wallet))
+
+
+async def get_ledger_transactions_async(
+    ledger_index: int, nodes: Optional[NodeManager] = None, binary: bool = True
+) -> List[ParsedTransaction]:
+    """
+    Get all transactions of a validated ledger, e.g. for historical backfills.
+    In binary mode the node sends the transactions and their metadata as hex
+    blobs, which are smaller on the wire. Only the metadata gets decoded, the
+    transaction blobs are decoded when `ParsedTransaction.fields` is read.
+
+    Args:
+        ledger_index: The ledger.
+        nodes: The nodes the request is sent to.
+            Defaults to all `FullHistoryNodes`.
+        binary: If the transactions are requested in binary mode.
+            Defaults to True.
+
+    Raises:
+        XRPLException: If the request was not successful.
+
+    Returns:
+        The parsed transactions in the order they were applied.
+    """
+    if nodes is None:
+        nodes = NodeManager.from_nodes(nodes=FullHistoryNodes)
+    response = await nodes.request(
+        Ledger(ledger_index=ledger_index, transactions=True, expand=True, binary=binary)
+    )
+    if not response.is_successful():
+        raise XRPLException(f"Ledger request failed: {response.result}")
+    transactions = []
+    for transaction in response.result["ledger"]["transactions"]:
+        transaction = dict(transaction, ledger_index=ledger_index)
+        if "metaData" in transaction:  # JSON mode
+            transaction["meta"] = transaction.pop("metaData")
+        transactions.append(ParsedTransaction(transaction=transaction))
+    return sorted(transactions, key=lambda transaction: transaction.transaction_index)
+
+
+def get_ledger_transactions(
+    ledger_index: int, binary: bool = True
+) -> List[ParsedTransaction]:
+    """
+    Get all transactions of a validated ledger, e.g. for historical backfills.
+
+    Args:
+        ledger_index: The ledger.
+        binary: If the transactions are requested in binary mode.
+            Defaults to True.
+
+    Returns:
+        The parsed transactions in the order they were applied.
+    """
+    return _run(get_ledger_transactions_async(ledger_index=ledger_index, binary=binary))
@@ -0,0 +1,362 @@
+"""Selects the best of several nodes and fails over to another one."""
+
+from __future__ import annotations
+
+import json
+from asyncio import TimeoutError, gather, get_running_loop, sleep, wait_for
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+)
+
+from websockets.client import WebSocketClientProtocol, connect
+from xrpl.asyncio.clients.utils import request_to_websocket
+from xrpl.models import Ledger
+from xrpl.models.requests import Request
+from xrpl.models.response import Response
+
+from xrpl_trading_bot.clients.ingest import (
+    Decoder,
+    Frame,
+    FrameFilter,
+    default_decoder,
+)
+from xrpl_trading_bot.clients.pool import _CONNECTION_ERRORS, get_pool
+
+PROBE_INTERVAL = 10.0
+"""Seconds between two probes of all nodes."""
+PROBE_TIMEOUT = 5.0
+"""Seconds to wait for the response of a probe or for a connection to open."""
+REQUEST_TIMEOUT = 10.0
+"""Seconds to wait for the response of a node before the next node is tried."""
+MAX_LEDGER_LAG = 2
+"""Number of ledgers a node may be behind the most recent node."""
+LATENCY_SMOOTHING = 0.3
+"""Weight of the latest round-trip time in the smoothed latency of a node."""
+HEALTH_CHECK_INTERVAL = 1.0
+"""Seconds between two health checks of the node a stream is connected to."""
+RECONNECT_DELAY = 1.0
+"""Seconds before a stream connects again if no other node is available."""
+
+
+@dataclass
+class NodeStatus:
+    """The results of the probes of one node."""
+
+    uri: str
+    """Websocket uri of the node."""
+    latency: Optional[float] = None
+    """Smoothed round-trip time in seconds. None if never probed successfully."""
+    ledger_index: Optional[int] = None
+    """The latest validated ledger of the node."""
+    available: bool = True
+    """If the last probe or connection to the node was successful."""
+    probes: int = 0
+    """Number of probes sent to the node."""
+    successful_probes: int = 0
+    """Number of probes the node answered."""
+
+    @property
+    def uptime(self: NodeStatus) -> float:
+        """The share of answered probes. 1.0 if never probed."""
+        return self.successful_probes / self.probes if self.probes else 1.0
+
+
+class NodeManager:
+    """
+    Probes a list of nodes for their round-trip latency and their latest
+    validated ledger, and routes requests and streams to the best node.
+    A node is healthy if it answered its last probe and is at most
+    `max_ledger_lag` ledgers behind the most recent node. Healthy nodes are
+    ranked by latency, nodes that were not probed yet by their order in the
+    list. Requests are retried on the next node if a node fails. Streams
+    connect to another node and send their subscriptions again when their node
+    closes the connection, falls behind or stops answering probes.
+    """
+
+    def __init__(
+        self: NodeManager,
+        uris: List[str],
+        probe_interval: float = PROBE_INTERVAL,
+        max_ledger_lag: int = MAX_LEDGER_LAG,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL,
+        reconnect_delay: float = RECONNECT_DELAY,
+        request_timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        """
+        Args:
+            uris: Websocket uris of the nodes, the preferred node first.
+            probe_interval: Seconds between two probes. Defaults to 10.0.
+            max_ledger_lag: Number of ledgers a node may be behind the most
+                recent node. Defaults to 2.
+            health_check_interval: Seconds between two health checks of the
+                node of a stream. Defaults to 1.0.
+            reconnect_delay: Seconds before a stream connects again if no other
+                node is available. Defaults to 1.0.
+            request_timeout: Seconds to wait for the response of a node before
+                the request is sent to the next node. Defaults to 10.0.
+        """
+        assert uris
+        self.uris = list(uris)
+        self.probe_interval = probe_interval
+        self.max_ledger_lag = max_ledger_lag
+        self.health_check_interval = health_check_interval
+        self.reconnect_delay = reconnect_delay
+        self.request_timeout = request_timeout
+        self.statuses: Dict[str, NodeStatus] = {
+            uri: NodeStatus(uri=uri) for uri in uris
+        }
+        """The status of each node."""
+
+    @classmethod
+    def from_nodes(cls: Type[NodeManager], nodes: type, **kwargs: Any) -> NodeManager:
+        """
+        Builds a node manager for all nodes of a collection of
+        `websocket_uri`.
+
+        Args:
+            nodes: `FullHistoryNodes` or `NonFullHistoryNodes`.
+            kwargs: Further arguments of the node manager.
+
+        Returns:
+            The node manager.
+        """
+        return cls(
+            uris=[
+                uri
+                for name, uri in vars(nodes).items()
+                if not name.startswith("_") and isinstance(uri, str)
+            ],
+            **kwargs,
+        )
+
+    async def probe(self: NodeManager, uri: str) -> bool:
+        """
+        Measures the round-trip time of a request for the latest validated
+        ledger and updates the status of the node.
+
+        Args:
+            uri: Websocket uri of the node.
+
+        Returns:
+            If the node answered.
+        """
+        status = self.statuses[uri]
+        status.probes += 1
+        loop = get_running_loop()
+        start = loop.time()
+        try:
+            response = await wait_for(
+                get_pool(uri=uri).request(Ledger(ledger_index="validated")),
+                timeout=PROBE_TIMEOUT,
+            )
+        except _CONNECTION_ERRORS:
+            status.available = False
+            return False
+        if not response.is_successful():
+            status.available = False
+            return False
+        latency = loop.time() - start
+        status.latency = (
+            latency
+            if status.latency is None
+            else status.latency + LATENCY_SMOOTHING * (latency - status.latency)
+        )
+        status.ledger_index = int(response.result["ledger_index"])
+        status.available = True
+        status.successful_probes += 1
+        return True
+
+    async def probe_all(self: NodeManager) -> None:
+        """Probes all nodes at once."""
+        await gather(*[self.probe(uri=uri) for uri in self.uris])
+
+    async def run(self: NodeManager) -> None:
+        """Probes all nodes repeatedly until it gets cancelled."""
+        while True:
+            await self.probe_all()
+            await sleep(self.probe_interval)
+
+    def is_healthy(self: NodeManager, uri: str) -> bool:
+        """
+        Args:
+            uri: Websocket uri of the node.
+
+        Returns:
+            If the node is available and not behind the most recent node.
+        """
+        status = self.statuses[uri]
+        if not status.available:
+            return False
+        latest_ledger_index = max(
+            (
+                other.ledger_index
+                for other in self.statuses.values()
+                if other.available and other.ledger_index is not None
+            ),
+            default=None,
+        )
+        return (
+            latest_ledger_index is None
+            or status.ledger_index is None
+            or status.ledger_index >= latest_ledger_index - self.max_ledger_lag
+        )
+
+    def ranked_nodes(self: NodeManager) -> List[str]:
+        """
+        Returns:
+            The uris of all nodes, the best node first.
+        """
+        return sorted(
+            self.uris,
+            key=lambda uri: (
+                not self.is_healthy(uri=uri),
+                self.statuses[uri].latency is None,
+                self.statuses[uri].latency or 0.0,
+                self.uris.index(uri),
+            ),
+        )
+
+    def best_node(self: NodeManager) -> str:
+        """
+        Returns:
+            The uri of the best node.
+        """
+        return self.ranked_nodes()[0]
+
+    def mark_failed(self: NodeManager, uri: str) -> None:
+        """
+        Marks a node unavailable until it answers a probe again.
+
+        Args:
+            uri: Websocket uri of the node.
+        """
+        self.statuses[uri].available = False
+
+    async def request(self: NodeManager, request: Request) -> Response:
+        """
+        Sends a request to the best node. If the node fails or does not answer
+        within `request_timeout`, it is marked failed and the request is sent to
+        the next node.
+
+        Args:
+            request: The request.
+
+        Raises:
+            Exception: The exception of the last node.
+
+        Returns:
+            The response.
+        """
+        nodes = self.ranked_nodes()
+        for uri in nodes[:-1]:
+            try:
+                return await wait_for(
+                    get_pool(uri=uri).request(request), timeout=self.request_timeout
+                )
+            except _CONNECTION_ERRORS:
+                self.mark_failed(uri=uri)
+        return await wait_for(
+            get_pool(uri=nodes[-1]).request(request), timeout=self.request_timeout
+        )
+
+    async def request_many(
+        self: NodeManager, requests: List[Request]
+    ) -> List[Response]:
+        """
+        Sends all requests at once.
+
+        Args:
+            requests: The requests.
+
+        Returns:
+            The responses in the order of the requests.
+        """
+        return list(await gather(*[self.request(request) for request in requests]))
+
+    def _should_leave(self: NodeManager, uri: str) -> bool:
+        return not self.is_healthy(uri=uri) and any(
+            self.is_healthy(uri=other) for other in self.uris if other != uri
+        )
+
+    async def stream_frames(
+        self: NodeManager,
+        requests: List[Request],
+        on_reconnect: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> AsyncIterator[Frame]:
+        """
+        Connects to the best node, sends the subscriptions and yields all
+        received frames without decoding them. If the connection gets closed
+        or the node falls behind, the stream connects to the best node again
+        and sends the same subscriptions.
+
+        Args:
+            requests: The subscriptions.
+            on_reconnect: Called after the subscriptions were sent again,
+                as messages may have been missed. Defaults to None.
+
+        Yields:
+            The received frames.
+        """
+        connected = False
+        while True:
+            uri = self.best_node()
+            websocket: Optional[WebSocketClientProtocol] = None
+            try:
+                websocket = await wait_for(connect(uri), timeout=PROBE_TIMEOUT)
+                for request in requests:
+                    await websocket.send(json.dumps(request_to_websocket(request)))
+                if connected and on_reconnect is not None:
+                    await on_reconnect()
+                connected = True
+                while not self._should_leave(uri=uri):
+                    try:
+                        frame = await wait_for(
+                            websocket.recv(), timeout=self.health_check_interval
+                        )
+                    except TimeoutError:
+                        continue
+                    yield frame
+            except _CONNECTION_ERRORS:
+                pass
+            finally:
+                if websocket is not None:
+                    await websocket.close()
+            self.mark_failed(uri=uri)
+            if not any(self.is_healthy(uri=other) for other in self.uris):
+                await sleep(self.reconnect_delay)
+
+    async def stream(
+        self: NodeManager,
+        requests: List[Request],
+        on_reconnect: Optional[Callable[[], Awaitable[None]]] = None,
+        accept: Optional[FrameFilter] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the decoded messages of `stream_frames`. Frames the filter
+        does not accept are dropped before they are decoded.
+
+        Args:
+            requests: The subscriptions.
+            on_reconnect: Called after the subscriptions were sent again,
+                as messages may have been missed. Defaults to None.
+            accept: Decides if a frame gets decoded. Defaults to all frames.
+            decoder: Decodes the frames. Defaults to `ingest.default_decoder`.
+
+        Yields:
+            The received messages.
+        """
+        decode = decoder if decoder is not None else default_decoder()
+        async for frame in self.stream_frames(
+            requests=requests, on_reconnect=on_reconnect
+        ):
+            if accept is None or accept(frame):
+                yield decode(frame)
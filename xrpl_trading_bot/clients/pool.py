@@ -0,0 +1,258 @@
+"""Long-lived websocket connections shared by all requests to a node."""
+
+from __future__ import annotations
+
+import json
+from asyncio import (
+    AbstractEventLoop,
+    Future,
+    Lock,
+    Semaphore,
+    Task,
+    TimeoutError,
+    create_task,
+    gather,
+    get_running_loop,
+    wait_for,
+)
+from itertools import count
+from typing import Any, Dict, List, Optional
+from weakref import WeakKeyDictionary
+
+from websockets.client import WebSocketClientProtocol, connect
+from websockets.exceptions import ConnectionClosed, WebSocketException
+from xrpl.asyncio.clients.utils import request_to_websocket, websocket_to_response
+from xrpl.models.requests import Request
+from xrpl.models.response import Response
+
+POOL_SIZE = 2
+"""Max. number of connections to one node."""
+MAX_IN_FLIGHT = 50
+"""Max. number of requests waiting for their response on one connection."""
+REQUEST_TIMEOUT = 10.0
+"""Seconds to wait for the response of one attempt of a request."""
+
+_CONNECTION_ERRORS = (WebSocketException, OSError, TimeoutError)
+
+
+class _PooledConnection:
+    __slots__ = (
+        "uri",
+        "websocket",
+        "slots",
+        "in_flight",
+        "_responses",
+        "_ids",
+        "_reader",
+    )
+
+    def __init__(self: _PooledConnection, uri: str, max_in_flight: int) -> None:
+        self.uri = uri
+        self.websocket: Optional[WebSocketClientProtocol] = None
+        self.slots = Semaphore(max_in_flight)
+        self.in_flight = 0
+        self._responses: Dict[str, Future[Dict[str, Any]]] = {}
+        self._ids = count()
+        self._reader: Optional[Task[None]] = None
+
+    async def open(self: _PooledConnection) -> None:
+        self.websocket = await connect(self.uri)
+        self._reader = create_task(self._read(websocket=self.websocket))
+
+    def is_open(self: _PooledConnection) -> bool:
+        return (
+            self.websocket is not None
+            and self.websocket.open
+            and self._reader is not None
+            and not self._reader.done()
+        )
+
+    async def _read(
+        self: _PooledConnection, websocket: WebSocketClientProtocol
+    ) -> None:
+        # only responses to pending requests are kept, all other frames dropped
+        try:
+            async for frame in websocket:
+                message = json.loads(frame)
+                future = self._responses.pop(str(message.get("id")), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except ConnectionClosed:
+            pass
+        finally:
+            # the pending requests will never get their response
+            responses, self._responses = self._responses, {}
+            for future in responses.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError(f"Connection to {self.uri} was closed.")
+                    )
+
+    async def request(self: _PooledConnection, request: Request) -> Response:
+        assert self.websocket is not None
+        # own ids, so requests with the same id can be in flight at once
+        request_id = f"{request.method}_{next(self._ids)}"
+        future: Future[Dict[str, Any]] = get_running_loop().create_future()
+        self._responses[request_id] = future
+        try:
+            await self.websocket.send(
+                json.dumps({**request_to_websocket(request), "id": request_id})
+            )
+            message = await future
+        finally:
+            self._responses.pop(request_id, None)
+        if request.id is not None:
+            message["id"] = request.id
+        return websocket_to_response(message)
+
+    async def close(self: _PooledConnection) -> None:
+        if self.websocket is not None:
+            await self.websocket.close()
+        if self._reader is not None:
+            await gather(self._reader, return_exceptions=True)
+
+
+class ConnectionPool:
+    """
+    Keeps connections to one node open and sends requests over them.
+    Requests are pipelined: a connection sends the next request without waiting
+    for the response of the previous one, up to a bounded number of requests in
+    flight. Connections are opened when all open ones are busy and are
+    replaced when they were closed or stopped answering. Each connection only
+    keeps the requests waiting for their response; when it gets closed, they
+    fail at once instead of waiting forever.
+    """
+
+    def __init__(
+        self: ConnectionPool,
+        uri: str,
+        size: int = POOL_SIZE,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        """
+        Args:
+            uri: Websocket uri of the node.
+            size: Max. number of connections. Defaults to 2.
+            max_in_flight: Max. number of requests in flight per connection.
+                Defaults to 50.
+            timeout: Seconds to wait for the response of one attempt.
+                Defaults to 10.
+        """
+        assert size > 0 and max_in_flight > 0
+        self.uri = uri
+        self.size = size
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._connections: List[_PooledConnection] = []
+        self._lock = Lock()
+
+    @property
+    def open_connections(self: ConnectionPool) -> int:
+        """The number of open connections."""
+        return len(
+            [connection for connection in self._connections if connection.is_open()]
+        )
+
+    async def _connection(self: ConnectionPool) -> _PooledConnection:
+        async with self._lock:
+            # health check, closed connections get replaced
+            self._connections = [
+                connection for connection in self._connections if connection.is_open()
+            ]
+            idle = [
+                connection
+                for connection in self._connections
+                if connection.in_flight == 0
+            ]
+            if not idle and len(self._connections) < self.size:
+                connection = _PooledConnection(
+                    uri=self.uri, max_in_flight=self.max_in_flight
+                )
+                await connection.open()
+                self._connections.append(connection)
+                return connection
+            return min(self._connections, key=lambda connection: connection.in_flight)
+
+    async def _request_once(self: ConnectionPool, request: Request) -> Response:
+        connection = await self._connection()
+        connection.in_flight += 1
+        try:
+            async with connection.slots:
+                return await wait_for(
+                    connection.request(request=request), timeout=self.timeout
+                )
+        except TimeoutError:
+            # the node stopped answering on this connection, so it gets replaced
+            await connection.close()
+            raise
+        finally:
+            connection.in_flight -= 1
+
+    async def request(self: ConnectionPool, request: Request) -> Response:
+        """
+        Sends a request. If the connection gets closed or the node does not
+        answer in time, the request is sent once more over another connection.
+
+        Args:
+            request: The request.
+
+        Raises:
+            ConnectionError: If the connection of the last attempt was closed.
+            TimeoutError: If the last attempt was not answered in time.
+
+        Returns:
+            The response.
+        """
+        try:
+            return await self._request_once(request=request)
+        except _CONNECTION_ERRORS:
+            return await self._request_once(request=request)
+
+    async def request_many(
+        self: ConnectionPool, requests: List[Request]
+    ) -> List[Response]:
+        """
+        Sends all requests at once.
+
+        Args:
+            requests: The requests.
+
+        Returns:
+            The responses in the order of the requests.
+        """
+        return list(await gather(*[self.request(request) for request in requests]))
+
+    async def close(self: ConnectionPool) -> None:
+        """Closes all connections."""
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            await connection.close()
+
+
+_POOLS: WeakKeyDictionary[
+    AbstractEventLoop, Dict[str, ConnectionPool]
+] = WeakKeyDictionary()
+
+
+def get_pool(uri: str) -> ConnectionPool:
+    """
+    Get the connection pool of a node. Connections belong to the event loop
+    they were opened in, so every running loop has its own pools.
+
+    Args:
+        uri: Websocket uri of the node.
+
+    Returns:
+        The connection pool.
+    """
+    pools = _POOLS.setdefault(get_running_loop(), {})
+    if uri not in pools:
+        pools[uri] = ConnectionPool(uri=uri)
+    return pools[uri]
+
+
+async def close_pools() -> None:
+    """Closes the connections of all pools of the running event loop."""
+    for pool in _POOLS.pop(get_running_loop(), {}).values():
+        await pool.close()
@@ -0,0 +1,220 @@
+"""Order book snapshots paged through book_offers at one ledger."""
+
+from __future__ import annotations
+
+from asyncio import Semaphore, gather, sleep, wait_for
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+from xrpl import XRPLException
+from xrpl.models import Ledger
+from xrpl.models.requests import BookOffers
+from xrpl.models.requests.subscribe import SubscribeBook
+from xrpl.models.response import Response
+
+from xrpl_trading_bot.clients.nodes import NodeManager
+from xrpl_trading_bot.clients.utils import _derive_subscribe_book_currency_pair
+from xrpl_trading_bot.clients.websocket_uri import FullHistoryNodes
+from xrpl_trading_bot.order_books import OrderBook
+
+SNAPSHOT_CONCURRENCY = 5
+"""Number of order book snapshot requests that run at the same time."""
+SNAPSHOT_PAGE_LIMIT = 300
+"""Number of offers requested per page. Nodes may return fewer."""
+SNAPSHOT_RETRIES = 3
+"""Number of times loading the snapshot of a book is retried."""
+SNAPSHOT_RETRY_DELAY = 1.0
+"""Seconds before the first retry, doubled on every further retry."""
+SNAPSHOT_REQUEST_TIMEOUT = 30.0
+"""Seconds to wait for the response of a snapshot request."""
+
+
+class XRPLSnapshotException(XRPLException):
+    """Gets raised if a snapshot request was not successful."""
+
+    pass
+
+
+_PAGE_REQUEST_IDS = count()
+
+
+@dataclass(frozen=True)
+class _PagedBookOffers(BookOffers):
+    # the book_offers model of xrpl-py has no marker field. Requests get their
+    # id here, as xrpl-py rebuilds requests without id from the base model.
+    marker: Optional[Any] = None
+
+
+def _result(response: Response) -> Dict[str, Any]:
+    if not response.is_successful():
+        raise XRPLSnapshotException(f"Snapshot request failed: {response.result}")
+    return response.result
+
+
+class SnapshotLoader:
+    """
+    Loads the snapshots of many order books at one validated ledger.
+    Both sides of a book are paged through `book_offers` with `limit` and
+    `marker`, so the depth is not limited to a single response. Books are
+    loaded concurrently with a bounded number of requests in flight, and a
+    book that fails is retried on its own. Requests are sent to the best
+    node of a `NodeManager`.
+    """
+
+    def __init__(
+        self: SnapshotLoader,
+        uri: str = FullHistoryNodes.XRPLF,
+        concurrency: int = SNAPSHOT_CONCURRENCY,
+        limit: int = SNAPSHOT_PAGE_LIMIT,
+        retries: int = SNAPSHOT_RETRIES,
+        retry_delay: float = SNAPSHOT_RETRY_DELAY,
+        nodes: Optional[NodeManager] = None,
+    ) -> None:
+        """
+        Args:
+            uri: Websocket uri of the node. Defaults to `FullHistoryNodes.XRPLF`.
+            concurrency: Number of requests that run at the same time.
+                Defaults to 5.
+            limit: Number of offers requested per page. Defaults to 300.
+            retries: Number of retries per book. Defaults to 3.
+            retry_delay: Seconds before the first retry. Defaults to 1.0.
+            nodes: The full history nodes the requests are sent to. Defaults
+                to the node of `uri` only.
+        """
+        self.uri = uri
+        self.nodes = nodes if nodes is not None else NodeManager(uris=[uri])
+        self.limit = limit
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.concurrency = concurrency
+        self._requests: Optional[Semaphore] = None
+
+    async def _request(self: SnapshotLoader, request: Any) -> Dict[str, Any]:
+        if self._requests is None:
+            # created in the running event loop
+            self._requests = Semaphore(self.concurrency)
+        async with self._requests:
+            response = await wait_for(
+                self.nodes.request(request),
+                timeout=SNAPSHOT_REQUEST_TIMEOUT,
+            )
+            return _result(response=response)
+
+    async def validated_ledger_index(self: SnapshotLoader) -> int:
+        """
+        Returns:
+            The index of the latest validated ledger.
+        """
+        result = await self._request(request=Ledger(ledger_index="validated"))
+        return int(result["ledger_index"])
+
+    async def _load_side(
+        self: SnapshotLoader,
+        taker_gets: Any,
+        taker_pays: Any,
+        taker: Optional[str],
+        ledger_index: int,
+    ) -> List[Dict[str, Any]]:
+        offers: List[Dict[str, Any]] = []
+        marker = None
+        while True:
+            result = await self._request(
+                request=_PagedBookOffers(
+                    taker_gets=taker_gets,
+                    taker_pays=taker_pays,
+                    taker=taker,
+                    ledger_index=ledger_index,
+                    limit=self.limit,
+                    marker=marker,
+                    id=f"book_offers_page_{next(_PAGE_REQUEST_IDS)}",
+                )
+            )
+            offers.extend(result["offers"])
+            marker = result.get("marker")
+            if marker is None:
+                return offers
+
+    async def _load_book(
+        self: SnapshotLoader, book: SubscribeBook, ledger_index: int
+    ) -> OrderBook:
+        # bids are the offers of the book itself, asks the offers of the
+        # reversed book
+        bids, asks = await gather(
+            self._load_side(
+                taker_gets=book.taker_gets,
+                taker_pays=book.taker_pays,
+                taker=book.taker,
+                ledger_index=ledger_index,
+            ),
+            self._load_side(
+                taker_gets=book.taker_pays,
+                taker_pays=book.taker_gets,
+                taker=book.taker,
+                ledger_index=ledger_index,
+            ),
+        )
+        return OrderBook.from_snapshot(
+            asks=asks,
+            bids=bids,
+            currency_pair=_derive_subscribe_book_currency_pair(book=book),
+            ledger_index=ledger_index,
+        )
+
+    async def load_book(
+        self: SnapshotLoader, book: SubscribeBook, ledger_index: int
+    ) -> OrderBook:
+        """
+        Loads the snapshot of one book and retries if it fails.
+
+        Args:
+            book: The book.
+            ledger_index: The ledger the snapshot is taken at.
+
+        Raises:
+            Exception: The exception of the last attempt.
+
+        Returns:
+            The order book.
+        """
+        delay = self.retry_delay
+        for _ in range(self.retries):
+            try:
+                return await self._load_book(book=book, ledger_index=ledger_index)
+            except Exception:
+                await sleep(delay)
+                delay *= 2
+        return await self._load_book(book=book, ledger_index=ledger_index)
+
+    async def load(
+        self: SnapshotLoader,
+        subscribe_books: List[SubscribeBook],
+        ledger_index: Optional[int] = None,
+    ) -> Tuple[List[OrderBook], List[SubscribeBook]]:
+        """
+        Loads the snapshots of all books at the same ledger.
+
+        Args:
+            subscribe_books: The books.
+            ledger_index: The ledger the snapshots are taken at.
+                Defaults to the latest validated ledger.
+
+        Returns:
+            The order books and the books whose snapshot could not be loaded.
+        """
+        if ledger_index is None:
+            ledger_index = await self.validated_ledger_index()
+        results = await gather(
+            *[
+                self.load_book(book=book, ledger_index=ledger_index)
+                for book in subscribe_books
+            ],
+            return_exceptions=True,
+        )
+        order_books = [result for result in results if isinstance(result, OrderBook)]
+        failed_books = [
+            book
+            for book, result in zip(subscribe_books, results)
+            if not isinstance(result, OrderBook)
+        ]
+        return order_books, failed_books
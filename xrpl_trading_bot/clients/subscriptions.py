@@ -0,0 +1,397 @@
+"""Order book subscriptions shared by a small number of connections."""
+
+from __future__ import annotations
+
+import logging
+from asyncio import FIRST_EXCEPTION, Event, Queue, create_task, sleep, wait
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, cast
+
+from xrpl import XRPLException
+from xrpl.models import IssuedCurrency, Request, StreamParameter, Subscribe
+from xrpl.models.requests.subscribe import SubscribeBook
+
+from xrpl_trading_bot.clients.ingest import Decoder, book_filter
+from xrpl_trading_bot.clients.nodes import NodeManager
+from xrpl_trading_bot.clients.pool import _CONNECTION_ERRORS
+from xrpl_trading_bot.clients.snapshots import SnapshotLoader
+from xrpl_trading_bot.clients.utils import _derive_subscribe_book_currency_pair
+from xrpl_trading_bot.clients.websocket_uri import NonFullHistoryNodes
+from xrpl_trading_bot.order_books import (
+    LedgerBatcher,
+    OrderBook,
+    OrderBookNotFoundException,
+    OrderBooks,
+)
+from xrpl_trading_bot.txn_parser import SubscriptionRawTxnType
+
+SUBSCRIPTION_CONNECTIONS = 2
+"""Number of connections the order book subscriptions are spread over."""
+BOOKS_PER_REQUEST = 10
+"""Max. number of books subscribed with one request."""
+DEDUPLICATION_WINDOW = 10000
+"""Number of recent transaction hashes remembered to drop duplicates."""
+RESYNC_INTERVAL = 1.0
+"""Seconds between two checks for stale order books."""
+
+_RESYNC_ERRORS = (*_CONNECTION_ERRORS, XRPLException)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _chunk(
+    subscribe_books: List[SubscribeBook], size: int
+) -> List[List[SubscribeBook]]:
+    return [subscribe_books[i : i + size] for i in range(0, len(subscribe_books), size)]
+
+
+class BookSubscriptionManager:
+    """
+    Subscribes to many order books over a few shared connections.
+    The books are spread evenly over the connections. Every connection hands
+    the transactions it receives to one dispatcher, which drops transactions
+    that already arrived over another connection and applies the others to
+    the order books they touched. Frames of snapshot echoes and of
+    transactions that mention none of the issuers of a connection's books are
+    dropped before they are decoded. In batch mode the transactions are
+    applied once per ledger, after the ledger closed on all connections.
+
+    Every connection also receives the `ledger` stream. If a connection skips a
+    ledger or gets closed, the order books of its books are marked stale and
+    the connection is opened again to the best node of a `NodeManager`. Stale
+    order books keep their transactions until a new snapshot of only these
+    books is loaded at a pinned ledger, then the transactions after that
+    ledger are replayed.
+    """
+
+    def __init__(
+        self: BookSubscriptionManager,
+        all_order_books: OrderBooks,
+        connections: int = SUBSCRIPTION_CONNECTIONS,
+        uri: str = NonFullHistoryNodes.LIMPIDCRYPTO,
+        snapshots: Optional[SnapshotLoader] = None,
+        batch: bool = False,
+        nodes: Optional[NodeManager] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> None:
+        """
+        Args:
+            all_order_books: All order books.
+            connections: Number of connections. Defaults to 2.
+            uri: Websocket uri. Defaults to `NonFullHistoryNodes.LIMPIDCRYPTO`.
+            snapshots: Loads the snapshots of the books. Defaults to a
+                `SnapshotLoader` with its default settings.
+            batch: If transactions are applied once per closed ledger.
+                Defaults to False.
+            nodes: The nodes the connections are opened to. Defaults to the
+                node of `uri` only.
+            decoder: Decodes the received frames. Defaults to
+                `ingest.default_decoder`.
+        """
+        assert connections > 0
+        self.all_order_books = all_order_books
+        self.connections = connections
+        self.uri = uri
+        self.nodes = nodes if nodes is not None else NodeManager(uris=[uri])
+        self.decoder = decoder
+        self.snapshots = snapshots if snapshots is not None else SnapshotLoader()
+        self.failed_books: List[SubscribeBook] = []
+        """Books whose snapshot could not be loaded."""
+        self.resync_failures = 0
+        """
+        Number of resyncs that failed, e.g. because the validated ledger could
+        not be requested, or that left order books stale.
+        """
+        self.batcher = LedgerBatcher(all_order_books=all_order_books) if batch else None
+        self._recent_hashes: Deque[str] = deque()
+        self._known_hashes: Set[str] = set()
+        self._books: Dict[str, SubscribeBook] = {}
+        self._connection_count = 0
+        self._first_ledger_indexes: Dict[int, int] = {}
+        self._subscribed: Optional[Event] = None
+
+    def assign_books(
+        self: BookSubscriptionManager, subscribe_books: List[SubscribeBook]
+    ) -> List[List[SubscribeBook]]:
+        """
+        Spreads the books evenly over the connections.
+
+        Args:
+            subscribe_books: The books.
+
+        Returns:
+            The books of each connection. Connections without books are left out.
+        """
+        assigned = [
+            subscribe_books[connection :: self.connections]
+            for connection in range(self.connections)
+        ]
+        return [books for books in assigned if books]
+
+    def dispatch(
+        self: BookSubscriptionManager, message: Dict[str, Any], connection: int = 0
+    ) -> bool:
+        """
+        Applies a received transaction to the order books it touched, unless the
+        transaction was already dispatched. In batch mode the transaction is
+        buffered until its ledger closed on all connections.
+
+        Args:
+            message: Message received from a subscription.
+            connection: The connection the message was received over.
+                Defaults to 0.
+
+        Returns:
+            If the message was applied or buffered.
+        """
+        if message.get("type") == "ledgerClosed" and self.batcher is not None:
+            self.batcher.close_ledger(
+                ledger_index=int(message["ledger_index"]), connection=connection
+            )
+            return True
+        if message.get("type") != "transaction":
+            return False
+        hash = message["transaction"]["hash"]
+        if hash in self._known_hashes:
+            return False
+        self._known_hashes.add(hash)
+        self._recent_hashes.append(hash)
+        if len(self._recent_hashes) > DEDUPLICATION_WINDOW:
+            self._known_hashes.discard(self._recent_hashes.popleft())
+        transaction = cast(SubscriptionRawTxnType, message)
+        if self.batcher is not None:
+            self.batcher.add(transaction=transaction)
+        else:
+            self.all_order_books.update_order_books(transaction=transaction)
+        return True
+
+    def _mark_stale(self: BookSubscriptionManager, currency_pairs: List[str]) -> None:
+        for currency_pair in currency_pairs:
+            try:
+                self.all_order_books.get_order_book(currency_pair=currency_pair)
+            except OrderBookNotFoundException:
+                # an empty stale order book keeps the transactions until its resync
+                self.all_order_books.set_order_book(
+                    order_book=OrderBook.from_snapshot(
+                        asks=[], bids=[], currency_pair=currency_pair
+                    )
+                )
+        self.all_order_books.mark_stale(currency_pairs=currency_pairs)
+
+    async def _load_snapshots(
+        self: BookSubscriptionManager,
+        subscribe_books: List[SubscribeBook],
+        ledger_index: Optional[int] = None,
+    ) -> None:
+        order_books, self.failed_books = await self.snapshots.load(
+            subscribe_books=subscribe_books, ledger_index=ledger_index
+        )
+        for order_book in order_books:
+            self.all_order_books.resync_order_book(order_book=order_book)
+        if not self.failed_books:
+            return
+        currency_pairs = [
+            _derive_subscribe_book_currency_pair(book=book)
+            for book in self.failed_books
+        ]
+        _LOGGER.warning(
+            "Snapshots of %d order books could not be loaded: %s",
+            len(currency_pairs),
+            ", ".join(currency_pairs),
+        )
+        self._mark_stale(currency_pairs=currency_pairs)
+
+    async def resync(self: BookSubscriptionManager) -> int:
+        """
+        Loads new snapshots of all stale order books at the latest validated
+        ledger and replays the transactions they received after it. Order books
+        whose snapshot could not be loaded stay stale and get logged.
+
+        Returns:
+            The number of resynced order books.
+        """
+        subscribe_books = [
+            self._books[currency_pair]
+            for currency_pair in self.all_order_books.get_stale_currency_pairs()
+            if currency_pair in self._books
+        ]
+        if not subscribe_books:
+            return 0
+        order_books, failed_books = await self.snapshots.load(
+            subscribe_books=subscribe_books,
+            ledger_index=await self.snapshots.validated_ledger_index(),
+        )
+        for order_book in order_books:
+            self.all_order_books.resync_order_book(order_book=order_book)
+        if failed_books:
+            self.resync_failures += 1
+            _LOGGER.warning(
+                "Snapshots of %d stale order books could not be loaded: %s",
+                len(failed_books),
+                ", ".join(
+                    _derive_subscribe_book_currency_pair(book=book)
+                    for book in failed_books
+                ),
+            )
+        return len(order_books)
+
+    async def _load_first_snapshots(self: BookSubscriptionManager) -> None:
+        assert self._subscribed is not None
+        await self._subscribed.wait()
+        # the connections received all transactions after their first ledger
+        await self._load_snapshots(
+            subscribe_books=list(self._books.values()),
+            ledger_index=max(self._first_ledger_indexes.values()),
+        )
+        await self._resync_all()
+
+    async def _resync_all(self: BookSubscriptionManager) -> None:
+        while True:
+            await sleep(RESYNC_INTERVAL)
+            try:
+                await self.resync()
+            except _RESYNC_ERRORS:
+                # the books stay stale and are resynced on the next check
+                self.resync_failures += 1
+                _LOGGER.exception("Resync of stale order books failed")
+
+    def track_ledger(
+        self: BookSubscriptionManager,
+        last_ledger_index: Optional[int],
+        ledger_index: int,
+        currency_pairs: List[str],
+    ) -> int:
+        """
+        Marks the order books of a connection stale if the connection skipped
+        a ledger. On the first ledger of a connection, order books whose
+        snapshot is older than the ledger before are marked stale.
+
+        Args:
+            last_ledger_index: The last ledger the connection received.
+            ledger_index: The ledger the connection received now.
+            currency_pairs: The currency pairs of the connection's books.
+
+        Returns:
+            The last ledger the connection received.
+        """
+        if last_ledger_index is None:
+            self.all_order_books.mark_stale(
+                currency_pairs=[
+                    order_book.currency_pair
+                    for order_book in self.all_order_books.get_all_order_books()
+                    if order_book.currency_pair in currency_pairs
+                    and order_book.snapshot_ledger_index is not None
+                    and order_book.snapshot_ledger_index < ledger_index - 1
+                ]
+            )
+            return ledger_index
+        if ledger_index > last_ledger_index + 1:
+            self.all_order_books.mark_stale(currency_pairs=currency_pairs)
+        return max(ledger_index, last_ledger_index)
+
+    async def _receive(
+        self: BookSubscriptionManager,
+        subscribe_books: List[SubscribeBook],
+        queue: Queue[Tuple[int, Dict[str, Any]]],
+        connection: int,
+    ) -> None:
+        currency_pairs = [
+            _derive_subscribe_book_currency_pair(book=book) for book in subscribe_books
+        ]
+        last_ledger_index: Optional[int] = None
+
+        async def on_reconnect() -> None:
+            nonlocal last_ledger_index
+            last_ledger_index = None
+            # transactions may have been missed while the connection was closed
+            self.all_order_books.mark_stale(currency_pairs=currency_pairs)
+
+        requests: List[Request] = [Subscribe(streams=[StreamParameter.LEDGER])]
+        requests.extend(
+            Subscribe(books=chunk)
+            for chunk in _chunk(subscribe_books, size=BOOKS_PER_REQUEST)
+        )
+        async for message in self.nodes.stream(
+            requests=requests,
+            on_reconnect=on_reconnect,
+            accept=book_filter(
+                issuers=[
+                    currency.issuer
+                    for book in subscribe_books
+                    for currency in (book.taker_gets, book.taker_pays)
+                    if isinstance(currency, IssuedCurrency)
+                ]
+            ),
+            decoder=self.decoder,
+        ):
+            if message.get("type") == "ledgerClosed":
+                if connection not in self._first_ledger_indexes:
+                    self._first_ledger_indexes[connection] = int(
+                        message["ledger_index"]
+                    )
+                    assert self._subscribed is not None
+                    if len(self._first_ledger_indexes) == self._connection_count:
+                        self._subscribed.set()
+                last_ledger_index = self.track_ledger(
+                    last_ledger_index=last_ledger_index,
+                    ledger_index=int(message["ledger_index"]),
+                    currency_pairs=currency_pairs,
+                )
+            if message.get("type") in ("transaction", "ledgerClosed"):
+                await queue.put((connection, message))
+
+    async def _dispatch_all(
+        self: BookSubscriptionManager, queue: Queue[Tuple[int, Dict[str, Any]]]
+    ) -> None:
+        while True:
+            connection, message = await queue.get()
+            self.dispatch(message=message, connection=connection)
+
+    async def run(
+        self: BookSubscriptionManager, subscribe_books: List[SubscribeBook]
+    ) -> None:
+        """
+        Subscribes to all books, then loads their snapshots at the first
+        ledger all connections announced and replays the transactions received
+        after it. Receives and dispatches the transactions and resyncs stale
+        order books until it gets cancelled. Until their snapshot is loaded,
+        order books are stale and keep their transactions. Books whose snapshot
+        could not be loaded stay stale until a resync loads it.
+
+        Args:
+            subscribe_books: The books.
+
+        Raises:
+            BaseException: The exception of the first task that failed.
+        """
+        self._books = {
+            _derive_subscribe_book_currency_pair(book=book): book
+            for book in subscribe_books
+        }
+        self._mark_stale(currency_pairs=list(self._books))
+        assigned = self.assign_books(subscribe_books=subscribe_books)
+        if self.batcher is not None:
+            self.batcher.connections = len(assigned)
+        self._connection_count = len(assigned)
+        self._first_ledger_indexes = {}
+        self._subscribed = Event()
+        queue: Queue[Tuple[int, Dict[str, Any]]] = Queue()
+        tasks = [
+            create_task(self._dispatch_all(queue=queue)),
+            create_task(self._load_first_snapshots()),
+        ] + [
+            create_task(
+                self._receive(subscribe_books=books, queue=queue, connection=connection)
+            )
+            for connection, books in enumerate(assigned)
+        ]
+        try:
+            done, _ = await wait(tasks, return_when=FIRST_EXCEPTION)
+            for task in done:
+                exception = None if task.cancelled() else task.exception()
+                if exception is not None:
+                    raise exception
+        finally:
+            for task in tasks:
+                task.cancel()
+            await wait(tasks)
@@ -2,6 +2,9 @@
 
 from typing import Any, Dict
 
+from xrpl.models import IssuedCurrency
+from xrpl.models.requests.subscribe import SubscribeBook
+
 
 def _is_order_book(message: Dict[str, Any]) -> bool:
     """
@@ -17,3 +20,26 @@ def _is_order_book(message: Dict[str, Any]) -> bool:
         if "asks" in message["result"].keys() or "bids" in message["result"].keys():
             return True
     return False
+
+
+def _derive_subscribe_book_currency_pair(book: SubscribeBook) -> str:
+    """
+    Derives the currency pair of the order book a SubscribeBook subscribes to.
+
+    Args:
+        book: The SubscribeBook.
+
+    Returns:
+        The currency pair.
+    """
+    base = (
+        f"{book.taker_pays.currency}.{book.taker_pays.issuer}"
+        if (isinstance(book.taker_pays, IssuedCurrency))
+        else "XRP"
+    )
+    counter = (
+        f"{book.taker_gets.currency}.{book.taker_gets.issuer}"
+        if (isinstance(book.taker_gets, IssuedCurrency))
+        else "XRP"
+    )
+    return f"{base}/{counter}"
@@ -1,3 +1,8 @@
+from xrpl_trading_bot.order_books.batch import LedgerBatcher
+from xrpl_trading_bot.order_books.columns import (
+    NumpyNotInstalledException,
+    OrderBookSideColumns,
+)
 from xrpl_trading_bot.order_books.main import (
     OrderBook,
     OrderBookNotFoundException,
@@ -8,6 +13,9 @@ from xrpl_trading_bot.order_books.main import (
 __all__ = [
     "OrderBook",
     "OrderBooks",
+    "OrderBookSideColumns",
     "OrderBookNotFoundException",
     "build_subscription_books",
+    "LedgerBatcher",
+    "NumpyNotInstalledException",
 ]
@@ -0,0 +1,129 @@
+"""Buffers transactions per ledger and applies them when the ledger closed."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from xrpl_trading_bot.order_books.main import OrderBooks, _parse_transaction
+from xrpl_trading_bot.txn_parser import SubscriptionRawTxnType
+
+
+def _transaction_index(transaction: SubscriptionRawTxnType) -> int:
+    return transaction["meta"]["TransactionIndex"]
+
+
+class LedgerBatcher:
+    """
+    Batch mode for order book updates. Transactions are buffered by their
+    `ledger_index` and applied in `TransactionIndex` order once their ledger
+    closed, so every order book is updated once per ledger. If the
+    transactions arrive over several connections, a ledger is applied once it
+    closed on all of them. A transaction of a ledger that was already applied
+    can not be applied in order anymore, so the order books it touched are
+    marked stale and keep it until they get resynced.
+    """
+
+    def __init__(
+        self: LedgerBatcher, all_order_books: OrderBooks, connections: int = 1
+    ) -> None:
+        """
+        Args:
+            all_order_books: All order books.
+            connections: Number of connections the transactions arrive over.
+                Defaults to 1.
+        """
+        self.all_order_books = all_order_books
+        self.connections = connections
+        """Number of connections a ledger has to close on before it is applied."""
+        self._closed_ledgers: Dict[int, int] = {}
+        self._buffers: Dict[int, List[SubscriptionRawTxnType]] = {}
+        self._applied_ledger_index: Optional[int] = None
+
+    @property
+    def buffered_transactions(self: LedgerBatcher) -> int:
+        """The number of transactions waiting for their ledger to close."""
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def add(self: LedgerBatcher, transaction: SubscriptionRawTxnType) -> None:
+        """
+        Buffers a transaction until its ledger closed. If its ledger was
+        already applied, the order books it touched are marked stale.
+
+        Args:
+            transaction: The raw transaction data.
+        """
+        ledger_index = int(transaction["ledger_index"])
+        if (
+            self._applied_ledger_index is not None
+            and ledger_index <= self._applied_ledger_index
+        ):
+            parsed = _parse_transaction(transaction=transaction)
+            if parsed is None:
+                return
+            self.all_order_books.mark_stale(
+                currency_pairs=list(parsed.affected_currency_pairs)
+            )
+            self.all_order_books.update_order_books(transaction=parsed)
+        else:
+            self._buffers.setdefault(ledger_index, []).append(transaction)
+
+    def close_ledger(
+        self: LedgerBatcher, ledger_index: int, connection: int = 0
+    ) -> int:
+        """
+        Applies the transactions of all ledgers before the given ledger, once
+        it closed on all connections. A node announces a closed ledger before
+        it sends the ledger's transactions, so the close of a ledger completes
+        the ledgers before it on the connection that announced it.
+
+        Args:
+            ledger_index: The index of the ledger that closed.
+            connection: The connection that announced the close, from 0 to
+                `connections` - 1. Defaults to 0.
+
+        Returns:
+            The number of applied transactions.
+        """
+        self._closed_ledgers[connection] = max(
+            ledger_index, self._closed_ledgers.get(connection, ledger_index)
+        )
+        if len(self._closed_ledgers) < self.connections:
+            # connections that have not announced a ledger yet may be behind
+            return 0
+        ledger_index = min(self._closed_ledgers.values())
+        return self._apply(
+            ledger_indexes=[index for index in self._buffers if index < ledger_index],
+            applied_ledger_index=ledger_index - 1,
+        )
+
+    def flush(self: LedgerBatcher) -> int:
+        """
+        Applies all buffered transactions.
+
+        Returns:
+            The number of applied transactions.
+        """
+        ledger_indexes = list(self._buffers)
+        return self._apply(
+            ledger_indexes=ledger_indexes,
+            applied_ledger_index=max(ledger_indexes, default=None),
+        )
+
+    def _apply(
+        self: LedgerBatcher,
+        ledger_indexes: List[int],
+        applied_ledger_index: Optional[int],
+    ) -> int:
+        transactions: List[SubscriptionRawTxnType] = []
+        for index in sorted(ledger_indexes):
+            transactions.extend(
+                sorted(self._buffers.pop(index), key=_transaction_index)
+            )
+        if transactions:
+            self.all_order_books.update_order_books_batch(transactions=transactions)
+        if applied_ledger_index is not None and (
+            self._applied_ledger_index is None
+            or applied_ledger_index > self._applied_ledger_index
+        ):
+            self._applied_ledger_index = applied_ledger_index
+        return len(transactions)
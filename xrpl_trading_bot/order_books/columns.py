@@ -0,0 +1,213 @@
+"""Columnar representation of an order book side for vectorized depth math."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
+
+from xrpl_trading_bot.txn_parser import CURRENCY_AMOUNT_TYPE, OrderBookSide
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None  # type: ignore
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+class NumpyNotInstalledException(BaseException):
+    """Gets raised if columns are requested but numpy is not installed."""
+
+    pass
+
+
+def numpy_available() -> bool:
+    """
+    Returns:
+        If numpy is installed.
+    """
+    return np is not None
+
+
+def _value(amount: Optional[CURRENCY_AMOUNT_TYPE]) -> Optional[str]:
+    if isinstance(amount, dict):
+        return amount["value"]
+    return amount
+
+
+def _column(values: List[Optional[str]]) -> NDArray[np.float64]:
+    """
+    Parses the values of an offer field at once.
+
+    Args:
+        values: The values as decimal strings.
+
+    Returns:
+        The values as float array.
+    """
+    return np.array(values, dtype=np.float64)
+
+
+class OrderBookSideColumns:
+    """
+    Parallel arrays of the qualities and amounts of the offers of an order book
+    side, in the order of the side. Amounts of funded offers default to their
+    full amounts. Qualities are in counter currency per base currency on both
+    sides, sizes are given in base currency.
+    """
+
+    __slots__ = (
+        "version",
+        "is_ask",
+        "quality",
+        "taker_gets",
+        "taker_pays",
+        "taker_gets_funded",
+        "taker_pays_funded",
+    )
+
+    def __init__(
+        self: OrderBookSideColumns,
+        version: int,
+        is_ask: bool,
+        quality: NDArray[np.float64],
+        taker_gets: NDArray[np.float64],
+        taker_pays: NDArray[np.float64],
+        taker_gets_funded: NDArray[np.float64],
+        taker_pays_funded: NDArray[np.float64],
+    ) -> None:
+        """
+        Args:
+            version: The version of the side the columns were built from.
+            is_ask: If the columns belong to the ask side.
+            quality: Qualities of the offers.
+            taker_gets: TakerGets amounts.
+            taker_pays: TakerPays amounts.
+            taker_gets_funded: Funded TakerGets amounts.
+            taker_pays_funded: Funded TakerPays amounts.
+        """
+        self.version = version
+        self.is_ask = is_ask
+        self.quality = quality
+        self.taker_gets = taker_gets
+        self.taker_pays = taker_pays
+        self.taker_gets_funded = taker_gets_funded
+        self.taker_pays_funded = taker_pays_funded
+
+    @classmethod
+    def from_side(cls, side: OrderBookSide, is_ask: bool) -> OrderBookSideColumns:
+        """
+        Builds the columns of an order book side.
+
+        Args:
+            side: The order book side.
+            is_ask: If the side is the ask side.
+
+        Raises:
+            NumpyNotInstalledException: If numpy is not installed.
+
+        Returns:
+            The columns.
+        """
+        if not numpy_available():
+            raise NumpyNotInstalledException(
+                "Order book columns require numpy: "
+                "pip install xrpl-trading-bot[columns]"
+            )
+        offers = list(side)
+        return cls(
+            version=side.version,
+            is_ask=is_ask,
+            quality=_column([offer.quality for offer in offers]),
+            taker_gets=_column([_value(offer.TakerGets) for offer in offers]),
+            taker_pays=_column([_value(offer.TakerPays) for offer in offers]),
+            taker_gets_funded=_column(
+                [
+                    _value(
+                        offer.taker_gets_funded
+                        if offer.taker_gets_funded is not None
+                        else offer.TakerGets
+                    )
+                    for offer in offers
+                ]
+            ),
+            taker_pays_funded=_column(
+                [
+                    _value(
+                        offer.taker_pays_funded
+                        if offer.taker_pays_funded is not None
+                        else offer.TakerPays
+                    )
+                    for offer in offers
+                ]
+            ),
+        )
+
+    def __len__(self: OrderBookSideColumns) -> int:
+        return len(self.quality)
+
+    @property
+    def base_amounts(self: OrderBookSideColumns) -> NDArray[np.float64]:
+        """The funded amounts of the offers in base currency."""
+        return self.taker_gets_funded if self.is_ask else self.taker_pays_funded
+
+    @property
+    def counter_amounts(self: OrderBookSideColumns) -> NDArray[np.float64]:
+        """The funded amounts of the offers in counter currency."""
+        return self.taker_pays_funded if self.is_ask else self.taker_gets_funded
+
+    def cumulative_depth(self: OrderBookSideColumns) -> NDArray[np.float64]:
+        """
+        Returns:
+            The base currency amount available up to and including each offer.
+        """
+        return np.cumsum(self.base_amounts)
+
+    def vwap(
+        self: OrderBookSideColumns, sizes: Union[Sequence[float], NDArray[np.float64]]
+    ) -> NDArray[np.float64]:
+        """
+        Computes the volume weighted average price of filling each size against
+        the side. Sizes the side cannot fill are NaN.
+
+        Args:
+            sizes: The sizes in base currency.
+
+        Returns:
+            The average prices in counter currency per base currency.
+        """
+        sizes = np.asarray(sizes, dtype=np.float64)
+        if len(self) == 0:
+            return np.full(sizes.shape, np.nan)
+        cumulative_base = self.cumulative_depth()
+        cumulative_counter = np.cumsum(self.counter_amounts)
+        positions = np.searchsorted(cumulative_base, sizes, side="left")
+        fillable = (positions < len(self)) & (sizes > 0)
+        positions = np.minimum(positions, len(self) - 1)
+        previous_base = np.where(positions > 0, cumulative_base[positions - 1], 0.0)
+        previous_counter = np.where(
+            positions > 0, cumulative_counter[positions - 1], 0.0
+        )
+        counter = previous_counter + (sizes - previous_base) * self.quality[positions]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(fillable, counter / sizes, np.nan)
+
+    def price_impact(
+        self: OrderBookSideColumns, sizes: Union[Sequence[float], NDArray[np.float64]]
+    ) -> NDArray[np.float64]:
+        """
+        Computes how far the average price of filling each size moves away from
+        the best offer of the side.
+
+        Args:
+            sizes: The sizes in base currency.
+
+        Returns:
+            The price impacts in percent. Sizes the side cannot fill are NaN.
+        """
+        average_prices = self.vwap(sizes=sizes)
+        if len(self) == 0:
+            return average_prices
+        tip = self.quality[0]
+        impacts: NDArray[np.float64] = np.abs(average_prices - tip) / tip * 100
+        return impacts
@@ -1,23 +1,45 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from itertools import combinations
-from typing import Any, Dict, Generator, List, Union, cast
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 from xrpl import XRPLException
 from xrpl.models import XRP, IssuedCurrency, Response
 from xrpl.models.requests.subscribe import SubscribeBook
 
+from xrpl_trading_bot.order_books.columns import (
+    OrderBookSideColumns,
+    numpy_available,
+)
 from xrpl_trading_bot.txn_parser import (
     ORDER_BOOK_SIDE_TYPE,
+    XRP_UNIT_TYPE,
+    OrderBookSide,
+    ParsedTransaction,
     SubscriptionRawTxnType,
     XRPLOrderBookEmptyException,
-    parse_final_order_book,
+    XRPLTxnFieldsException,
+    calculate_spread,
+    derive_order_book_side,
+    parse_final_order_book_batch,
 )
 from xrpl_trading_bot.wallet import XRPWallet
 
 LIQUID_ORDER_BOOK_LIMIT = 1
+TO_XRP = True
+"""If the order books hold XRP amounts in XRP instead of drops."""
 
 
 class OrderBookNotFoundException(BaseException):
@@ -28,30 +50,95 @@ class OrderBookNotFoundException(BaseException):
 
 @dataclass
 class OrderBook:
-    asks: ORDER_BOOK_SIDE_TYPE
+    asks: OrderBookSide
     """Ask side of an order book."""
-    bids: ORDER_BOOK_SIDE_TYPE
+    bids: OrderBookSide
     """Bid side of an order book."""
     currency_pair: str
     """The order books currency pair."""
     exchange_rate: Decimal
     """The currency exchange rate of the order book."""
+    snapshot_ledger_index: Optional[int] = field(default=None, compare=False)
+    """The ledger the snapshot of the order book was taken at."""
+    last_ledger_index: Optional[int] = field(default=None, compare=False)
+    """The ledger of the last transaction applied to the order book."""
+    pending_transactions: Optional[List[ParsedTransaction]] = field(
+        default=None, repr=False, compare=False
+    )
+    """
+    Transactions received while the order book is stale. None if the order book
+    is up to date.
+    """
+    _columns: Dict[bool, Tuple[OrderBookSide, OrderBookSideColumns]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self: OrderBook) -> None:
+        # offers given as list enter the order book here, so their fields
+        # get derived once instead of on every update
+        if not isinstance(self.asks, OrderBookSide):
+            self.asks = derive_order_book_side(
+                offers=self.asks, pair=self.currency_pair, to_xrp=TO_XRP
+            )
+        if not isinstance(self.bids, OrderBookSide):
+            self.bids = derive_order_book_side(
+                offers=self.bids, pair=self.currency_pair, to_xrp=TO_XRP
+            )
+
+    def _side_columns(
+        self: OrderBook, side: OrderBookSide, is_ask: bool
+    ) -> OrderBookSideColumns:
+        cached = self._columns.get(is_ask)
+        if (
+            cached is not None
+            and cached[0] is side
+            and cached[1].version == side.version
+        ):
+            return cached[1]
+        columns = OrderBookSideColumns.from_side(side=side, is_ask=is_ask)
+        self._columns[is_ask] = (side, columns)
+        return columns
+
+    @property
+    def ask_columns(self: OrderBook) -> OrderBookSideColumns:
+        """
+        Columns of the ask side. They are rebuilt when the side has changed
+        since they were built last. Requires numpy.
+        """
+        return self._side_columns(side=self.asks, is_ask=True)
+
+    @property
+    def bid_columns(self: OrderBook) -> OrderBookSideColumns:
+        """
+        Columns of the bid side. They are rebuilt when the side has changed
+        since they were built last. Requires numpy.
+        """
+        return self._side_columns(side=self.bids, is_ask=False)
 
     @property
     def spread(self: OrderBook) -> Decimal:
         """The spread of the order book."""
         if self.asks and self.bids:
-            ask_quality = Decimal(cast(str, self.asks[0]["quality"]))
-            bid_quality = Decimal(cast(str, self.bids[0]["quality"]))
-            price_difference = ask_quality - bid_quality
-            midpoint = (ask_quality + bid_quality) / 2
-            quoted_spread = (price_difference / midpoint) * 100
-            if quoted_spread < 0:
+            if self.asks.book_quality().crosses(other=self.bids.book_quality()):
                 raise BaseException(f"ask: {self.asks[0]}   bid: {self.bids[0]}")
-            return Decimal(quoted_spread)
+            quoted_spread = calculate_spread(
+                ask_quality=self.asks.tip_quality(),
+                bid_quality=self.bids.tip_quality(),
+            )
+            return quoted_spread.to_decimal()
         else:
             return Decimal(0)
 
+    @property
+    def unit(self: OrderBook) -> XRP_UNIT_TYPE:
+        """The unit the XRP amounts of the order book are expressed in."""
+        return self.asks.unit
+
+    @property
+    def is_stale(self: OrderBook) -> bool:
+        """If transactions of the order book may have been missed."""
+        return self.pending_transactions is not None
+
     @property
     def is_liquid(self: OrderBook) -> bool:
         """
@@ -73,20 +160,63 @@ class OrderBook:
             exchange_rate=result["exchange_rate"],
         )
 
+    @classmethod
+    def from_snapshot(
+        cls,
+        asks: ORDER_BOOK_SIDE_TYPE,
+        bids: ORDER_BOOK_SIDE_TYPE,
+        currency_pair: str,
+        ledger_index: Optional[int] = None,
+    ) -> OrderBook:
+        """
+        Builds an order book from the offers of a snapshot.
+
+        Args:
+            asks: Offers of the ask side.
+            bids: Offers of the bid side.
+            currency_pair: The order books currency pair.
+            ledger_index: The ledger the snapshot was taken at.
+
+        Returns:
+            The order book.
+        """
+        order_book = cls(
+            asks=asks,  # type: ignore
+            bids=bids,  # type: ignore
+            currency_pair=currency_pair,
+            exchange_rate=Decimal(0),
+            snapshot_ledger_index=ledger_index,
+            last_ledger_index=ledger_index,
+        )
+        if numpy_available():
+            # build the columns of the snapshot at once
+            order_book.ask_columns
+            order_book.bid_columns
+        return order_book
+
     @classmethod
     def from_response(cls, response: Response) -> OrderBook:
         assert response.is_successful()
         result = response.result
-        return cls(
+        return cls.from_snapshot(
             asks=result["asks"],
             bids=result["bids"],
             currency_pair=derive_currency_pair(
                 asks=result["asks"], bids=result["bids"]
             ),
-            exchange_rate=Decimal(0),
         )
 
 
+def _parse_transaction(
+    transaction: Union[SubscriptionRawTxnType, ParsedTransaction]
+) -> Optional[ParsedTransaction]:
+    try:
+        return ParsedTransaction.of(transaction=transaction)
+    except XRPLTxnFieldsException:
+        # malformed transactions touch no order book
+        return None
+
+
 class OrderBooks:
     def set_order_book(self: OrderBooks, order_book: OrderBook) -> None:
         """
@@ -108,22 +238,155 @@ class OrderBooks:
             order_book.exchange_rate = current_exchange_rate
         self.__setattr__(order_book.currency_pair, order_book)
 
-    def update_order_books(
+    def _update_order_book(
         self: OrderBooks,
-        transaction: SubscriptionRawTxnType,
+        currency_pair: str,
+        transactions: List[ParsedTransaction],
     ) -> None:
-        all_order_books = self.get_all_order_books()
-        for order_book in all_order_books:
-            asks = order_book.asks
-            bids = order_book.bids
-            try:
-                self.set_order_book(
-                    order_book=order_book.from_parser_result(
-                        parse_final_order_book(asks, bids, transaction, True)
-                    )
+        order_book = self.__dict__.get(currency_pair)
+        if order_book is None:
+            return
+        if order_book.snapshot_ledger_index is not None:
+            # the snapshot already contains the transactions of its ledger
+            transactions = [
+                transaction
+                for transaction in transactions
+                if transaction.ledger_index > order_book.snapshot_ledger_index
+            ]
+        if not transactions:
+            return
+        if order_book.pending_transactions is not None:
+            order_book.pending_transactions.extend(transactions)
+            return
+        try:
+            new_order_book = order_book.from_parser_result(
+                parse_final_order_book_batch(
+                    asks=order_book.asks,
+                    bids=order_book.bids,
+                    transactions=list(transactions),
+                    to_xrp=TO_XRP,
+                    currency_pair=order_book.currency_pair,
                 )
-            except XRPLOrderBookEmptyException:
-                pass
+            )
+        except XRPLOrderBookEmptyException:
+            return
+        new_order_book.snapshot_ledger_index = order_book.snapshot_ledger_index
+        new_order_book.last_ledger_index = max(
+            transaction.ledger_index for transaction in transactions
+        )
+        self.set_order_book(order_book=new_order_book)
+
+    def mark_stale(self: OrderBooks, currency_pairs: List[str]) -> List[str]:
+        """
+        Marks order books whose transactions may have been missed. Stale order
+        books keep the transactions they receive until they get resynced.
+
+        Args:
+            currency_pairs: The currency pairs of the order books.
+
+        Returns:
+            The currency pairs of the order books that were not stale before.
+        """
+        marked = []
+        for currency_pair in currency_pairs:
+            order_book = self.__dict__.get(currency_pair)
+            if order_book is not None and not order_book.is_stale:
+                order_book.pending_transactions = []
+                marked.append(currency_pair)
+        return marked
+
+    def get_stale_currency_pairs(self: OrderBooks) -> List[str]:
+        """
+        Get the currency pairs of all stale order books.
+
+        Returns:
+            A list of currency pairs.
+        """
+        return [
+            order_book.currency_pair
+            for order_book in self.get_all_order_books()
+            if order_book.is_stale
+        ]
+
+    def resync_order_book(self: OrderBooks, order_book: OrderBook) -> int:
+        """
+        Replaces a stale order book by a new snapshot and applies the
+        transactions the stale order book received after the snapshot's ledger.
+
+        Args:
+            order_book: The order book of the new snapshot. Its
+                `snapshot_ledger_index` must be set.
+
+        Returns:
+            The number of replayed transactions.
+        """
+        assert order_book.snapshot_ledger_index is not None
+        current_order_book = self.__dict__.get(order_book.currency_pair)
+        pending_transactions = (
+            current_order_book.pending_transactions
+            if current_order_book is not None
+            and current_order_book.pending_transactions is not None
+            else []
+        )
+        self.set_order_book(order_book=order_book)
+        transactions = sorted(
+            [
+                transaction
+                for transaction in pending_transactions
+                if transaction.ledger_index > order_book.snapshot_ledger_index
+            ],
+            key=lambda transaction: (
+                transaction.ledger_index,
+                transaction.transaction_index,
+            ),
+        )
+        self._update_order_book(
+            currency_pair=order_book.currency_pair, transactions=transactions
+        )
+        return len(transactions)
+
+    def update_order_books(
+        self: OrderBooks,
+        transaction: Union[SubscriptionRawTxnType, ParsedTransaction],
+    ) -> None:
+        """
+        Applies a transaction to every order book it has touched.
+        The order books are looked up by the currency pairs of the affected
+        offers, so order books the transaction did not touch are never parsed.
+        The transaction is parsed once for all of them.
+
+        Args:
+            transaction: The raw or the parsed transaction data.
+        """
+        parsed = _parse_transaction(transaction=transaction)
+        if parsed is None:
+            return
+        for currency_pair in parsed.affected_currency_pairs:
+            self._update_order_book(currency_pair=currency_pair, transactions=[parsed])
+
+    def update_order_books_batch(
+        self: OrderBooks,
+        transactions: Sequence[Union[SubscriptionRawTxnType, ParsedTransaction]],
+    ) -> None:
+        """
+        Applies several transactions in the given order. Every order book gets
+        all transactions that touched it at once, so it is updated once and
+        its spread and exchange rate are derived once.
+
+        Args:
+            transactions: The raw or the parsed transaction data in order.
+        """
+        transactions_by_pair: Dict[str, List[ParsedTransaction]] = {}
+        for transaction in transactions:
+            parsed = _parse_transaction(transaction=transaction)
+            if parsed is None:
+                continue
+            for currency_pair in parsed.affected_currency_pairs:
+                transactions_by_pair.setdefault(currency_pair, []).append(parsed)
+        for currency_pair, pair_transactions in transactions_by_pair.items():
+            self._update_order_book(
+                currency_pair=currency_pair, transactions=pair_transactions
+            )
 
     def get_order_book(self: OrderBooks, currency_pair: str) -> OrderBook:
         """
@@ -227,7 +490,10 @@ def build_subscription_books(wallet: XRPWallet) -> List[List[SubscribeBook]]:
     return chunked_subscribe_books
 
 
-def derive_currency_pair(asks: ORDER_BOOK_SIDE_TYPE, bids: ORDER_BOOK_SIDE_TYPE) -> str:
+def derive_currency_pair(
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+) -> str:
     """
     Derives the currency pair from an order book.
 
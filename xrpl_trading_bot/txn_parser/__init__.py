@@ -1,29 +1,91 @@
 """Transaction parser."""
 
 from xrpl_trading_bot.txn_parser.balance_changes import (
+    format_balances,
     parse_balance_changes,
     parse_final_balances,
     parse_previous_balances,
 )
+from xrpl_trading_bot.txn_parser.bulk import parse_transaction_files
 from xrpl_trading_bot.txn_parser.order_book_changes import (
     parse_final_order_book,
+    parse_final_order_book_batch,
     parse_order_book_changes,
 )
+from xrpl_trading_bot.txn_parser.streaming import (
+    OrderBookState,
+    TransactionInput,
+    aiter_balance_changes,
+    aiter_final_balances,
+    aiter_order_book_changes,
+    aiter_order_book_states,
+    aiter_parsed_transactions,
+    iter_balance_changes,
+    iter_final_balances,
+    iter_order_book_changes,
+    iter_order_book_states,
+    iter_parsed_transactions,
+)
 from xrpl_trading_bot.txn_parser.utils import (
+    CURRENCY_AMOUNT_TYPE,
     ORDER_BOOK_SIDE_TYPE,
+    XRP_UNIT_TYPE,
+    AccountBalance,
+    Amount,
+    ChangeAmount,
+    Offer,
+    OrderBookSide,
+    OrderChange,
+    ParsedTransaction,
+    Quality,
     SubscriptionRawTxnType,
     XRPLOrderBookEmptyException,
     XRPLTxnFieldsException,
+    calculate_spread,
+    convert_offer_fields,
+    convert_xrp_amount,
+    derive_affected_currency_pairs,
+    derive_order_book_side,
 )
 
 __all__ = [
+    "AccountBalance",
+    "Amount",
+    "ChangeAmount",
+    "format_balances",
+    "Quality",
+    "calculate_spread",
+    "convert_offer_fields",
+    "convert_xrp_amount",
+    "derive_affected_currency_pairs",
+    "derive_order_book_side",
     "parse_balance_changes",
     "parse_final_balances",
     "parse_final_order_book",
+    "parse_final_order_book_batch",
     "parse_previous_balances",
     "parse_order_book_changes",
+    "parse_transaction_files",
+    "iter_parsed_transactions",
+    "iter_order_book_changes",
+    "iter_balance_changes",
+    "iter_final_balances",
+    "iter_order_book_states",
+    "aiter_parsed_transactions",
+    "aiter_order_book_changes",
+    "aiter_balance_changes",
+    "aiter_final_balances",
+    "aiter_order_book_states",
+    "OrderBookState",
+    "TransactionInput",
     "SubscriptionRawTxnType",
     "XRPLTxnFieldsException",
     "XRPLOrderBookEmptyException",
+    "CURRENCY_AMOUNT_TYPE",
     "ORDER_BOOK_SIDE_TYPE",
+    "XRP_UNIT_TYPE",
+    "Offer",
+    "OrderBookSide",
+    "OrderChange",
+    "ParsedTransaction",
 ]
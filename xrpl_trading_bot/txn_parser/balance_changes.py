@@ -5,133 +5,127 @@ account involved in the given transaction.
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Any, Dict, List, Union, cast
+from typing import AbstractSet, Dict, List, Optional, Union
 
 from xrpl_trading_bot.txn_parser.utils import (
+    ParsedTransaction,
     RawTxnType,
     SubscriptionRawTxnType,
-    compute_balance_changes,
-    normalize_nodes,
-    normalize_transaction,
-    parse_final_balance,
-    parse_quantities,
-    validate_transaction_fields,
 )
+from xrpl_trading_bot.txn_parser.utils.types import AccountBalance
+
+
+def format_balances(
+    balances: Dict[str, List[AccountBalance]]
+) -> Dict[str, List[Dict[str, str]]]:
+    """Formats balances grouped by address into dictionaries for exporting.
+
+    Args:
+        balances (Dict[str, List[AccountBalance]]):
+            Balances grouped by address.
+
+    Returns:
+        Dict[str, List[Dict[str, str]]]:
+            The balances in a standard format.
+    """
+    return {
+        address: [
+            {
+                "Counterparty": balance.counterparty,
+                "Currency": balance.currency,
+                "Value": balance.value,
+            }
+            for balance in account_balances
+        ]
+        for address, account_balances in balances.items()
+    }
 
 
 def parse_previous_balances(
-    transaction: Union[RawTxnType, SubscriptionRawTxnType],
-) -> Dict[str, Any]:
+    transaction: Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction],
+) -> Dict[str, List[AccountBalance]]:
     """Parse the previous balances of all accounts affected
     by the transaction before it occurred.
 
     Args:
-        transaction (Union[RawTxnType, SubscriptionRawTxnType]):
+        transaction (Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction]):
             Raw transaction data including the account that
-            sent the transaction and the affected nodes.
+            sent the transaction and the affected nodes, or the parsed
+            transaction.
 
     Returns:
-        Dict[str, Any]:
+        Dict[str, List[AccountBalance]]:
             All previous balances.
     """
-    validate_transaction_fields(transaction_data=transaction)
-    if "transaction" in transaction:
-        transaction = cast(SubscriptionRawTxnType, transaction)
-        transaction = normalize_transaction(transaction_data=transaction)
-
-    balance_changes = parse_balance_changes(transaction=transaction)
-    final_balances = parse_final_balances(transaction=transaction)
+    parsed = ParsedTransaction.of(transaction=transaction)
+    balance_changes = parsed.balance_changes
+    previous_balances = {
+        account: list(balances) for account, balances in parsed.final_balances.items()
+    }
 
     for account, balances in balance_changes.items():
         for count, balance in enumerate(balances):
-            final_balances_value = final_balances[account][count]["Value"]
-            final_balances[account][count]["Value"] = str(
-                Decimal(final_balances_value) - Decimal(balance["Value"])
+            final_balance = previous_balances[account][count]
+            previous_balances[account][count] = AccountBalance(
+                counterparty=final_balance.counterparty,
+                currency=final_balance.currency,
+                value=str(Decimal(final_balance.value) - Decimal(balance.value)),
             )
 
-    return final_balances
+    return previous_balances
 
 
 def parse_balance_changes(
-    transaction: Union[RawTxnType, SubscriptionRawTxnType],
-) -> Dict[str, Any]:
+    transaction: Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction],
+    addresses: Optional[AbstractSet[str]] = None,
+) -> Dict[str, List[AccountBalance]]:
     """Parse the balance changes of all accounts affected
     by the transaction after it occurred.
 
     Args:
-        transaction (Union[RawTxnType, SubscriptionRawTxnType]):
+        transaction (Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction]):
             Raw transaction data including the account that
-            sent the transaction and the affected nodes.
+            sent the transaction and the affected nodes, or the parsed
+            transaction.
+        addresses (Optional[AbstractSet[str]]):
+            Only parse the balance changes of these addresses. Nodes of other
+            accounts are skipped before their balances are parsed.
+            Defaults to all addresses.
 
     Returns:
-        Dict[str, Any]:
-            All balance changes.
+        Dict[str, List[AccountBalance]]:
+            All balance changes. `format_balances` turns them into
+            dictionaries.
     """
-    validate_transaction_fields(transaction_data=transaction)
-    if "transaction" in transaction:
-        transaction = cast(SubscriptionRawTxnType, transaction)
-        transaction = normalize_transaction(transaction_data=transaction)
-
-    nodes = normalize_nodes(transaction_data=transaction)
-    parsedQuantities = parse_quantities(
-        nodes=nodes, value_parser=compute_balance_changes
-    )
-
-    result: Dict[str, List[Dict[str, str]]] = {}
-    for address, change in parsedQuantities.items():
-        result[address] = []
-        for obj in change:
-            if isinstance(obj.counterparty, tuple):
-                obj.counterparty = obj.counterparty[0]
-            result[address].append(
-                {
-                    "Counterparty": obj.counterparty,
-                    "Currency": obj.currency,
-                    "Value": obj.value,
-                }
-            )
-
-    return result
+    parsed = ParsedTransaction.of(transaction=transaction)
+    if addresses is not None:
+        return parsed.balance_changes_of(addresses=addresses)
+    return parsed.balance_changes
 
 
 def parse_final_balances(
-    transaction: Union[RawTxnType, SubscriptionRawTxnType],
-) -> Dict[str, Any]:
+    transaction: Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction],
+    addresses: Optional[AbstractSet[str]] = None,
+) -> Dict[str, List[AccountBalance]]:
     """Parse the final balances of all accounts affected
     by the transaction after it occurred.
 
     Args:
-        transaction (Union[RawTxnType, SubscriptionRawTxnType]):
+        transaction (Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction]):
             Raw transaction data including the account that
-            sent the transaction and the affected nodes.
+            sent the transaction and the affected nodes, or the parsed
+            transaction.
+        addresses (Optional[AbstractSet[str]]):
+            Only parse the final balances of these addresses. Nodes of other
+            accounts are skipped before their balances are parsed.
+            Defaults to all addresses.
 
     Returns:
-        Dict[str, Any]:
-            All final balances.
+        Dict[str, List[AccountBalance]]:
+            All final balances. `format_balances` turns them into
+            dictionaries.
     """
-    validate_transaction_fields(transaction_data=transaction)
-    if "transaction" in transaction:
-        transaction = cast(SubscriptionRawTxnType, transaction)
-        transaction = normalize_transaction(transaction_data=transaction)
-
-    nodes = normalize_nodes(transaction_data=transaction)
-    parsed_quantities = parse_quantities(
-        nodes=nodes,
-        value_parser=parse_final_balance,
-    )
-
-    result: Dict[str, List[Dict[str, str]]] = {}
-    for address, change in parsed_quantities.items():
-        result[address] = []
-        for obj in change:
-            if isinstance(obj.counterparty, tuple):
-                obj.counterparty = obj.counterparty[0]
-            result[address].append(
-                {
-                    "Counterparty": obj.counterparty,
-                    "Currency": obj.currency,
-                    "Value": obj.value,
-                }
-            )
-
-    return result
+    parsed = ParsedTransaction.of(transaction=transaction)
+    if addresses is not None:
+        return parsed.final_balances_of(addresses=addresses)
+    return parsed.final_balances
@@ -0,0 +1,159 @@
+"""
+Parse files of recorded transactions across a pool of processes, e.g. for
+historical backfills. The files hold one raw transaction per line.
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from xrpl_trading_bot.txn_parser.balance_changes import format_balances
+from xrpl_trading_bot.txn_parser.utils import (
+    ParsedTransaction,
+    XRPLTxnFieldsException,
+    group_by_address_order_book,
+)
+
+SHARD_SIZE = 4 * 1024 * 1024
+"""Bytes of a file a worker parses at once."""
+RESULT_KINDS = ("order_book_changes", "balance_changes", "final_balances")
+"""The results a transaction can be parsed into."""
+
+_Shard = Tuple[str, int, int, Tuple[str, ...], bool]
+
+
+def _shard_file(path: str, shard_size: int) -> Iterator[Tuple[str, int, int]]:
+    """
+    Splits a file into byte ranges that start and end at line boundaries.
+
+    Args:
+        path: The file.
+        shard_size: The minimal number of bytes of a range.
+
+    Yields:
+        The file and the start and the end of each range.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + shard_size, size))
+            file.readline()
+            end = min(file.tell(), size)
+            yield path, start, end
+            start = end
+
+
+def _parse_line(
+    line: bytes, kinds: Tuple[str, ...], skip_malformed: bool
+) -> Optional[Dict[str, Any]]:
+    try:
+        parsed = ParsedTransaction(transaction=json.loads(line))
+    except (ValueError, KeyError, XRPLTxnFieldsException):
+        if skip_malformed:
+            return None
+        raise
+    result: Dict[str, Any] = {
+        "hash": parsed.hash,
+        "ledger_index": parsed.ledger_index,
+    }
+    if "order_book_changes" in kinds:
+        result["order_book_changes"] = {
+            address: [change.to_dict() for change in changes]
+            for address, changes in group_by_address_order_book(
+                parsed.order_changes
+            ).items()
+        }
+    if "balance_changes" in kinds:
+        result["balance_changes"] = format_balances(parsed.balance_changes)
+    if "final_balances" in kinds:
+        result["final_balances"] = format_balances(parsed.final_balances)
+    return result
+
+
+def _parse_shard(shard: _Shard) -> List[Dict[str, Any]]:
+    """
+    Parses the transactions of a byte range of a file. Runs in a worker, which
+    only receives the path and the range instead of the transactions.
+
+    Args:
+        shard: The file, the start and the end of the range, the result kinds
+            and if malformed transactions are skipped.
+
+    Returns:
+        The results of the transactions in the order of the file.
+    """
+    path, start, end, kinds, skip_malformed = shard
+    results = []
+    with open(path, "rb") as file:
+        file.seek(start)
+        for line in file.read(end - start).splitlines():
+            if not line.strip():
+                continue
+            result = _parse_line(line=line, kinds=kinds, skip_malformed=skip_malformed)
+            if result is not None:
+                results.append(result)
+    return results
+
+
+def parse_transaction_files(
+    paths: Iterable[str],
+    kinds: Iterable[str] = RESULT_KINDS,
+    processes: Optional[int] = None,
+    shard_size: int = SHARD_SIZE,
+    skip_malformed: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parses files of raw transactions, one JSON transaction per line, across a
+    pool of processes. The files are split into byte ranges at line
+    boundaries and every worker only receives a path and a range, so the
+    transactions are never pickled. The results are yielded in the order of
+    the files and their lines, while at most two ranges per process are in
+    flight.
+
+    Args:
+        paths: The files in order.
+        kinds: The results each transaction is parsed into. Any of
+            `order_book_changes`, `balance_changes` and `final_balances`.
+            Defaults to all of them.
+        processes: Number of worker processes. Defaults to the number of
+            CPUs. Parses in the calling process if 1.
+        shard_size: Bytes of a file a worker parses at once.
+            Defaults to 4 MiB.
+        skip_malformed: If malformed lines are skipped instead of raising.
+            Defaults to True.
+
+    Raises:
+        ValueError: If a result kind is unknown.
+
+    Yields:
+        For each transaction a dictionary with its `hash`, its `ledger_index`
+        and the requested results as dictionaries, in the format of
+        `OrderChange.to_dict` and `format_balances`.
+    """
+    result_kinds = tuple(kinds)
+    unknown = set(result_kinds) - set(RESULT_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown result kinds: {sorted(unknown)}")
+    shards = (
+        (path, start, end, result_kinds, skip_malformed)
+        for file_path in paths
+        for path, start, end in _shard_file(path=file_path, shard_size=shard_size)
+    )
+    workers = processes if processes is not None else os.cpu_count() or 1
+    if workers == 1:
+        for shard in shards:
+            yield from _parse_shard(shard=shard)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future[List[Dict[str, Any]]]] = deque()
+        for shard in shards:
+            pending.append(executor.submit(_parse_shard, shard))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
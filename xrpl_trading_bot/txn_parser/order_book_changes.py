@@ -2,83 +2,118 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Any, Dict, Optional, Union, cast
+from typing import Dict, List, Optional, Union
 
 from xrpl_trading_bot.txn_parser.utils import (
+    ParsedTransaction,
     RawTxnType,
     SubscriptionRawTxnType,
-    compute_order_book_changes,
     group_by_address_order_book,
-    normalize_nodes,
-    normalize_transaction,
-    validate_transaction_fields,
 )
 from xrpl_trading_bot.txn_parser.utils.order_book_changes_utils import (
-    compute_final_order_book,
+    OrderChange,
+    compute_final_order_book_batch,
 )
+from xrpl_trading_bot.txn_parser.utils.order_book_side import OrderBookSide
 from xrpl_trading_bot.txn_parser.utils.types import ORDER_BOOK_SIDE_TYPE
 
 
 def parse_order_book_changes(
-    transaction: Union[RawTxnType, SubscriptionRawTxnType],
-) -> Dict[str, Any]:
+    transaction: Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction],
+) -> Dict[str, List[OrderChange]]:
     """Parse all order book changes that were caused by a transaction.
 
     Args:
-        transaction (Union[RawTxnType, SubscriptionRawTxnType]):
+        transaction (Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction]):
             Raw transaction data including the account that
-            sent the transaction and the affected nodes.
+            sent the transaction and the affected nodes, or the parsed
+            transaction.
 
     Returns:
-        Dict[str, Any]:
-            Order book changes.
+        Dict[str, List[OrderChange]]:
+            Order book changes grouped by address. `OrderChange.to_dict`
+            turns a change into a dictionary.
     """
-    validate_transaction_fields(transaction_data=transaction)
-    if "transaction" in transaction:
-        transaction = cast(SubscriptionRawTxnType, transaction)
-        transaction = normalize_transaction(transaction_data=transaction)
-
-    nodes = normalize_nodes(transaction_data=transaction)
-    order_changes = compute_order_book_changes(nodes=nodes)
-
-    if order_changes:
-        result = group_by_address_order_book(order_changes)
-    else:
-        result = {}
-
-    return result
+    return group_by_address_order_book(
+        ParsedTransaction.of(transaction=transaction).order_changes
+    )
 
 
 def parse_final_order_book(
-    asks: ORDER_BOOK_SIDE_TYPE,
-    bids: ORDER_BOOK_SIDE_TYPE,
-    transaction: Optional[Union[RawTxnType, SubscriptionRawTxnType]],
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    transaction: Optional[Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction]],
     to_xrp: bool = False,
-) -> Dict[str, Union[ORDER_BOOK_SIDE_TYPE, str, Optional[Decimal]]]:
+    currency_pair: Optional[str] = None,
+) -> Dict[str, Union[OrderBookSide, str, Optional[Decimal]]]:
     """
     Parses the new order book after a transaction affected it.
 
     Args:
         asks: Order books ask side.
         bids: Order books bid side.
-        transaction: The raw transaction data.
+        transaction: The raw or the parsed transaction data.
         to_xrp: If the currency amount should be converted from drops to XRP.
-            Defaults to False.
+            Sides given as `OrderBookSide` keep their unit. Defaults to False.
+        currency_pair: The order books currency pair. Gets derived from the
+            offers if None. Defaults to None.
 
     Returns:
         A dictionary with the new order book, the currency pair,
         the exchange rate if an offer was modified and the order books spread.
     """
-    if transaction is not None:
-        validate_transaction_fields(transaction_data=transaction)
-        if "transaction" in transaction:
-            transaction = cast(SubscriptionRawTxnType, transaction)
-            transaction = normalize_transaction(transaction_data=transaction)
-    asks, bids, pair, ex_rate, spread = compute_final_order_book(
+    asks, bids, pair, ex_rate, spread = compute_final_order_book_batch(
+        asks=asks,
+        bids=bids,
+        transactions=[ParsedTransaction.of(transaction=transaction)]
+        if transaction is not None
+        else [],
+        to_xrp=to_xrp,
+        currency_pair=currency_pair,
+    )
+    return {
+        "asks": asks,
+        "bids": bids,
+        "currency_pair": pair,
+        "exchange_rate": Decimal(ex_rate) if ex_rate is not None else ex_rate,
+        "spread": Decimal(spread) if spread is not None else spread,
+    }
+
+
+def parse_final_order_book_batch(
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    transactions: List[Union[RawTxnType, SubscriptionRawTxnType, ParsedTransaction]],
+    to_xrp: bool = False,
+    currency_pair: Optional[str] = None,
+) -> Dict[str, Union[OrderBookSide, str, Optional[Decimal]]]:
+    """
+    Parses the new order book after several transactions affected it.
+    The transactions are applied in the given order, the spread is computed
+    once for all of them.
+
+    Args:
+        asks: Order books ask side.
+        bids: Order books bid side.
+        transactions: The raw or the parsed transaction data in order.
+        to_xrp: If the currency amount should be converted from drops to XRP.
+            Sides given as `OrderBookSide` keep their unit. Defaults to False.
+        currency_pair: The order books currency pair. Gets derived from the
+            offers if None. Defaults to None.
+
+    Returns:
+        A dictionary with the new order book, the currency pair, the last
+        exchange rate if an offer was modified and the order books spread.
+    """
+    asks, bids, pair, ex_rate, spread = compute_final_order_book_batch(
         asks=asks,
         bids=bids,
-        transaction=cast(Optional[RawTxnType], transaction),
+        transactions=[
+            ParsedTransaction.of(transaction=transaction)
+            for transaction in transactions
+        ],
         to_xrp=to_xrp,
+        currency_pair=currency_pair,
     )
     return {
         "asks": asks,
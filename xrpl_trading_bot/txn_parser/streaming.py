@@ -0,0 +1,351 @@
+"""
+Lazily parse streams of transactions, e.g. ledger dumps or recorded
+subscription streams, without building intermediate lists.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from xrpl_trading_bot.txn_parser.utils import (
+    AccountBalance,
+    OrderBookSide,
+    OrderChange,
+    ParsedTransaction,
+    RawTxnType,
+    SubscriptionRawTxnType,
+    XRPLTxnFieldsException,
+    group_by_address_order_book,
+)
+from xrpl_trading_bot.txn_parser.utils.order_book_changes_utils import (
+    compute_final_order_book_batch,
+    derive_currency_pair,
+    derive_order_book_side,
+)
+from xrpl_trading_bot.txn_parser.utils.types import ORDER_BOOK_SIDE_TYPE, BinaryTxnType
+
+TransactionInput = Union[
+    RawTxnType, SubscriptionRawTxnType, BinaryTxnType, ParsedTransaction
+]
+"""A raw transaction in JSON or in binary mode or a parsed transaction."""
+OrderBookState = Dict[str, Union[OrderBookSide, str, Optional[Decimal]]]
+"""An order book in the format of `parse_final_order_book`."""
+
+
+def _parse(
+    transaction: TransactionInput, skip_malformed: bool
+) -> Optional[ParsedTransaction]:
+    try:
+        return ParsedTransaction.of(transaction=transaction)
+    except XRPLTxnFieldsException:
+        if skip_malformed:
+            return None
+        raise
+
+
+class _OrderBookState:
+    """The order book a stream of transactions is applied to in place."""
+
+    def __init__(
+        self: _OrderBookState,
+        asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+        bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+        to_xrp: bool,
+        currency_pair: Optional[str],
+    ) -> None:
+        self.pair = (
+            currency_pair
+            if currency_pair is not None
+            else derive_currency_pair(asks=asks, bids=bids)
+        )
+        self.asks = (
+            asks
+            if isinstance(asks, OrderBookSide)
+            else derive_order_book_side(offers=asks, pair=self.pair, to_xrp=to_xrp)
+        )
+        self.bids = (
+            bids
+            if isinstance(bids, OrderBookSide)
+            else derive_order_book_side(offers=bids, pair=self.pair, to_xrp=to_xrp)
+        )
+
+    def apply(
+        self: _OrderBookState, transaction: ParsedTransaction
+    ) -> Optional[OrderBookState]:
+        if self.pair not in transaction.affected_currency_pairs:
+            return None
+        _, _, _, exchange_rate, spread = compute_final_order_book_batch(
+            asks=self.asks,
+            bids=self.bids,
+            transactions=[transaction],
+            to_xrp=self.asks.unit == "XRP",
+            currency_pair=self.pair,
+        )
+        return {
+            "asks": self.asks,
+            "bids": self.bids,
+            "currency_pair": self.pair,
+            "exchange_rate": Decimal(exchange_rate)
+            if exchange_rate is not None
+            else exchange_rate,
+            "spread": Decimal(spread) if spread is not None else spread,
+        }
+
+
+def iter_parsed_transactions(
+    transactions: Iterable[TransactionInput], skip_malformed: bool = False
+) -> Iterator[ParsedTransaction]:
+    """
+    Parses the transactions one by one as they are consumed.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Raises:
+        XRPLTxnFieldsException: If a transaction is malformed and
+            `skip_malformed` is False.
+
+    Yields:
+        The parsed transactions.
+    """
+    for transaction in transactions:
+        parsed = _parse(transaction=transaction, skip_malformed=skip_malformed)
+        if parsed is not None:
+            yield parsed
+
+
+def iter_order_book_changes(
+    transactions: Iterable[TransactionInput], skip_malformed: bool = False
+) -> Iterator[Tuple[ParsedTransaction, Dict[str, List[OrderChange]]]]:
+    """
+    Lazily parses the order book changes of a stream of transactions.
+    Transactions that did not change any offer are skipped.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction with its order book changes grouped by address.
+    """
+    for parsed in iter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        if parsed.offer_nodes:
+            yield parsed, group_by_address_order_book(parsed.order_changes)
+
+
+def iter_balance_changes(
+    transactions: Iterable[TransactionInput], skip_malformed: bool = False
+) -> Iterator[Tuple[ParsedTransaction, Dict[str, List[AccountBalance]]]]:
+    """
+    Lazily parses the balance changes of a stream of transactions.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction with its balance changes grouped by address.
+    """
+    for parsed in iter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        yield parsed, parsed.balance_changes
+
+
+def iter_final_balances(
+    transactions: Iterable[TransactionInput], skip_malformed: bool = False
+) -> Iterator[Tuple[ParsedTransaction, Dict[str, List[AccountBalance]]]]:
+    """
+    Lazily parses the final balances of a stream of transactions.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction with its final balances grouped by address.
+    """
+    for parsed in iter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        yield parsed, parsed.final_balances
+
+
+def iter_order_book_states(
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    transactions: Iterable[TransactionInput],
+    to_xrp: bool = False,
+    currency_pair: Optional[str] = None,
+    skip_malformed: bool = False,
+) -> Iterator[Tuple[ParsedTransaction, OrderBookState]]:
+    """
+    Applies a stream of transactions to an order book and yields the order
+    book after every transaction that touched it. The order book sides are
+    updated in place, so the yielded sides always hold the latest state.
+    Copy them to keep an earlier state.
+
+    Args:
+        asks: Order books ask side.
+        bids: Order books bid side.
+        transactions: The raw or the parsed transactions in order.
+        to_xrp: If the currency amount should be converted from drops to XRP.
+            Sides given as `OrderBookSide` keep their unit. Defaults to False.
+        currency_pair: The order books currency pair. Gets derived from the
+            offers if None. Defaults to None.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction that touched the order book with the order book in
+        the format of `parse_final_order_book`.
+    """
+    state = _OrderBookState(
+        asks=asks, bids=bids, to_xrp=to_xrp, currency_pair=currency_pair
+    )
+    for parsed in iter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        order_book = state.apply(transaction=parsed)
+        if order_book is not None:
+            yield parsed, order_book
+
+
+async def aiter_parsed_transactions(
+    transactions: AsyncIterable[TransactionInput], skip_malformed: bool = False
+) -> AsyncIterator[ParsedTransaction]:
+    """
+    Parses the transactions one by one as they are received.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Raises:
+        XRPLTxnFieldsException: If a transaction is malformed and
+            `skip_malformed` is False.
+
+    Yields:
+        The parsed transactions.
+    """
+    async for transaction in transactions:
+        parsed = _parse(transaction=transaction, skip_malformed=skip_malformed)
+        if parsed is not None:
+            yield parsed
+
+
+async def aiter_order_book_changes(
+    transactions: AsyncIterable[TransactionInput], skip_malformed: bool = False
+) -> AsyncIterator[Tuple[ParsedTransaction, Dict[str, List[OrderChange]]]]:
+    """
+    Async version of `iter_order_book_changes`.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction with its order book changes grouped by address.
+    """
+    async for parsed in aiter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        if parsed.offer_nodes:
+            yield parsed, group_by_address_order_book(parsed.order_changes)
+
+
+async def aiter_balance_changes(
+    transactions: AsyncIterable[TransactionInput], skip_malformed: bool = False
+) -> AsyncIterator[Tuple[ParsedTransaction, Dict[str, List[AccountBalance]]]]:
+    """
+    Async version of `iter_balance_changes`.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction with its balance changes grouped by address.
+    """
+    async for parsed in aiter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        yield parsed, parsed.balance_changes
+
+
+async def aiter_final_balances(
+    transactions: AsyncIterable[TransactionInput], skip_malformed: bool = False
+) -> AsyncIterator[Tuple[ParsedTransaction, Dict[str, List[AccountBalance]]]]:
+    """
+    Async version of `iter_final_balances`.
+
+    Args:
+        transactions: The raw or the parsed transactions.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction with its final balances grouped by address.
+    """
+    async for parsed in aiter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        yield parsed, parsed.final_balances
+
+
+async def aiter_order_book_states(
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    transactions: AsyncIterable[TransactionInput],
+    to_xrp: bool = False,
+    currency_pair: Optional[str] = None,
+    skip_malformed: bool = False,
+) -> AsyncIterator[Tuple[ParsedTransaction, OrderBookState]]:
+    """
+    Async version of `iter_order_book_states`. The order book sides are
+    updated in place.
+
+    Args:
+        asks: Order books ask side.
+        bids: Order books bid side.
+        transactions: The raw or the parsed transactions in order.
+        to_xrp: If the currency amount should be converted from drops to XRP.
+            Sides given as `OrderBookSide` keep their unit. Defaults to False.
+        currency_pair: The order books currency pair. Gets derived from the
+            offers if None. Defaults to None.
+        skip_malformed: If malformed transactions are skipped instead of
+            raising. Defaults to False.
+
+    Yields:
+        Each transaction that touched the order book with the order book in
+        the format of `parse_final_order_book`.
+    """
+    state = _OrderBookState(
+        asks=asks, bids=bids, to_xrp=to_xrp, currency_pair=currency_pair
+    )
+    async for parsed in aiter_parsed_transactions(
+        transactions=transactions, skip_malformed=skip_malformed
+    ):
+        order_book = state.apply(transaction=parsed)
+        if order_book is not None:
+            yield parsed, order_book
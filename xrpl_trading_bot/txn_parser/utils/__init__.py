@@ -1,31 +1,63 @@
 """Utils for transaction parser."""
 
+from xrpl_trading_bot.txn_parser.utils.amounts import Amount, Quality
 from xrpl_trading_bot.txn_parser.utils.balance_changes_utils import (
     compute_balance_changes,
     parse_final_balance,
     parse_quantities,
 )
+from xrpl_trading_bot.txn_parser.utils.binary import (
+    decode_binary_meta,
+    decode_binary_transaction,
+    hash_transaction_blob,
+    is_binary_transaction,
+)
 from xrpl_trading_bot.txn_parser.utils.order_book_changes_utils import (
+    ChangeAmount,
+    OrderChange,
     XRPLOrderBookEmptyException,
+    calculate_spread,
     compute_order_book_changes,
+    derive_affected_currency_pairs,
+    derive_order_book_side,
     group_by_address_order_book,
 )
+from xrpl_trading_bot.txn_parser.utils.order_book_side import OrderBookSide
+from xrpl_trading_bot.txn_parser.utils.parsed_transaction import ParsedTransaction
 from xrpl_trading_bot.txn_parser.utils.transaction_data_utils import (
     normalize_nodes,
     normalize_transaction,
     validate_transaction_fields,
 )
 from xrpl_trading_bot.txn_parser.utils.types import (
+    CURRENCY_AMOUNT_TYPE,
     ORDER_BOOK_SIDE_TYPE,
+    XRP_UNIT_TYPE,
+    AccountBalance,
+    BinaryTxnType,
+    Offer,
     RawTxnType,
     SubscriptionRawTxnType,
     XRPLTxnFieldsException,
+    convert_offer_fields,
+    convert_xrp_amount,
 )
 
 __all__ = [
+    "AccountBalance",
+    "Amount",
+    "ChangeAmount",
+    "OrderChange",
+    "Quality",
+    "calculate_spread",
     "compute_balance_changes",
     "parse_final_balance",
     "parse_quantities",
+    "BinaryTxnType",
+    "decode_binary_meta",
+    "decode_binary_transaction",
+    "hash_transaction_blob",
+    "is_binary_transaction",
     "XRPLOrderBookEmptyException",
     "RawTxnType",
     "SubscriptionRawTxnType",
@@ -34,6 +66,15 @@ __all__ = [
     "validate_transaction_fields",
     "XRPLTxnFieldsException",
     "compute_order_book_changes",
+    "derive_affected_currency_pairs",
+    "derive_order_book_side",
     "group_by_address_order_book",
+    "CURRENCY_AMOUNT_TYPE",
     "ORDER_BOOK_SIDE_TYPE",
+    "XRP_UNIT_TYPE",
+    "convert_offer_fields",
+    "convert_xrp_amount",
+    "Offer",
+    "OrderBookSide",
+    "ParsedTransaction",
 ]
@@ -0,0 +1,383 @@
+"""Exact integer arithmetic for currency amounts and qualities."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from functools import total_ordering
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from xrpl_trading_bot.txn_parser.utils.types import CURRENCY_AMOUNT_TYPE
+
+XRPL_PRECISION = 16
+"""Number of significant digits of an issued currency amount on the XRP Ledger."""
+DECIMAL_PRECISION = 28
+"""Number of significant digits of the default decimal context."""
+QUALITY_MANTISSA_MASK = (1 << 56) - 1
+
+
+def _count_digits(number: int) -> int:
+    return len(str(abs(number)))
+
+
+def _round(mantissa: int, exponent: int, precision: int) -> Tuple[int, int]:
+    """
+    Rounds a number to a number of significant digits (round half even).
+
+    Args:
+        mantissa: The integer mantissa.
+        exponent: The exponent to the base 10.
+        precision: Number of significant digits.
+
+    Returns:
+        The rounded mantissa and its exponent.
+    """
+    shift = _count_digits(number=mantissa) - precision
+    if shift <= 0:
+        return mantissa, exponent
+    sign = -1 if mantissa < 0 else 1
+    quotient, remainder = divmod(abs(mantissa), 10**shift)
+    half = 5 * 10 ** (shift - 1)
+    if remainder > half or (remainder == half and quotient % 2 == 1):
+        quotient += 1
+        if quotient == 10**precision:
+            quotient //= 10
+            shift += 1
+    return sign * quotient, exponent + shift
+
+
+def _parse_value(value: str) -> Tuple[int, int]:
+    """
+    Parses a decimal string (e.g. '-1.5', '100', '1.2e-5') into an integer
+    mantissa and an exponent, without rounding.
+
+    Args:
+        value: The decimal string.
+
+    Returns:
+        The mantissa and the exponent.
+    """
+    coefficient = value.strip().lower()
+    exponent = 0
+    if "e" in coefficient:
+        coefficient, exponent_part = coefficient.split("e")
+        exponent = int(exponent_part)
+    if "." in coefficient:
+        integer, fraction = coefficient.split(".")
+        exponent -= len(fraction)
+        coefficient = integer + fraction
+    return int(coefficient), exponent
+
+
+@total_ordering
+class Amount:
+    """
+    A currency amount as integer mantissa and exponent to the base 10.
+    The mantissa and exponent are kept as parsed, so the digits of an amount
+    survive a round trip. XRP amounts given in drops keep their drops as mantissa,
+    issued currency amounts fit the 54 bit mantissa of the XRP Ledger.
+    Comparisons are exact, multiplication and division round to a given number
+    of significant digits.
+    """
+
+    __slots__ = ("mantissa", "exponent", "currency", "issuer")
+
+    def __init__(
+        self: Amount,
+        mantissa: int,
+        exponent: int = 0,
+        currency: str = "XRP",
+        issuer: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            mantissa: The integer mantissa.
+            exponent: The exponent to the base 10. Defaults to 0.
+            currency: The currency code. Defaults to 'XRP'.
+            issuer: The issuer of an issued currency. Defaults to None.
+        """
+        self.mantissa = mantissa
+        self.exponent = exponent
+        self.currency = currency
+        self.issuer = issuer
+
+    @classmethod
+    def from_value(
+        cls, value: str, currency: str = "XRP", issuer: Optional[str] = None
+    ) -> Amount:
+        """
+        Parses a decimal string.
+
+        Args:
+            value: The decimal string.
+            currency: The currency code. Defaults to 'XRP'.
+            issuer: The issuer of an issued currency. Defaults to None.
+
+        Returns:
+            The amount.
+        """
+        mantissa, exponent = _parse_value(value=value)
+        return cls(
+            mantissa=mantissa, exponent=exponent, currency=currency, issuer=issuer
+        )
+
+    @classmethod
+    def from_currency_amount(cls, amount: CURRENCY_AMOUNT_TYPE) -> Amount:
+        """
+        Parses a currency amount as it appears in transactions and offers.
+
+        Args:
+            amount: XRP amount as string or issued currency amount as dictionary.
+
+        Returns:
+            The amount.
+        """
+        if isinstance(amount, dict):
+            return cls.from_value(
+                value=amount["value"],
+                currency=amount["currency"],
+                issuer=amount["issuer"],
+            )
+        return cls.from_value(value=amount)
+
+    @property
+    def is_native(self: Amount) -> bool:
+        """If the amount is an XRP amount."""
+        return self.issuer is None
+
+    def is_zero(self: Amount) -> bool:
+        """
+        Returns:
+            If the amount is zero.
+        """
+        return self.mantissa == 0
+
+    def normalized(self: Amount) -> Tuple[int, int]:
+        """
+        The amount in the canonical form of the XRP Ledger, with a mantissa
+        between 10^15 and 10^16 - 1. Amounts with more significant digits get rounded.
+
+        Returns:
+            The canonical mantissa and exponent.
+        """
+        if self.mantissa == 0:
+            return 0, 0
+        mantissa, exponent = _round(self.mantissa, self.exponent, XRPL_PRECISION)
+        digits = _count_digits(number=mantissa)
+        return mantissa * 10 ** (XRPL_PRECISION - digits), exponent - (
+            XRPL_PRECISION - digits
+        )
+
+    def _aligned(self: Amount, other: Amount) -> Tuple[int, int, int]:
+        exponent = min(self.exponent, other.exponent)
+        return (
+            self.mantissa * 10 ** (self.exponent - exponent),
+            other.mantissa * 10 ** (other.exponent - exponent),
+            exponent,
+        )
+
+    def __eq__(self: Amount, other: object) -> bool:
+        if not isinstance(other, Amount):
+            return NotImplemented
+        mantissa, other_mantissa, _ = self._aligned(other=other)
+        return mantissa == other_mantissa
+
+    def __lt__(self: Amount, other: Amount) -> bool:
+        mantissa, other_mantissa, _ = self._aligned(other=other)
+        return mantissa < other_mantissa
+
+    def __hash__(self: Amount) -> int:
+        return hash(self.normalized())
+
+    def __neg__(self: Amount) -> Amount:
+        return Amount(-self.mantissa, self.exponent, self.currency, self.issuer)
+
+    def __add__(self: Amount, other: Amount) -> Amount:
+        mantissa, other_mantissa, exponent = self._aligned(other=other)
+        return Amount(mantissa + other_mantissa, exponent, self.currency, self.issuer)
+
+    def __sub__(self: Amount, other: Amount) -> Amount:
+        return self + -other
+
+    def multiply(
+        self: Amount, other: Union[Amount, int], precision: int = XRPL_PRECISION
+    ) -> Amount:
+        """
+        Multiplies two amounts.
+
+        Args:
+            other: The multiplier.
+            precision: Significant digits of the result. Defaults to 16.
+
+        Returns:
+            The product in the currency of this amount.
+        """
+        if isinstance(other, int):
+            other = Amount(mantissa=other)
+        mantissa, exponent = _round(
+            self.mantissa * other.mantissa, self.exponent + other.exponent, precision
+        )
+        return Amount(mantissa, exponent, self.currency, self.issuer)
+
+    def divide(
+        self: Amount, other: Union[Amount, int], precision: int = XRPL_PRECISION
+    ) -> Amount:
+        """
+        Divides two amounts. Exact quotients keep the exponent closest to the
+        difference of both exponents, like decimal division does.
+
+        Args:
+            other: The divisor.
+            precision: Significant digits of the result. Defaults to 16.
+
+        Raises:
+            ZeroDivisionError: If the divisor is zero.
+
+        Returns:
+            The quotient in the currency of this amount.
+        """
+        if isinstance(other, int):
+            other = Amount(mantissa=other)
+        if other.mantissa == 0:
+            raise ZeroDivisionError("Division of an amount by zero.")
+        ideal_exponent = self.exponent - other.exponent
+        if self.mantissa == 0:
+            return Amount(0, ideal_exponent, self.currency, self.issuer)
+        shift = max(
+            0,
+            precision
+            + 1
+            + _count_digits(number=other.mantissa)
+            - _count_digits(number=self.mantissa),
+        )
+        quotient, remainder = divmod(
+            abs(self.mantissa) * 10**shift, abs(other.mantissa)
+        )
+        exponent = ideal_exponent - shift
+        if remainder == 0:
+            while exponent < ideal_exponent and quotient % 10 == 0:
+                quotient //= 10
+                exponent += 1
+        else:
+            # a sticky digit, so ties are not mistaken for exact halves
+            quotient = quotient * 10 + 1
+            exponent -= 1
+        if (self.mantissa < 0) != (other.mantissa < 0):
+            quotient = -quotient
+        mantissa, exponent = _round(quotient, exponent, precision)
+        return Amount(mantissa, exponent, self.currency, self.issuer)
+
+    def to_decimal(self: Amount) -> Decimal:
+        """
+        Returns:
+            The value of the amount as Decimal.
+        """
+        return Decimal(self.mantissa).scaleb(self.exponent)
+
+    def __str__(self: Amount) -> str:
+        return str(self.to_decimal())
+
+    def __repr__(self: Amount) -> str:
+        issuer = f".{self.issuer}" if self.issuer is not None else ""
+        return f"Amount({self}, {self.currency}{issuer})"
+
+
+@total_ordering
+class Quality:
+    """
+    The quality (TakerPays / TakerGets) of an offer as the XRP Ledger encodes
+    it in the last 64 bits of the offers `BookDirectory`: 8 bits exponent
+    (offset by 100) followed by 56 bits mantissa. XRP amounts are in drops.
+    As the mantissa is normalized, qualities compare like their encoded integers.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self: Quality, value: int) -> None:
+        """
+        Args:
+            value: The encoded quality.
+        """
+        self.value = value
+
+    @classmethod
+    def from_book_directory(cls, book_directory: str) -> Quality:
+        """
+        Decodes the quality of a book directory.
+
+        Args:
+            book_directory: The book directory as hex string.
+
+        Returns:
+            The quality.
+        """
+        return cls(value=int(book_directory[-16:], 16))
+
+    @property
+    def mantissa(self: Quality) -> int:
+        """The mantissa of the quality."""
+        return self.value & QUALITY_MANTISSA_MASK
+
+    @property
+    def exponent(self: Quality) -> int:
+        """The exponent of the quality."""
+        return (self.value >> 56) - 100
+
+    def to_amount(self: Quality) -> Amount:
+        """
+        Returns:
+            The quality as amount.
+        """
+        if self.value == 0:
+            return Amount(mantissa=0)
+        return Amount(mantissa=self.mantissa, exponent=self.exponent)
+
+    def crosses(self: Quality, other: Quality) -> bool:
+        """
+        Checks if an offer of this quality and an offer of the opposite side of
+        the order book with the other quality overlap, so the order book is crossed.
+
+        Args:
+            other: The quality of an offer of the opposite side.
+
+        Returns:
+            If both qualities cross.
+        """
+        product = Amount(
+            mantissa=self.mantissa * other.mantissa,
+            exponent=self.exponent + other.exponent,
+        )
+        return product < Amount(mantissa=1)
+
+    def __eq__(self: Quality, other: object) -> bool:
+        if not isinstance(other, Quality):
+            return NotImplemented
+        return self.value == other.value
+
+    def __lt__(self: Quality, other: Quality) -> bool:
+        return self.value < other.value
+
+    def __hash__(self: Quality) -> int:
+        return hash(self.value)
+
+    def __str__(self: Quality) -> str:
+        return _format_decimal(value=self.to_amount().to_decimal())
+
+    def __repr__(self: Quality) -> str:
+        return f"Quality({self})"
+
+
+def _format_decimal(value: Decimal) -> str:
+    """
+    Formats a decimal as fixed-point number without trailing zeros.
+
+    Args:
+        value: The decimal.
+
+    Returns:
+        The formatted number.
+    """
+    formatted = "{:f}".format(value)
+    if "." in formatted:
+        formatted = formatted.rstrip("0").rstrip(".")
+    return formatted
@@ -2,11 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Callable, Dict, List, Optional, Union, cast
+from typing import AbstractSet, Callable, Dict, List, Optional, Union, cast
 
-from pydash import compact, flatten, group_by, map_, map_values  # type: ignore
 from xrpl.utils.xrp_conversions import drops_to_xrp
 
 from xrpl_trading_bot.txn_parser.utils.types import (
@@ -16,19 +14,23 @@ from xrpl_trading_bot.txn_parser.utils.types import (
 )
 
 
-@dataclass
 class TrustLineQuantity:
-    """Trust line quantity.
+    """Trust line quantity."""
 
-    Args:
-        address (str):
-            Accounts address.
-        balance (AccountBalance):
-            Accounts balance.
-    """
+    __slots__ = ("address", "balance")
 
-    address: str
-    balance: AccountBalance
+    def __init__(
+        self: TrustLineQuantity, address: str, balance: AccountBalance
+    ) -> None:
+        """
+        Args:
+            address (str):
+                Accounts address.
+            balance (AccountBalance):
+                Accounts balance.
+        """
+        self.address = address
+        self.balance = balance
 
 
 def _parse_value(value: Union[AccountBalance, str]) -> Decimal:
@@ -229,17 +231,42 @@ def _group_by_address(
         Dict[str, AccountBalance]:
             A dictionary with all balance changes grouped by addresses.
     """
-    grouped = group_by(balance_changes, lambda node: node.address)
-    mapped_group = map_values(
-        grouped, lambda group: map_(group, lambda node: node.balance)
-    )
+    grouped: Dict[str, List[AccountBalance]] = {}
+    for quantity in balance_changes:
+        grouped.setdefault(quantity.address, []).append(quantity.balance)
+
+    return grouped
 
-    return mapped_group  # type: ignore
+
+def _involves(node: NormalizedNode, addresses: AbstractSet[str]) -> bool:
+    """Checks the raw fields of a node for the addresses it touches, without
+    parsing any amount.
+
+    Args:
+        node (NormalizedNode):
+            Normalized node of an account root or a trust line.
+        addresses (AbstractSet[str]):
+            The addresses of interest.
+
+    Returns:
+        bool: If the node touches one of the addresses.
+    """
+    if node.entry_type == "AccountRoot":
+        fields = node.final_fields if node.final_fields is not None else node.new_fields
+        return fields is not None and fields.fields.get("Account") in addresses
+    fields = node.final_fields if node.new_fields is None else node.new_fields
+    if fields is None:
+        return False
+    return (
+        fields.fields["LowLimit"]["issuer"] in addresses
+        or fields.fields["HighLimit"]["issuer"] in addresses
+    )
 
 
 def parse_quantities(
     nodes: List[NormalizedNode],
     value_parser: Callable[[NormalizedNode], Optional[Decimal]],
+    addresses: Optional[AbstractSet[str]] = None,
 ) -> Dict[str, List[AccountBalance]]:
     """Parse final balance.
 
@@ -248,21 +275,33 @@ def parse_quantities(
             Normalized nodes.
         value_parser (Callable[[NormalizedNode], Optional[Decimal]]):
             Value parser.
+        addresses (Optional[AbstractSet[str]]):
+            Only parse the quantities of these addresses. Nodes that do not
+            touch one of them are skipped before their values are parsed.
+            Defaults to all addresses.
 
     Returns:
         Dict[str, AccountBalance]: The grouped account balance changes.
     """
-    values: List[Any] = []
+    quantities: List[TrustLineQuantity] = []
     for node in nodes:
+        if node.entry_type not in ("AccountRoot", "RippleState"):
+            continue
+        if addresses is not None and not _involves(node=node, addresses=addresses):
+            continue
         if node.entry_type == "AccountRoot":
-            values.append(
-                _parse_xrp_quantity(node=node, value_parser=value_parser),
-            )
-        elif node.entry_type == "RippleState":
-            values.append(
-                _parse_trustline_quantity(node=node, value_parser=value_parser),
-            )
+            xrp_quantity = _parse_xrp_quantity(node=node, value_parser=value_parser)
+            if xrp_quantity is not None:
+                quantities.append(xrp_quantity)
         else:
-            values.append([])
-
-    return _group_by_address(compact(flatten(values)))
+            trustline_quantities = _parse_trustline_quantity(
+                node=node, value_parser=value_parser
+            )
+            if trustline_quantities is not None:
+                quantities.extend(trustline_quantities)
+
+    if addresses is not None:
+        quantities = [
+            quantity for quantity in quantities if quantity.address in addresses
+        ]
+    return _group_by_address(quantities)
@@ -0,0 +1,140 @@
+"""Helper functions for transactions received in binary mode."""
+
+from __future__ import annotations
+
+from hashlib import sha512
+from typing import Any, Dict, Mapping, Optional, cast
+
+from xrpl.core.binarycodec import XRPLBinaryCodecException, decode
+
+from xrpl_trading_bot.txn_parser.utils.types import (
+    MetaDataType,
+    XRPLTxnFieldsException,
+)
+
+TRANSACTION_ID_PREFIX = "54584E00"
+"""Prefix of a signed transaction blob before it is hashed (`TXN\\0`)."""
+UINT64_FIELDS = (
+    "BookNode",
+    "OwnerNode",
+    "ExchangeRate",
+    "IndexNext",
+    "IndexPrevious",
+    "LowNode",
+    "HighNode",
+)
+"""
+Fields that the binary codec decodes to zero-padded upper case hex, while
+nodes answer in JSON mode with lower case hex without leading zeros.
+"""
+
+
+def _blob(transaction_data: Mapping[str, Any], *names: str) -> Optional[str]:
+    for name in names:
+        value = transaction_data.get(name)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def is_binary_transaction(transaction_data: Mapping[str, Any]) -> bool:
+    """
+    Args:
+        transaction_data: The raw transaction data.
+
+    Returns:
+        If the transaction was received in binary mode, i.e. its metadata is a
+        hex blob.
+    """
+    return _blob(transaction_data, "meta_blob", "meta") is not None
+
+
+def get_transaction_blob(transaction_data: Mapping[str, Any]) -> Optional[str]:
+    """
+    Args:
+        transaction_data: The raw transaction data in binary mode.
+
+    Returns:
+        The transaction blob. `tx` in responses of `tx`, `tx_blob` in
+        responses of `ledger` and `account_tx`.
+    """
+    return _blob(transaction_data, "tx_blob", "tx")
+
+
+def hash_transaction_blob(tx_blob: str) -> str:
+    """
+    Args:
+        tx_blob: A signed transaction blob.
+
+    Returns:
+        The transaction hash.
+    """
+    return (
+        sha512(bytes.fromhex(TRANSACTION_ID_PREFIX + tx_blob)).hexdigest()[:64].upper()
+    )
+
+
+def _normalize_uint64_fields(fields: Dict[str, Any]) -> None:
+    for name in UINT64_FIELDS:
+        if name in fields:
+            fields[name] = format(int(fields[name], 16), "x")
+
+
+def decode_binary_meta(transaction_data: Mapping[str, Any]) -> MetaDataType:
+    """
+    Decodes the metadata blob of a transaction received in binary mode into
+    the format nodes answer with in JSON mode.
+
+    Args:
+        transaction_data: The raw transaction data in binary mode.
+
+    Raises:
+        XRPLTxnFieldsException: If the metadata blob is missing or malformed.
+
+    Returns:
+        The metadata.
+    """
+    meta_blob = _blob(transaction_data, "meta_blob", "meta")
+    if meta_blob is None:
+        raise XRPLTxnFieldsException(
+            "Malformed transaction fields: Transaction field 'meta' must be included."
+        )
+    try:
+        meta = decode(meta_blob)
+    except (XRPLBinaryCodecException, ValueError) as error:
+        raise XRPLTxnFieldsException(
+            f"Malformed transaction fields: Cannot decode 'meta': {error}"
+        ) from error
+    for affected_node in meta.get("AffectedNodes", []):
+        node = next(iter(affected_node.values()))
+        for fields_name in ("NewFields", "FinalFields", "PreviousFields"):
+            if fields_name in node:
+                _normalize_uint64_fields(fields=node[fields_name])
+    return cast(MetaDataType, meta)
+
+
+def decode_binary_transaction(transaction_data: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Decodes the transaction blob of a transaction received in binary mode.
+
+    Args:
+        transaction_data: The raw transaction data in binary mode.
+
+    Raises:
+        XRPLTxnFieldsException: If the transaction blob is missing or malformed.
+
+    Returns:
+        The transaction fields.
+    """
+    tx_blob = get_transaction_blob(transaction_data)
+    if tx_blob is None:
+        raise XRPLTxnFieldsException(
+            "Malformed transaction fields: Transaction field 'tx_blob' must be "
+            "included."
+        )
+    try:
+        return decode(tx_blob)
+    except (XRPLBinaryCodecException, ValueError) as error:
+        raise XRPLTxnFieldsException(
+            f"Malformed transaction fields: Cannot decode 'tx_blob': {error}"
+        ) from error
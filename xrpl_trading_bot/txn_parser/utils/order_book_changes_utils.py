@@ -2,101 +2,196 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union, cast
 
-from pydash import filter_, group_by, map_  # type: ignore
+from pydash import filter_  # type: ignore
 from typing_extensions import Literal
 from xrpl import XRPLException
-from xrpl.utils.xrp_conversions import XRPRangeException, drops_to_xrp
+from xrpl.utils.xrp_conversions import drops_to_xrp
 
+from xrpl_trading_bot.txn_parser.utils.amounts import DECIMAL_PRECISION, Amount
+from xrpl_trading_bot.txn_parser.utils.order_book_side import OrderBookSide
 from xrpl_trading_bot.txn_parser.utils.types import (
     CURRENCY_AMOUNT_TYPE,
+    OFFER_FIELDS,
     ORDER_BOOK_SIDE_TYPE,
+    XRP_UNIT_TYPE,
     AccountBalance,
     NormalizedNode,
+    Offer,
     RawTxnType,
     SubscriptionRawTxnType,
+    convert_offer_fields,
+    convert_xrp_amount,
+    xrp_unit,
 )
 
+if TYPE_CHECKING:
+    from xrpl_trading_bot.txn_parser.utils.parsed_transaction import (
+        ParsedTransaction,
+    )
+
 LFS_SELL = 0x00020000
 
 
-@dataclass
-class OrderChange:
-    """Order change."""
-
-    taker_pays: CURRENCY_AMOUNT_TYPE
-    """TakerPays amount"""
-    taker_gets: CURRENCY_AMOUNT_TYPE
-    """TakerGets amount"""
-    sell: bool
-    """If flag 'sell' is set"""
-    sequence: int
-    """Sequence number"""
-    status: Optional[
-        Union[
-            Literal["created"],
-            Literal["partially-filled"],
-            Literal["filled"],
-            Literal["cancelled"],
-        ]
-    ]
-    """Status of the offer"""
-    quality: str
-    """Offer quality"""
-    expiration: Optional[Union[int, str]] = None
-    """Expiration"""
-    direction: Optional[str] = None
-    """Buy or Sell."""
-    total_received: Optional[CURRENCY_AMOUNT_TYPE] = None
-    """Amount received"""
-    total_paid: Optional[CURRENCY_AMOUNT_TYPE] = None
-    """Amount paid"""
-    account: Optional[str] = None
-    """Accounts address"""
+ORDER_CHANGE_FIELDS = (
+    "taker_pays",
+    "taker_gets",
+    "sell",
+    "sequence",
+    "status",
+    "quality",
+    "expiration",
+    "direction",
+    "total_received",
+    "total_paid",
+    "account",
+)
 
 
 class ChangeAmount:
     """Amount changed by transaction."""
 
+    __slots__ = ("final_amount", "previous_value")
+
     def __init__(
         self: ChangeAmount,
-        final_amount: Dict[str, str],
+        final_amount: AccountBalance,
         previous_value: str,
     ) -> None:
         """
         Args:
-            final_amount (Dict[str, str]): Final amount
+            final_amount (AccountBalance): Final amount
             previous_value (str): Difference to Previous amount
         """
         self.final_amount = final_amount
         self.previous_value = previous_value
 
+    def to_dict(self: ChangeAmount) -> Dict[str, Any]:
+        """
+        Returns:
+            The changed amount as dictionary.
+        """
+        return {
+            "final_amount": self.final_amount.to_dict(),
+            "previous_value": self.previous_value,
+        }
+
+    def __eq__(self: ChangeAmount, other: object) -> bool:
+        if isinstance(other, ChangeAmount):
+            return (
+                self.final_amount == other.final_amount
+                and self.previous_value == other.previous_value
+            )
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self: ChangeAmount) -> str:
+        return f"ChangeAmount({self.to_dict()!r})"
+
+
+CHANGE_AMOUNT_TYPE = Union[AccountBalance, ChangeAmount]
+
+
+class OrderChange:
+    """
+    Order change. The record only holds the fields of the change, the
+    dictionary form without the fields that are not set is built by
+    `to_dict` for exporting.
+    """
+
+    __slots__ = ORDER_CHANGE_FIELDS
+
+    def __init__(
+        self: OrderChange,
+        taker_pays: Optional[CHANGE_AMOUNT_TYPE],
+        taker_gets: Optional[CHANGE_AMOUNT_TYPE],
+        sell: bool,
+        sequence: int,
+        status: Optional[Literal["created", "partially-filled", "filled", "cancelled"]],
+        quality: str,
+        expiration: Optional[Union[int, str]] = None,
+        direction: Optional[Literal["sell", "buy"]] = None,
+        total_received: Optional[CHANGE_AMOUNT_TYPE] = None,
+        total_paid: Optional[CHANGE_AMOUNT_TYPE] = None,
+        account: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            taker_pays: TakerPays amount
+            taker_gets: TakerGets amount
+            sell: If flag 'sell' is set
+            sequence: Sequence number
+            status: Status of the offer
+            quality: Offer quality
+            expiration: Expiration
+            direction: Buy or Sell.
+            total_received: Amount received
+            total_paid: Amount paid
+            account: Accounts address
+        """
+        self.taker_pays = taker_pays
+        self.taker_gets = taker_gets
+        self.sell = sell
+        self.sequence = sequence
+        self.status = status
+        self.quality = quality
+        self.expiration = expiration
+        self.direction = direction
+        self.total_received = total_received
+        self.total_paid = total_paid
+        self.account = account
+
+    def to_dict(self: OrderChange) -> Dict[str, Any]:
+        """
+        Returns:
+            The order change as dictionary without the fields that are not set.
+        """
+        result: Dict[str, Any] = {}
+        for field in ORDER_CHANGE_FIELDS:
+            value = getattr(self, field)
+            if value is None:
+                continue
+            if isinstance(value, (AccountBalance, ChangeAmount)):
+                value = value.to_dict()
+            result[field] = value
+        return result
+
+    def __eq__(self: OrderChange, other: object) -> bool:
+        if isinstance(other, OrderChange):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self: OrderChange) -> str:
+        return f"OrderChange({self.to_dict()!r})"
+
 
 class XRPLOrderBookEmptyException(XRPLException):
     pass
 
 
 def group_by_address_order_book(
-    order_changes: List[Dict[str, Union[Dict[str, str], bool, int, str]]]
-) -> Dict[
-    str,
-    List[Dict[str, Union[Dict[str, Union[Dict[str, str], str]], str, int, bool]]],
-]:
+    order_changes: List[OrderChange],
+) -> Dict[str, List[OrderChange]]:
     """Group order book changes by addresses.
 
     Args:
-        order_changes (List[Dict[str, Union[Dict[str, str], bool, int, str]]]):
+        order_changes (List[OrderChange]):
             Order book changes
 
     Returns:
-        Dict[str, Union[Dict[str, Union[Dict[str, str], str]], str, int, bool]]:
+        Dict[str, List[OrderChange]]:
             Order book changes grouped by addresses.
     """
-    return group_by(order_changes, lambda change: change["account"])  # type: ignore
+    grouped: Dict[str, List[OrderChange]] = {}
+    for change in order_changes:
+        grouped.setdefault(cast(str, change.account), []).append(change)
+    return grouped
 
 
 def _parse_currency_amount(
@@ -208,8 +303,9 @@ def _parse_change_amount(
         previous_amount=previous_amount,
     )
 
+    assert final_amount is not None
     change_amount = ChangeAmount(
-        final_amount=final_amount.__dict__, previous_value=str(0 - value)
+        final_amount=final_amount, previous_value=str(0 - value)
     )
 
     return change_amount
@@ -282,43 +378,23 @@ def _get_expiration_time(node: NormalizedNode) -> Optional[str]:
     )
 
 
-def _remove_undefined(
-    order: Union[OrderChange, NormalizedOffer]
-) -> Union[OrderChange, NormalizedOffer]:
-    """Remove all attributes that are 'None'.
-
-    Args:
-        order: Order change or normalized offer.
-
-    Returns:
-        Cleaned up object.
-    """
-    order_dict = order.__dict__.copy()
-
-    for attr, value in order_dict.items():
-        if value is None:
-            delattr(order, attr)
-
-    return order
-
-
 def _calculate_received_and_paid_amount(
-    taker_gets: CURRENCY_AMOUNT_TYPE,
-    taker_pays: CURRENCY_AMOUNT_TYPE,
+    taker_gets: Optional[CHANGE_AMOUNT_TYPE],
+    taker_pays: Optional[CHANGE_AMOUNT_TYPE],
     direction: Literal["sell", "buy"],
-) -> Tuple[CURRENCY_AMOUNT_TYPE, CURRENCY_AMOUNT_TYPE]:
+) -> Tuple[Optional[CHANGE_AMOUNT_TYPE], Optional[CHANGE_AMOUNT_TYPE]]:
     """Calculate what the taker had to pay and what he received.
 
     Args:
-        taker_gets (CURRENCY_AMOUNT_TYPE):
+        taker_gets (Optional[CHANGE_AMOUNT_TYPE]):
             TakerGets amount.
-        taker_pays (CURRENCY_AMOUNT_TYPE):
+        taker_pays (Optional[CHANGE_AMOUNT_TYPE]):
             TakerPays amount.
         direction (Literal["buy", "sell"]):
             'buy' or 'sell' offer.
 
     Returns:
-        Tuple[CURRENCY_AMOUNT_TYPE, CURRENCY_AMOUNT_TYPE]:
+        Tuple[Optional[CHANGE_AMOUNT_TYPE], Optional[CHANGE_AMOUNT_TYPE]]:
             Both paid and received amount.
     """
     quantity = taker_pays if direction == "buy" else taker_gets
@@ -338,12 +414,10 @@ def _convert_order_change(order: OrderChange) -> OrderChange:
         OrderChange:
             Converted order change.
     """
-    taker_gets = order.taker_gets
-    taker_pays = order.taker_pays
     direction: Literal["sell", "buy"] = "sell" if order.sell else "buy"
     quantity, total_price = _calculate_received_and_paid_amount(
-        taker_gets=taker_gets,
-        taker_pays=taker_pays,
+        taker_gets=order.taker_gets,
+        taker_pays=order.taker_pays,
         direction=direction,
     )
 
@@ -351,14 +425,10 @@ def _convert_order_change(order: OrderChange) -> OrderChange:
     order.total_received = quantity
     order.total_paid = total_price
 
-    cleaned_order = _remove_undefined(order=order)
-    assert isinstance(cleaned_order, OrderChange)
-    return cleaned_order
+    return order
 
 
-def _parse_order_change(
-    node: NormalizedNode,
-) -> Dict[str, Union[Dict[str, str], bool, int, str]]:
+def _parse_order_change(node: NormalizedNode) -> OrderChange:
     """Parse a change in the order book.
 
     Args:
@@ -366,7 +436,7 @@ def _parse_order_change(
             The affected node.
 
     Returns:
-        Dict[str, Union[Dict[str, str], bool, int, str ]]:
+        OrderChange:
             A order book change.
     """
     if node.final_fields is not None:
@@ -381,8 +451,8 @@ def _parse_order_change(
         sell = False
 
     order_change = OrderChange(
-        taker_pays=_parse_change_amount(node, "TakerPays").__dict__,
-        taker_gets=_parse_change_amount(node, "TakerGets").__dict__,
+        taker_pays=_parse_change_amount(node, "TakerPays"),
+        taker_gets=_parse_change_amount(node, "TakerGets"),
         sell=sell,
         sequence=seq,
         status=_parse_order_status(node),
@@ -398,105 +468,151 @@ def _parse_order_change(
     else:
         order_change.account = ""
 
-    return order_change.__dict__
+    return order_change
 
 
 def compute_order_book_changes(
     nodes: List[NormalizedNode],
-) -> List[Dict[str, Union[Dict[str, str], bool, int, str]]]:
+) -> List[OrderChange]:
     """Filter nodes by 'EntryType': 'Offer'.
 
     Args:
         nodes (List[NormalizedNode]): Affected nodes.
 
     Returns:
-        List[Dict[str, Union[Dict[str, str], bool, int, str]]]:
+        List[OrderChange]:
             A unsorted list of all order book changes.
     """
-    filter_nodes = map_(
-        filter_(nodes, lambda node: True if node.entry_type == "Offer" else False),
-        _parse_order_change,
-    )
-
-    return filter_nodes  # type: ignore
+    return [
+        _parse_order_change(node=node) for node in nodes if node.entry_type == "Offer"
+    ]
 
 
-@dataclass
 class NormalizedOffer:
-    diff_type: str
-    identifiers: Union[Tuple[str, str], Tuple[None, None]]
-    Account: str
-    BookDirectory: str
-    BookNode: str
-    Flags: int
-    OwnerNode: str
-    PreviousTxnID: str
-    PreviousTxnLgrSeq: int
-    Sequence: int
-    TakerGets: CURRENCY_AMOUNT_TYPE
-    TakerPays: CURRENCY_AMOUNT_TYPE
-    index: str
-    quality: str
-    LedgerEntryType: str = "Offer"
-    owner_funds: Optional[str] = None
-    taker_gets_funded: Optional[CURRENCY_AMOUNT_TYPE] = None
-    taker_pays_funded: Optional[CURRENCY_AMOUNT_TYPE] = None
-
-
-def _format_drops_to_xrp(
-    amount: Optional[CURRENCY_AMOUNT_TYPE],
-) -> Optional[CURRENCY_AMOUNT_TYPE]:
-    """
-    Takes a currency amount, derives its value and tries to format drops to XRP
-    if needed.
-
-    Args:
-        amount: A currency amount.
-
-    Returns:
-        The adjusted currency amount
     """
-    if not isinstance(amount, dict) and amount is not None:
-        try:
-            return str(drops_to_xrp(drops=amount))
-        except XRPRangeException:
-            assert isinstance(amount, str)
-            return amount
-    else:
-        return amount
+    An affected offer in a standard format, before it becomes an `Offer`.
+    XRP amounts are expressed in the offer's `unit`.
+    """
 
+    __slots__ = (
+        "diff_type",
+        "identifiers",
+        "Account",
+        "BookDirectory",
+        "BookNode",
+        "Flags",
+        "OwnerNode",
+        "PreviousTxnID",
+        "PreviousTxnLgrSeq",
+        "Sequence",
+        "TakerGets",
+        "TakerPays",
+        "index",
+        "quality",
+        "LedgerEntryType",
+        "owner_funds",
+        "taker_gets_funded",
+        "taker_pays_funded",
+        "unit",
+        "taker_gets_amount",
+        "taker_pays_amount",
+    )
 
-def _derive_field(node: Dict[str, Any], field_name: str, to_xrp: bool = False) -> Any:
+    def __init__(
+        self: NormalizedOffer,
+        diff_type: str,
+        identifiers: Union[Tuple[str, int], Tuple[None, None]],
+        Account: str,
+        BookDirectory: str,
+        BookNode: str,
+        Flags: int,
+        OwnerNode: str,
+        PreviousTxnID: str,
+        PreviousTxnLgrSeq: int,
+        Sequence: int,
+        TakerGets: CURRENCY_AMOUNT_TYPE,
+        TakerPays: CURRENCY_AMOUNT_TYPE,
+        index: str,
+        quality: str,
+        taker_gets_amount: Amount,
+        taker_pays_amount: Amount,
+        LedgerEntryType: str = "Offer",
+        owner_funds: Optional[str] = None,
+        taker_gets_funded: Optional[CURRENCY_AMOUNT_TYPE] = None,
+        taker_pays_funded: Optional[CURRENCY_AMOUNT_TYPE] = None,
+        unit: XRP_UNIT_TYPE = "drops",
+    ) -> None:
+        self.diff_type = diff_type
+        self.identifiers = identifiers
+        self.Account = Account
+        self.BookDirectory = BookDirectory
+        self.BookNode = BookNode
+        self.Flags = Flags
+        self.OwnerNode = OwnerNode
+        self.PreviousTxnID = PreviousTxnID
+        self.PreviousTxnLgrSeq = PreviousTxnLgrSeq
+        self.Sequence = Sequence
+        self.TakerGets = TakerGets
+        self.TakerPays = TakerPays
+        self.index = index
+        self.quality = quality
+        self.LedgerEntryType = LedgerEntryType
+        self.owner_funds = owner_funds
+        self.taker_gets_funded = taker_gets_funded
+        self.taker_pays_funded = taker_pays_funded
+        self.unit = unit
+        self.taker_gets_amount = taker_gets_amount
+        self.taker_pays_amount = taker_pays_amount
+
+
+def _derive_field(node: Dict[str, Any], field_name: str) -> Any:
     """
     Takes a node and derives the wanted field from it.
-    If it is an currency amount it is possible to convert the value to XRP.
 
     Args:
         node: The node.
         field_name: The wished field name.
-        to_xrp: If the field should be converted to XRP. Defaults to False.
 
     Returns:
         The wished field.
     """
     if "NewFields" in node[list(node.keys())[0]]:
         try:
-            field = node[list(node.keys())[0]]["NewFields"][field_name]
-            if to_xrp:
-                field = _format_drops_to_xrp(amount=field)
-            return field
+            return node[list(node.keys())[0]]["NewFields"][field_name]
         except KeyError:
             return "0"
 
-    field = node[list(node.keys())[0]]["FinalFields"][field_name]
-    if to_xrp:
-        field = _format_drops_to_xrp(amount=field)
-    return field
+    return node[list(node.keys())[0]]["FinalFields"][field_name]
+
+
+def _derive_xrp_amount(
+    node: Dict[str, Any], field_name: str, unit: XRP_UNIT_TYPE
+) -> CURRENCY_AMOUNT_TYPE:
+    """
+    Derives a currency amount from a node. The ledger expresses XRP amounts in
+    drops, so they are converted to the wanted unit here and nowhere else.
+
+    Args:
+        node: The node.
+        field_name: The wished field name.
+        unit: The unit XRP amounts are expressed in.
+
+    Returns:
+        The currency amount.
+    """
+    return cast(
+        CURRENCY_AMOUNT_TYPE,
+        convert_xrp_amount(
+            amount=_derive_field(node=node, field_name=field_name),
+            unit="drops",
+            new_unit=unit,
+        ),
+    )
 
 
 def _format_quality(quality: str) -> str:
     """
-    If the quality is expressed in scientific notation
+    If the quality is expressed in scientific notation with a negative exponent
     it converts it to a normal float-point number as string.
 
     Args:
@@ -505,66 +621,50 @@ def _format_quality(quality: str) -> str:
     Returns:
         The formatted quality.
     """
-    if "E" in quality:
-        num, off = quality.split("E")
-        i, d = str(float(num)).split(".")
-        if float(off) < 0:
-            ld = len(d)
-            lenght = ld + abs(float(off))
-            f = "f'{{{}:.{}f}}'".format(float(quality), int(lenght))
-            f = str(eval(f))
-            return f.rstrip("0")
+    if "E-" in quality:
+        return "{:f}".format(Decimal(quality)).rstrip("0")
 
     return quality
 
 
+def _derive_amount_currency(amount: Amount) -> str:
+    return "XRP" if amount.is_native else f"{amount.currency}.{amount.issuer}"
+
+
 def _derive_quality(
-    taker_gets: CURRENCY_AMOUNT_TYPE,
-    taker_pays: CURRENCY_AMOUNT_TYPE,
+    taker_gets: Amount,
+    taker_pays: Amount,
     pair: str,
 ) -> str:
     """
     Derives the quality of an offer considering the order books side.
 
     Args:
-        taker_gets: TakerGets amount.
-        taker_pays: TakerPays amount.
+        taker_gets: Parsed TakerGets amount.
+        taker_pays: Parsed TakerPays amount.
         pair: The currency pair of the given order book.
 
     Returns:
         The offer's quality.
     """
-    possible_base = (
-        f"{taker_pays['currency']}.{taker_pays['issuer']}"
-        if (isinstance(taker_pays, dict))
-        else "XRP"
-    )
-    possible_counter = (
-        f"{taker_gets['currency']}.{taker_gets['issuer']}"
-        if (isinstance(taker_gets, dict))
-        else "XRP"
-    )
+    possible_base = _derive_amount_currency(amount=taker_pays)
+    possible_counter = _derive_amount_currency(amount=taker_gets)
     possible_currency_pair = f"{possible_base}/{possible_counter}"
 
-    taker_gets_value = (
-        taker_gets["value"] if (isinstance(taker_gets, dict)) else taker_gets
-    )
-    taker_pays_value = (
-        taker_pays["value"] if (isinstance(taker_pays, dict)) else taker_pays
-    )
-
-    if taker_gets_value == "0" or taker_pays_value == "0":
+    if taker_gets.is_zero() or taker_pays.is_zero():
         return "0"
 
-    quality = Decimal(taker_gets_value) / Decimal(taker_pays_value)
+    quality = taker_gets.divide(other=taker_pays, precision=DECIMAL_PRECISION)
     if possible_currency_pair != pair:
-        return _format_quality("{:.12}".format(1 / quality))
+        quality = Amount(mantissa=1).divide(other=quality, precision=DECIMAL_PRECISION)
 
-    return _format_quality("{:.12}".format(quality))
+    return _format_quality("{:.12}".format(quality.to_decimal()))
 
 
 def _derive_unfunded_amounts(
-    owner_funds: str, quality: str, taker_gets: CURRENCY_AMOUNT_TYPE
+    owner_funds: str,
+    taker_gets: Amount,
+    taker_pays: Amount,
 ) -> Union[Tuple[str, str], Tuple[None, None]]:
     """
     Calculate the unfunded amount if `owner_funds` is lower than the `TakerGets` amount.
@@ -572,28 +672,28 @@ def _derive_unfunded_amounts(
     Args:
         owner_funds: The TakerGets currency's amount that the owner of the offer
             actually hold's.
-        quality: The offer's quality.
-        taker_gets: TakerGets amount.
-        to_xrp: Convert to XRP.
+        taker_gets: Parsed TakerGets amount.
+        taker_pays: Parsed TakerPays amount.
 
     Returns:
         The unfunded amount.
     """
-    if isinstance(taker_gets, dict):
-        taker_gets_value = taker_gets["value"]
-    else:
-        taker_gets_value = taker_gets
-    if Decimal(taker_gets_value) > Decimal(owner_funds):
+    owner_funds_amount = Amount.from_value(value=owner_funds)
+    if taker_gets > owner_funds_amount:
         taker_gets_funded = owner_funds
-        taker_pays_funded = Decimal(owner_funds) * Decimal(quality)
-        return taker_gets_funded, "{:.12}".format(taker_pays_funded)
+        # the quality is flipped for one side of the order book, the
+        # TakerPays per TakerGets ratio is not
+        taker_pays_funded = owner_funds_amount.multiply(
+            other=taker_pays, precision=DECIMAL_PRECISION
+        ).divide(other=taker_gets, precision=DECIMAL_PRECISION)
+        return taker_gets_funded, "{:.12}".format(taker_pays_funded.to_decimal())
     return (None, None)
 
 
 def _derive_identifiers(
     offer: Dict[str, Any],
     diff_type: Literal["CreatedNode", "ModifiedNode", "DeletedNode"],
-) -> Union[Tuple[str, str], Tuple[None, None]]:
+) -> Union[Tuple[str, int], Tuple[None, None]]:
     """
     Derive fields to identify old offers.
 
@@ -648,20 +748,27 @@ def _normalize_offer(
         Literal["CreatedNode", "ModifiedNode", "DeletedNode"], list(offer.keys())[0]
     )
     assert diff_type in ["CreatedNode", "ModifiedNode", "DeletedNode"]
-    taker_gets = _derive_field(node=offer, field_name="TakerGets", to_xrp=to_xrp)
-    taker_pays = _derive_field(node=offer, field_name="TakerPays", to_xrp=to_xrp)
-    quality = str(
-        _derive_quality(
-            taker_gets=taker_gets,
-            taker_pays=taker_pays,
-            pair=pair,
-        )
+    unit = xrp_unit(to_xrp=to_xrp)
+    taker_gets = _derive_xrp_amount(node=offer, field_name="TakerGets", unit=unit)
+    taker_pays = _derive_xrp_amount(node=offer, field_name="TakerPays", unit=unit)
+    taker_gets_amount = Amount.from_currency_amount(amount=taker_gets)
+    taker_pays_amount = Amount.from_currency_amount(amount=taker_pays)
+    quality = _derive_quality(
+        taker_gets=taker_gets_amount,
+        taker_pays=taker_pays_amount,
+        pair=pair,
     )
-    if to_xrp and owner_funds is not None:
-        owner_funds = _format_drops_to_xrp(amount=owner_funds)  # type: ignore
+    if isinstance(taker_gets, str):
+        # the funds are held in the TakerGets currency
+        owner_funds = cast(
+            Optional[str],
+            convert_xrp_amount(amount=owner_funds, unit="drops", new_unit=unit),
+        )
     taker_gets_funded, taker_pays_funded = (
         _derive_unfunded_amounts(
-            owner_funds=owner_funds, quality=quality, taker_gets=taker_gets
+            owner_funds=owner_funds,
+            taker_gets=taker_gets_amount,
+            taker_pays=taker_pays_amount,
         )
         if owner_funds is not None
         else (None, None)
@@ -679,37 +786,40 @@ def _normalize_offer(
         TakerPays=taker_pays,
         index=cast(str, offer[diff_type]["LedgerIndex"]),
         quality=quality,
+        taker_gets_amount=taker_gets_amount,
+        taker_pays_amount=taker_pays_amount,
         BookNode=_derive_field(node=offer, field_name="BookNode"),
         OwnerNode=_derive_field(node=offer, field_name="OwnerNode"),
         owner_funds=owner_funds,
         taker_gets_funded=taker_gets_funded,
         taker_pays_funded=taker_pays_funded,
+        unit=unit,
     )
 
 
-def _normalize_offers(
-    transaction: Union[RawTxnType, SubscriptionRawTxnType],
+def _normalize_offer_nodes(
+    offer_nodes: List[Dict[str, Any]],
+    hash: str,
+    ledger_index: int,
     currency_pair: str,
     to_xrp: bool,
+    owner_funds: Optional[str] = None,
 ) -> List[NormalizedOffer]:
     """
-    Normalizes all offer objects the transaction has affected.
+    Normalizes offer nodes of a transaction.
 
     Args:
-        transaction: The raw transaction.
+        offer_nodes: The affected nodes of the offers.
+        hash: The transactions transaction hash.
+        ledger_index: The ledger sequence the transaction was included in.
         currency_pair: Currency pair.
         to_xrp: If currency amount should be converted from drops to XRP.
+        owner_funds: The TakerGets amount that the account actually holds.
+            Defaults to None.
 
     Returns:
         A list of offer objects in a standard format.
     """
-    hash = transaction["hash"]
-    ledger_index = transaction["ledger_index"]
-    affected_nodes = transaction["meta"]["AffectedNodes"]
-    offers = filter_(
-        affected_nodes,
-        lambda node: node[list(node.keys())[0]]["LedgerEntryType"] == "Offer",
-    )
     return [
         _normalize_offer(
             offer=offer,
@@ -717,15 +827,96 @@ def _normalize_offers(
             new_prev_txn_lgr_seq=ledger_index,
             pair=currency_pair,
             to_xrp=to_xrp,
-            owner_funds=transaction["owner_funds"]
-            if "owner_funds" in transaction
-            else None,
+            owner_funds=owner_funds,
         )
-        for offer in offers
+        for offer in offer_nodes
     ]
 
 
-def derive_currency_pair(asks: ORDER_BOOK_SIDE_TYPE, bids: ORDER_BOOK_SIDE_TYPE) -> str:
+def _normalize_offers(
+    transaction: Union[RawTxnType, SubscriptionRawTxnType],
+    currency_pair: str,
+    to_xrp: bool,
+) -> List[NormalizedOffer]:
+    """
+    Normalizes all offer objects the transaction has affected.
+
+    Args:
+        transaction: The raw transaction.
+        currency_pair: Currency pair.
+        to_xrp: If currency amount should be converted from drops to XRP.
+
+    Returns:
+        A list of offer objects in a standard format.
+    """
+    affected_nodes = transaction["meta"]["AffectedNodes"]
+    offers = filter_(
+        affected_nodes,
+        lambda node: node[list(node.keys())[0]]["LedgerEntryType"] == "Offer",
+    )
+    return _normalize_offer_nodes(
+        offer_nodes=offers,
+        hash=transaction["hash"],
+        ledger_index=transaction["ledger_index"],
+        currency_pair=currency_pair,
+        to_xrp=to_xrp,
+        owner_funds=transaction["owner_funds"]
+        if "owner_funds" in transaction
+        else None,
+    )
+
+
+def _derive_currency(amount: CURRENCY_AMOUNT_TYPE) -> str:
+    """
+    Derives the currency of a currency amount in the format the currency
+    pairs are built of.
+
+    Args:
+        amount: A currency amount.
+
+    Returns:
+        The currency as `currency.issuer` or `XRP`.
+    """
+    if isinstance(amount, dict):
+        return f"{amount['currency']}.{amount['issuer']}"
+    return "XRP"
+
+
+def derive_affected_currency_pairs(
+    transaction: Union[RawTxnType, SubscriptionRawTxnType],
+) -> Set[str]:
+    """
+    Derives the currency pairs of all order books a transaction has touched.
+    Both orientations of every pair are returned, as an order book and its
+    flipped order book contain the same offers.
+    Failed transactions and transactions without offer nodes touch no order book.
+
+    Args:
+        transaction: The raw transaction.
+
+    Returns:
+        The currency pairs of all affected order books.
+    """
+    currency_pairs: Set[str] = set()
+    meta = transaction.get("meta")
+    if not isinstance(meta, dict) or meta.get("TransactionResult") != "tesSUCCESS":
+        return currency_pairs
+    for affected_node in meta.get("AffectedNodes", []):
+        node = cast(Dict[str, Any], list(affected_node.values())[0])
+        if node["LedgerEntryType"] != "Offer":
+            continue
+        fields = node["NewFields"] if "NewFields" in node else node["FinalFields"]
+        taker_pays = _derive_currency(amount=fields["TakerPays"])
+        taker_gets = _derive_currency(amount=fields["TakerGets"])
+        currency_pairs.add(f"{taker_pays}/{taker_gets}")
+        currency_pairs.add(f"{taker_gets}/{taker_pays}")
+    return currency_pairs
+
+
+def derive_currency_pair(
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+) -> str:
     """
     Derives the currency pair from an order book.
 
@@ -780,12 +971,7 @@ def _derive_offer_status_for_final_order_book(
     if offer.diff_type == "CreatedNode":
         return "created"
     elif offer.diff_type == "ModifiedNode":
-        taker_gets_value = Decimal(
-            value=offer.TakerGets["value"]
-            if isinstance(offer.TakerGets, dict)
-            else offer.TakerGets
-        )
-        if taker_gets_value > 0:
+        if offer.taker_gets_amount.mantissa > 0:
             return "partially-filled"
         else:
             return "filled"
@@ -793,7 +979,7 @@ def _derive_offer_status_for_final_order_book(
         return "cancelled"
 
 
-def _prepare_offer(offer: NormalizedOffer) -> Dict[str, Any]:
+def _prepare_offer(offer: NormalizedOffer) -> Offer:
     """
     Prepares the offer before adding it to the order book.
 
@@ -801,19 +987,36 @@ def _prepare_offer(offer: NormalizedOffer) -> Dict[str, Any]:
         offer: The offer.
 
     Returns:
-        The offer object as dictionary.
+        The offer record.
     """
-    offer.__delattr__("diff_type")
-    offer.__delattr__("identifiers")
-    offer = cast(NormalizedOffer, _remove_undefined(order=offer))
-    return offer.__dict__
+    return Offer(
+        Account=offer.Account,
+        BookDirectory=offer.BookDirectory,
+        BookNode=offer.BookNode,
+        Flags=offer.Flags,
+        OwnerNode=offer.OwnerNode,
+        PreviousTxnID=offer.PreviousTxnID,
+        PreviousTxnLgrSeq=offer.PreviousTxnLgrSeq,
+        Sequence=offer.Sequence,
+        TakerGets=offer.TakerGets,
+        TakerPays=offer.TakerPays,
+        index=offer.index,
+        quality=offer.quality,
+        LedgerEntryType=offer.LedgerEntryType,
+        owner_funds=offer.owner_funds,
+        taker_gets_funded=offer.taker_gets_funded,
+        taker_pays_funded=offer.taker_pays_funded,
+        unit=offer.unit,
+        taker_gets_amount=offer.taker_gets_amount,
+        taker_pays_amount=offer.taker_pays_amount,
+    )
 
 
 def _parse_final_order_book_side(
-    side: ORDER_BOOK_SIDE_TYPE,
+    side: OrderBookSide,
     offer: NormalizedOffer,
     status: Literal["created", "partially-filled", "filled", "cancelled"],
-) -> Tuple[ORDER_BOOK_SIDE_TYPE, Optional[str]]:
+) -> Tuple[OrderBookSide, Optional[str]]:
     """
     Parses the new order book side.
 
@@ -828,41 +1031,29 @@ def _parse_final_order_book_side(
     new_exchange_rate = None
     if status == "created":
         side.append(_prepare_offer(offer=offer))
-        new_exchange_rate = None
         return side, new_exchange_rate
+    side_offer = side.find(index=offer.index, identifiers=offer.identifiers)
     if status == "partially-filled":
         assert side  # side must not be empty
-        prev_txn_id, prev_txn_lgr_seq = offer.identifiers
-        side_copy = side
-        for num, side_offer in enumerate(side_copy):
-            if (
-                side_offer["PreviousTxnID"] == prev_txn_id
-                and side_offer["PreviousTxnLgrSeq"] == prev_txn_lgr_seq
-            ):
-                side[num] = _prepare_offer(offer=offer)
-                new_exchange_rate = offer.quality
+        if side_offer is not None:
+            side.replace(offer=side_offer, new_offer=_prepare_offer(offer=offer))
+            new_exchange_rate = offer.quality
         return side, new_exchange_rate
     # else cancelled or filled
-    prev_txn_id, prev_txn_lgr_seq = offer.identifiers
-    side_copy = side
-    for num, side_offer in enumerate(side_copy):
-        if (
-            side_offer["PreviousTxnID"] == prev_txn_id
-            and side_offer["PreviousTxnLgrSeq"] == prev_txn_lgr_seq
-        ):
-            _ = side.pop(num)
+    if side_offer is not None:
+        side.remove(offer=side_offer)
     if status == "filled":
         new_exchange_rate = offer.quality
     return side, new_exchange_rate
 
 
 def _parse_final_order_book(
-    asks: ORDER_BOOK_SIDE_TYPE,
-    bids: ORDER_BOOK_SIDE_TYPE,
+    asks: OrderBookSide,
+    bids: OrderBookSide,
     offer: NormalizedOffer,
     status: Literal["created", "partially-filled", "filled", "cancelled"],
     currency_pair: str,
-) -> Tuple[ORDER_BOOK_SIDE_TYPE, ORDER_BOOK_SIDE_TYPE, Optional[str]]:
+) -> Tuple[OrderBookSide, OrderBookSide, Optional[str]]:
     """
     Parses the new order book after the transaction affected it.
 
@@ -903,112 +1094,213 @@ def _parse_final_order_book(
     return asks, bids, new_exchange_rate
 
 
-def _calculate_spread(
-    tip_ask: Dict[str, Union[str, int, CURRENCY_AMOUNT_TYPE]],
-    tip_bid: Dict[str, Union[str, int, CURRENCY_AMOUNT_TYPE]],
-) -> str:
+def _derive_offer_fields(offer: Dict[str, Any], pair: str, to_xrp: bool) -> Offer:
+    """
+    Derives the fields of an offer that enters the order book.
+    XRP amounts of the offer are expected in drops, the way the ledger
+    expresses them.
+
+    Args:
+        offer: The offer.
+        pair: The currency pair of the order book.
+        to_xrp: If currency amount should be converted from drops to XRP.
+
+    Returns:
+        The offer record with derived fields.
+    """
+    unit = xrp_unit(to_xrp=to_xrp)
+    fields = convert_offer_fields(
+        offer={
+            field: offer[field]
+            for field in OFFER_FIELDS
+            if field in offer and field != "quality"
+        },
+        unit="drops",
+        new_unit=unit,
+    )
+    taker_gets = Amount.from_currency_amount(amount=fields["TakerGets"])
+    taker_pays = Amount.from_currency_amount(amount=fields["TakerPays"])
+    return Offer(
+        **fields,
+        quality=_derive_quality(
+            taker_gets=taker_gets, taker_pays=taker_pays, pair=pair
+        ),
+        unit=unit,
+        taker_gets_amount=taker_gets,
+        taker_pays_amount=taker_pays,
+    )
+
+
+def derive_order_book_side(
+    offers: ORDER_BOOK_SIDE_TYPE, pair: str, to_xrp: bool
+) -> OrderBookSide:
+    """
+    Builds an order book side from offers that did not pass the parser yet,
+    for example the offers of an order book snapshot.
+
+    Args:
+        offers: The offers.
+        pair: The currency pair of the order book.
+        to_xrp: If currency amount should be converted from drops to XRP.
+
+    Returns:
+        The order book side.
+    """
+    return OrderBookSide(
+        offers=[
+            _derive_offer_fields(offer=offer, pair=pair, to_xrp=to_xrp)
+            for offer in offers
+        ],
+        unit=xrp_unit(to_xrp=to_xrp),
+    )
+
+
+def calculate_spread(ask_quality: Amount, bid_quality: Amount) -> Amount:
     """
-    Calculates the order books quoted spread.
+    Calculates the quoted spread of an order book.
 
     Args:
-        tip_ask: The cheapest ask offer.
-        tip_bid: The most expensive bid offer.
+        ask_quality: The quality of the cheapest ask offer.
+        bid_quality: The quality of the most expensive bid offer.
 
     Returns:
-        The spread.
+        The spread in percent.
     """
-    ask_quality = Decimal(cast(str, tip_ask["quality"]))
-    bid_quality = Decimal(cast(str, tip_bid["quality"]))
     price_difference = ask_quality - bid_quality
-    midpoint = (ask_quality + bid_quality) / 2
-    quoted_spread = (price_difference / midpoint) * 100
-    return str(quoted_spread)
+    midpoint = (ask_quality + bid_quality).divide(other=2, precision=DECIMAL_PRECISION)
+    return price_difference.divide(
+        other=midpoint, precision=DECIMAL_PRECISION
+    ).multiply(other=100, precision=DECIMAL_PRECISION)
 
 
-def compute_final_order_book(
-    asks: ORDER_BOOK_SIDE_TYPE,
-    bids: ORDER_BOOK_SIDE_TYPE,
-    transaction: Optional[RawTxnType],
+def _apply_transaction(
+    asks: OrderBookSide,
+    bids: OrderBookSide,
+    transaction: Union[RawTxnType, ParsedTransaction],
+    pair: str,
     to_xrp: bool,
-) -> Tuple[
-    ORDER_BOOK_SIDE_TYPE, ORDER_BOOK_SIDE_TYPE, str, Optional[str], Optional[str]
-]:
+) -> Optional[str]:
     """
-    Compute the new order book.
+    Applies the offers a transaction affected to the order book sides.
 
     Args:
         asks: Ask side.
         bids: Bid side.
-        transaction: The raw transaction.
+        transaction: The raw or the parsed transaction.
+        pair: Currency pair.
         to_xrp: If currency amount should be converted from drops to XRP.
 
     Returns:
-        The new order book, currency pair, exchange rate and spread.
+        The exchange rate if an offer was modified.
     """
-    pair = derive_currency_pair(asks=asks, bids=bids)
     exchange_rate = None
-    quoted_spread = None
-    if transaction is not None:
-        normalized_offers = _normalize_offers(
-            transaction=transaction, currency_pair=pair, to_xrp=to_xrp
+    normalized_offers = (
+        _normalize_offers(transaction=transaction, currency_pair=pair, to_xrp=to_xrp)
+        if isinstance(transaction, dict)
+        else transaction.offers(currency_pair=pair, to_xrp=to_xrp)
+    )
+    for offer in normalized_offers:
+        offer_status = _derive_offer_status_for_final_order_book(offer=offer)
+        asks, bids, new_exchange_rate = _parse_final_order_book(
+            asks=asks,
+            bids=bids,
+            offer=offer,
+            status=offer_status,
+            currency_pair=pair,
         )
-        for offer in normalized_offers:
-            offer_status = _derive_offer_status_for_final_order_book(offer=offer)
-            asks, bids, new_exchange_rate = _parse_final_order_book(
-                asks=asks,
-                bids=bids,
-                offer=offer,
-                status=offer_status,
-                currency_pair=pair,
-            )
-            if new_exchange_rate is not None:
-                exchange_rate = new_exchange_rate
-    for ask in asks:
-        if to_xrp:
-            ask["TakerGets"] = cast(
-                CURRENCY_AMOUNT_TYPE,
-                _format_drops_to_xrp(
-                    amount=cast(CURRENCY_AMOUNT_TYPE, ask["TakerGets"])
-                ),
-            )
-            ask["TakerPays"] = cast(
-                CURRENCY_AMOUNT_TYPE,
-                _format_drops_to_xrp(
-                    amount=cast(CURRENCY_AMOUNT_TYPE, ask["TakerPays"])
-                ),
-            )
-        ask["quality"] = _derive_quality(
-            taker_gets=cast(CURRENCY_AMOUNT_TYPE, ask["TakerGets"]),
-            taker_pays=cast(CURRENCY_AMOUNT_TYPE, ask["TakerPays"]),
-            pair=pair,
+        if new_exchange_rate is not None:
+            exchange_rate = new_exchange_rate
+    return exchange_rate
+
+
+def compute_final_order_book_batch(
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    transactions: List[Union[RawTxnType, ParsedTransaction]],
+    to_xrp: bool,
+    currency_pair: Optional[str] = None,
+) -> Tuple[OrderBookSide, OrderBookSide, str, Optional[str], Optional[str]]:
+    """
+    Compute the new order book after several transactions in the given order.
+    The spread is computed once, after all transactions were applied.
+
+    Args:
+        asks: Ask side.
+        bids: Bid side.
+        transactions: The raw or the parsed transactions.
+        to_xrp: If currency amount should be converted from drops to XRP.
+            Sides given as `OrderBookSide` keep the unit they were derived in.
+        currency_pair: Currency pair. Gets derived from the offers if None.
+            Defaults to None.
+
+    Raises:
+        ValueError: If the sides express XRP amounts in different units.
+
+    Returns:
+        The new order book, currency pair, last exchange rate and spread.
+    """
+    pair = (
+        currency_pair
+        if currency_pair is not None
+        else derive_currency_pair(asks=asks, bids=bids)
+    )
+    if isinstance(asks, OrderBookSide):
+        to_xrp = asks.unit == "XRP"
+    elif isinstance(bids, OrderBookSide):
+        to_xrp = bids.unit == "XRP"
+    if not isinstance(asks, OrderBookSide):
+        asks = derive_order_book_side(offers=asks, pair=pair, to_xrp=to_xrp)
+    if not isinstance(bids, OrderBookSide):
+        bids = derive_order_book_side(offers=bids, pair=pair, to_xrp=to_xrp)
+    if asks.unit != bids.unit:
+        raise ValueError(
+            f"Order book sides are in different units: {asks.unit} and {bids.unit}."
         )
-    for bid in bids:
-        if to_xrp:
-            bid["TakerGets"] = cast(
-                CURRENCY_AMOUNT_TYPE,
-                _format_drops_to_xrp(
-                    amount=cast(CURRENCY_AMOUNT_TYPE, bid["TakerGets"])
-                ),
-            )
-            bid["TakerPays"] = cast(
-                CURRENCY_AMOUNT_TYPE,
-                _format_drops_to_xrp(
-                    amount=cast(CURRENCY_AMOUNT_TYPE, bid["TakerPays"])
-                ),
+    exchange_rate = None
+    quoted_spread = None
+    for transaction in transactions:
+        new_exchange_rate = _apply_transaction(
+            asks=asks, bids=bids, transaction=transaction, pair=pair, to_xrp=to_xrp
+        )
+        if new_exchange_rate is not None:
+            exchange_rate = new_exchange_rate
+    if asks and bids:
+        quoted_spread = str(
+            calculate_spread(
+                ask_quality=asks.tip_quality(), bid_quality=bids.tip_quality()
             )
-        bid["quality"] = _derive_quality(
-            taker_gets=cast(CURRENCY_AMOUNT_TYPE, bid["TakerGets"]),
-            taker_pays=cast(CURRENCY_AMOUNT_TYPE, bid["TakerPays"]),
-            pair=pair,
         )
-    sorted_asks = list(
-        sorted(asks, key=lambda ask: Decimal(cast(str, ask["quality"])), reverse=False)
-    )
-    sorted_bids = list(
-        sorted(bids, key=lambda bid: Decimal(cast(str, bid["quality"])), reverse=True)
+    return (asks, bids, pair, exchange_rate, quoted_spread)
+
+
+def compute_final_order_book(
+    asks: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    bids: Union[ORDER_BOOK_SIDE_TYPE, OrderBookSide],
+    transaction: Optional[RawTxnType],
+    to_xrp: bool,
+    currency_pair: Optional[str] = None,
+) -> Tuple[OrderBookSide, OrderBookSide, str, Optional[str], Optional[str]]:
+    """
+    Compute the new order book.
+    Sides given as lists are derived first. Sides given as `OrderBookSide` are
+    expected to be derived already, so only the offers the transaction
+    affected are touched, in the unit the sides were derived in.
+
+    Args:
+        asks: Ask side.
+        bids: Bid side.
+        transaction: The raw transaction.
+        to_xrp: If currency amount should be converted from drops to XRP.
+        currency_pair: Currency pair. Gets derived from the offers if None.
+            Defaults to None.
+
+    Returns:
+        The new order book, currency pair, exchange rate and spread.
+    """
+    return compute_final_order_book_batch(
+        asks=asks,
+        bids=bids,
+        transactions=[transaction] if transaction is not None else [],
+        to_xrp=to_xrp,
+        currency_pair=currency_pair,
     )
-    if sorted_asks and sorted_bids:
-        quoted_spread = _calculate_spread(
-            tip_ask=sorted_asks[0], tip_bid=sorted_bids[0]
-        )
-    return (sorted_asks, sorted_bids, pair, exchange_rate, quoted_spread)
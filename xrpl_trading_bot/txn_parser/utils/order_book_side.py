@@ -0,0 +1,215 @@
+"""An order book side with its offers indexed for constant time lookups."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
+
+from xrpl_trading_bot.txn_parser.utils.amounts import Amount, Quality
+from xrpl_trading_bot.txn_parser.utils.types import XRP_UNIT_TYPE, Offer
+
+SORT_KEY_TYPE = Tuple[int, int]
+
+
+def _quality(offer: Offer) -> int:
+    """
+    Derives the exact quality of an offer from its `BookDirectory`.
+
+    Args:
+        offer: The offer.
+
+    Returns:
+        The encoded quality.
+    """
+    return Quality.from_book_directory(book_directory=offer.BookDirectory).value
+
+
+class OrderBookSide:
+    """
+    Ask or bid side of an order book.
+    The offers are kept sorted the way the ledger ranks them: by quality and,
+    for equal qualities, by the time they were added to the side.
+    They are also indexed by ledger index and by the transaction that last
+    modified them (`PreviousTxnID`, `PreviousTxnLgrSeq`), so an offer affected
+    by a transaction can be found without scanning the side.
+    XRP amounts of all offers are expressed in the side's `unit`.
+    """
+
+    def __init__(
+        self: OrderBookSide,
+        offers: Optional[Iterable[Offer]] = None,
+        unit: XRP_UNIT_TYPE = "drops",
+    ) -> None:
+        """
+        Args:
+            offers: The offers of the side in order. Defaults to None.
+            unit: The unit XRP amounts are expressed in. Defaults to drops.
+        """
+        self.unit = unit
+        """The unit XRP amounts are expressed in."""
+        self._sequence = count()
+        self.version = 0
+        """Counts the changes of the side, so derived data can tell if it is stale."""
+        self._offers: Dict[str, Offer] = {}
+        self._sort_keys: Dict[str, SORT_KEY_TYPE] = {}
+        self._previous_txns: Dict[Tuple[str, int], str] = {}
+        entries = []
+        for offer in offers if offers is not None else []:
+            sort_key = (_quality(offer=offer), next(self._sequence))
+            self._index(offer=offer, sort_key=sort_key)
+            entries.append((sort_key, offer))
+        entries.sort(key=lambda entry: entry[0])
+        self._keys: List[SORT_KEY_TYPE] = [entry[0] for entry in entries]
+        self._sorted_offers: List[Offer] = [entry[1] for entry in entries]
+
+    def __len__(self: OrderBookSide) -> int:
+        return len(self._sorted_offers)
+
+    def __iter__(self: OrderBookSide) -> Iterator[Offer]:
+        return iter(self._sorted_offers)
+
+    def __getitem__(self: OrderBookSide, position: int) -> Offer:
+        return self._sorted_offers[position]
+
+    def __eq__(self: OrderBookSide, other: object) -> bool:
+        if isinstance(other, OrderBookSide):
+            return (
+                self.unit == other.unit and self._sorted_offers == other._sorted_offers
+            )
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __repr__(self: OrderBookSide) -> str:
+        return f"OrderBookSide({self._sorted_offers!r})"
+
+    def _index(self: OrderBookSide, offer: Offer, sort_key: SORT_KEY_TYPE) -> None:
+        self.version += 1
+        self._offers[offer.index] = offer
+        self._sort_keys[offer.index] = sort_key
+        self._previous_txns[
+            (offer.PreviousTxnID, offer.PreviousTxnLgrSeq)
+        ] = offer.index
+
+    def _unindex(self: OrderBookSide, offer: Offer) -> SORT_KEY_TYPE:
+        self.version += 1
+        del self._offers[offer.index]
+        self._previous_txns.pop((offer.PreviousTxnID, offer.PreviousTxnLgrSeq), None)
+        return self._sort_keys.pop(offer.index)
+
+    def _insert(self: OrderBookSide, offer: Offer, sort_key: SORT_KEY_TYPE) -> None:
+        position = bisect_right(self._keys, sort_key)
+        self._keys.insert(position, sort_key)
+        self._sorted_offers.insert(position, offer)
+        self._index(offer=offer, sort_key=sort_key)
+
+    def _delete(self: OrderBookSide, offer: Offer) -> SORT_KEY_TYPE:
+        sort_key = self._unindex(offer=offer)
+        position = bisect_left(self._keys, sort_key)
+        del self._keys[position]
+        del self._sorted_offers[position]
+        return sort_key
+
+    def append(self: OrderBookSide, offer: Offer) -> None:
+        """
+        Adds an offer to the side behind all offers of the same quality.
+
+        Args:
+            offer: The offer.
+        """
+        self._insert(
+            offer=offer, sort_key=(_quality(offer=offer), next(self._sequence))
+        )
+
+    def find(
+        self: OrderBookSide,
+        index: Optional[str] = None,
+        identifiers: Optional[Union[Tuple[str, int], Tuple[None, None]]] = None,
+    ) -> Optional[Offer]:
+        """
+        Looks up an offer by its ledger index or, if the ledger index is unknown,
+        by the transaction that last modified it.
+
+        Args:
+            index: The offers ledger index. Defaults to None.
+            identifiers: `PreviousTxnID` and `PreviousTxnLgrSeq` of the offer.
+                Defaults to None.
+
+        Returns:
+            The offer or None if the side does not contain it.
+        """
+        if index is not None and index in self._offers:
+            return self._offers[index]
+        if identifiers is not None:
+            offer_index = self._previous_txns.get(cast(Tuple[str, int], identifiers))
+            if offer_index is not None:
+                return self._offers[offer_index]
+        return None
+
+    def replace(self: OrderBookSide, offer: Offer, new_offer: Offer) -> None:
+        """
+        Replaces an offer of the side with its new state.
+        The offer keeps its time priority.
+
+        Args:
+            offer: The offer that is part of the side.
+            new_offer: The new state of the offer.
+        """
+        assert new_offer.index == offer.index
+        quality, sequence = self._sort_keys[offer.index]
+        if _quality(offer=new_offer) == quality:
+            position = bisect_left(self._keys, (quality, sequence))
+            self._unindex(offer=offer)
+            self._index(offer=new_offer, sort_key=(quality, sequence))
+            self._sorted_offers[position] = new_offer
+        else:
+            self._delete(offer=offer)
+            self._insert(
+                offer=new_offer, sort_key=(_quality(offer=new_offer), sequence)
+            )
+
+    def remove(self: OrderBookSide, offer: Offer) -> None:
+        """
+        Removes an offer from the side.
+
+        Args:
+            offer: The offer that is part of the side.
+        """
+        self._delete(offer=offer)
+
+    def book_quality(self: OrderBookSide, position: int = 0) -> Quality:
+        """
+        The exact quality the offer at the given position was placed at,
+        as encoded in its book directory.
+
+        Args:
+            position: Position of the offer. Defaults to 0.
+
+        Returns:
+            The quality.
+        """
+        return Quality(value=self._keys[position][0])
+
+    def tip_quality(self: OrderBookSide) -> Amount:
+        """
+        The derived quality of the best offer of the side, as parsed when the
+        offer was built.
+
+        Returns:
+            The quality.
+        """
+        return self._sorted_offers[0].quality_amount
+
+    def to_list(
+        self: OrderBookSide, unit: Optional[XRP_UNIT_TYPE] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Args:
+            unit: The unit XRP amounts are expressed in. Defaults to the unit
+                of the side.
+
+        Returns:
+            The offers of the side as list of dictionaries.
+        """
+        return [offer.to_dict(unit=unit) for offer in self._sorted_offers]
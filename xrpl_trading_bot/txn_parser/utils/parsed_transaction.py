@@ -0,0 +1,309 @@
+"""A transaction that is validated, normalized and classified once."""
+
+from __future__ import annotations
+
+from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple, Union, cast
+
+from xrpl_trading_bot.txn_parser.utils.balance_changes_utils import (
+    compute_balance_changes,
+    parse_final_balance,
+    parse_quantities,
+)
+from xrpl_trading_bot.txn_parser.utils.binary import (
+    decode_binary_meta,
+    decode_binary_transaction,
+    get_transaction_blob,
+    hash_transaction_blob,
+    is_binary_transaction,
+)
+from xrpl_trading_bot.txn_parser.utils.order_book_changes_utils import (
+    NormalizedOffer,
+    OrderChange,
+    _normalize_offer_nodes,
+    compute_order_book_changes,
+    derive_affected_currency_pairs,
+)
+from xrpl_trading_bot.txn_parser.utils.transaction_data_utils import (
+    normalize_node,
+    normalize_transaction,
+    validate_transaction_fields,
+)
+from xrpl_trading_bot.txn_parser.utils.types import (
+    AccountBalance,
+    BinaryTxnType,
+    NormalizedNode,
+    RawTxnType,
+    SubscriptionRawTxnType,
+    XRPLTxnFieldsException,
+)
+
+
+def _select(
+    balances: Dict[str, List[AccountBalance]], addresses: AbstractSet[str]
+) -> Dict[str, List[AccountBalance]]:
+    return {
+        address: account_balances
+        for address, account_balances in balances.items()
+        if address in addresses
+    }
+
+
+class ParsedTransaction:
+    """
+    A transaction parsed once per received message and shared by all of its
+    consumers. The transaction is validated and normalized when the object is
+    built, and its affected nodes are classified into offers, account roots
+    and trust lines in a single pass. Normalized offers, balance changes,
+    final balances and order changes are computed on first use and cached.
+
+    Transactions received in binary mode only get their metadata decoded, as
+    offers and balances are derived from the metadata alone. The transaction
+    blob is decoded when `fields` is first read.
+    """
+
+    def __init__(
+        self: ParsedTransaction,
+        transaction: Union[RawTxnType, SubscriptionRawTxnType, BinaryTxnType],
+    ) -> None:
+        """
+        Args:
+            transaction: The raw transaction data in JSON or in binary mode.
+
+        Raises:
+            XRPLTxnFieldsException: If the raw transaction data is malformed.
+        """
+        self._tx_blob: Optional[str] = None
+        self._fields: Optional[Dict[str, Any]] = None
+        if is_binary_transaction(transaction_data=transaction):
+            transaction = self._decode_binary(transaction=transaction)
+        else:
+            validate_transaction_fields(
+                transaction_data=cast(
+                    Union[RawTxnType, SubscriptionRawTxnType], transaction
+                )
+            )
+            if "transaction" in transaction:
+                transaction = normalize_transaction(
+                    transaction_data=cast(SubscriptionRawTxnType, transaction)
+                )
+        self.transaction: RawTxnType = cast(RawTxnType, transaction)
+        """
+        The transaction data in standard format. Holds only the hash, the
+        ledger index and the metadata for transactions received in binary mode.
+        """
+        meta = self.transaction["meta"]
+        self.successful = meta.get("TransactionResult") == "tesSUCCESS"
+        """If the transaction succeeded."""
+        self.offer_nodes: List[Dict[str, Any]] = []
+        """The affected nodes of offers."""
+        self.balance_nodes: List[Dict[str, Any]] = []
+        """The affected nodes of account roots and trust lines, in order."""
+        self.affected_currency_pairs: Set[str] = derive_affected_currency_pairs(
+            transaction=self.transaction
+        )
+        """
+        The currency pairs of all order books the transaction has touched, in
+        both orientations. Empty if the transaction failed.
+        """
+        for affected_node in meta["AffectedNodes"]:
+            node = cast(Dict[str, Any], list(affected_node.values())[0])
+            entry_type = node["LedgerEntryType"]
+            if entry_type == "Offer":
+                self.offer_nodes.append(affected_node)
+            elif entry_type in ("AccountRoot", "RippleState"):
+                self.balance_nodes.append(affected_node)
+        self._offers: Dict[Tuple[str, bool], List[NormalizedOffer]] = {}
+        self._normalized_offer_nodes: Optional[List[NormalizedNode]] = None
+        self._normalized_balance_nodes: Optional[List[NormalizedNode]] = None
+        self._balance_changes: Optional[Dict[str, List[AccountBalance]]] = None
+        self._final_balances: Optional[Dict[str, List[AccountBalance]]] = None
+        self._order_changes: Optional[List[OrderChange]] = None
+
+    def _decode_binary(self: ParsedTransaction, transaction: Any) -> RawTxnType:
+        self._tx_blob = get_transaction_blob(transaction_data=transaction)
+        if "ledger_index" not in transaction:
+            raise XRPLTxnFieldsException(
+                "Malformed transaction fields: Transaction field 'ledger_index' "
+                "must be included."
+            )
+        if "hash" in transaction:
+            tx_hash = transaction["hash"]
+        elif self._tx_blob is not None:
+            tx_hash = hash_transaction_blob(tx_blob=self._tx_blob)
+        else:
+            raise XRPLTxnFieldsException(
+                "Malformed transaction fields: Transaction field 'hash' or "
+                "'tx_blob' must be included."
+            )
+        meta = decode_binary_meta(transaction_data=transaction)
+        if not meta.get("AffectedNodes"):
+            raise XRPLTxnFieldsException(
+                "Malformed transaction fields: No nodes provided."
+            )
+        return cast(
+            RawTxnType,
+            {
+                "hash": tx_hash,
+                "ledger_index": transaction["ledger_index"],
+                "meta": meta,
+            },
+        )
+
+    @classmethod
+    def of(
+        cls,
+        transaction: Union[
+            RawTxnType, SubscriptionRawTxnType, BinaryTxnType, ParsedTransaction
+        ],
+    ) -> ParsedTransaction:
+        """
+        Args:
+            transaction: The raw or the parsed transaction data.
+
+        Returns:
+            The parsed transaction.
+        """
+        if isinstance(transaction, ParsedTransaction):
+            return transaction
+        return cls(transaction=transaction)
+
+    @property
+    def hash(self: ParsedTransaction) -> str:
+        """The transaction hash."""
+        return self.transaction["hash"]
+
+    @property
+    def ledger_index(self: ParsedTransaction) -> int:
+        """The ledger the transaction was included in."""
+        return int(self.transaction["ledger_index"])
+
+    @property
+    def transaction_index(self: ParsedTransaction) -> int:
+        """The position of the transaction in its ledger."""
+        return self.transaction["meta"]["TransactionIndex"]
+
+    @property
+    def fields(self: ParsedTransaction) -> Dict[str, Any]:
+        """
+        The transaction fields, e.g. `Account` and `TransactionType`.
+        Decoded from the transaction blob on first use in binary mode.
+
+        Raises:
+            XRPLTxnFieldsException: If the transaction blob is missing or
+                malformed.
+        """
+        if self._fields is None:
+            self._fields = (
+                decode_binary_transaction(transaction_data={"tx_blob": self._tx_blob})
+                if self._tx_blob is not None
+                else cast(Dict[str, Any], self.transaction)
+            )
+        return self._fields
+
+    def offers(
+        self: ParsedTransaction, currency_pair: str, to_xrp: bool
+    ) -> List[NormalizedOffer]:
+        """
+        Args:
+            currency_pair: The currency pair the qualities are derived for.
+            to_xrp: If currency amount should be converted from drops to XRP.
+
+        Returns:
+            The normalized offers the transaction has affected.
+        """
+        key = (currency_pair, to_xrp)
+        if key not in self._offers:
+            self._offers[key] = _normalize_offer_nodes(
+                offer_nodes=self.offer_nodes,
+                hash=self.hash,
+                ledger_index=self.transaction["ledger_index"],
+                currency_pair=currency_pair,
+                to_xrp=to_xrp,
+                owner_funds=self.transaction.get("owner_funds"),
+            )
+        return self._offers[key]
+
+    @property
+    def normalized_balance_nodes(self: ParsedTransaction) -> List[NormalizedNode]:
+        """The normalized nodes of account roots and trust lines."""
+        if self._normalized_balance_nodes is None:
+            self._normalized_balance_nodes = [
+                normalize_node(affected_node=node) for node in self.balance_nodes
+            ]
+        return self._normalized_balance_nodes
+
+    @property
+    def normalized_offer_nodes(self: ParsedTransaction) -> List[NormalizedNode]:
+        """The normalized nodes of offers."""
+        if self._normalized_offer_nodes is None:
+            self._normalized_offer_nodes = [
+                normalize_node(affected_node=node) for node in self.offer_nodes
+            ]
+        return self._normalized_offer_nodes
+
+    @property
+    def balance_changes(self: ParsedTransaction) -> Dict[str, List[AccountBalance]]:
+        """The balance changes grouped by account."""
+        if self._balance_changes is None:
+            self._balance_changes = parse_quantities(
+                nodes=self.normalized_balance_nodes,
+                value_parser=compute_balance_changes,
+            )
+        return self._balance_changes
+
+    @property
+    def final_balances(self: ParsedTransaction) -> Dict[str, List[AccountBalance]]:
+        """The final balances grouped by account."""
+        if self._final_balances is None:
+            self._final_balances = parse_quantities(
+                nodes=self.normalized_balance_nodes,
+                value_parser=parse_final_balance,
+            )
+        return self._final_balances
+
+    def balance_changes_of(
+        self: ParsedTransaction, addresses: AbstractSet[str]
+    ) -> Dict[str, List[AccountBalance]]:
+        """
+        Args:
+            addresses: The addresses of interest.
+
+        Returns:
+            The balance changes of the addresses. Nodes of other accounts are
+            skipped before their balances are parsed.
+        """
+        if self._balance_changes is not None:
+            return _select(balances=self._balance_changes, addresses=addresses)
+        return parse_quantities(
+            nodes=self.normalized_balance_nodes,
+            value_parser=compute_balance_changes,
+            addresses=addresses,
+        )
+
+    def final_balances_of(
+        self: ParsedTransaction, addresses: AbstractSet[str]
+    ) -> Dict[str, List[AccountBalance]]:
+        """
+        Args:
+            addresses: The addresses of interest.
+
+        Returns:
+            The final balances of the addresses. Nodes of other accounts are
+            skipped before their balances are parsed.
+        """
+        if self._final_balances is not None:
+            return _select(balances=self._final_balances, addresses=addresses)
+        return parse_quantities(
+            nodes=self.normalized_balance_nodes,
+            value_parser=parse_final_balance,
+            addresses=addresses,
+        )
+
+    @property
+    def order_changes(self: ParsedTransaction) -> List[OrderChange]:
+        """The changes of all offers the transaction has affected."""
+        if self._order_changes is None:
+            self._order_changes = compute_order_book_changes(
+                nodes=self.normalized_offer_nodes
+            )
+        return self._order_changes
@@ -5,10 +5,8 @@ from __future__ import annotations
 from typing import Any, Dict, List, Union, cast
 
 from pydash import map_  # type: ignore
-from typing_extensions import Literal
 
 from xrpl_trading_bot.txn_parser.utils.types import (
-    AccountBalance,
     NormalizedFields,
     NormalizedNode,
     RawTxnType,
@@ -89,61 +87,9 @@ def normalize_fields(
 
     Returns:
         NormalizedFields:
-            The full field state with all its fields as objects.
+            A view of the field state that reads its fields when accessed.
     """
-    balance = fields["Balance"] if "Balance" in fields else None
-    low_limit = fields["LowLimit"] if "LowLimit" in fields else None
-    high_limit = fields["HighLimit"] if "HighLimit" in fields else None
-    taker_gets = fields["TakerGets"] if "TakerGets" in fields else None
-    taker_pays = fields["TakerPays"] if "TakerPays" in fields else None
-    account = cast(str, fields["Account"]) if "Account" in fields else None
-    sequence = cast(int, fields["Sequence"]) if "Sequence" in fields else None
-    flags = cast(int, fields["Flags"]) if "Flags" in fields else None
-    expiration = cast(int, fields["Expiration"]) if "Expiration" in fields else None
-
-    field_state = NormalizedFields(
-        Balance=AccountBalance(
-            counterparty=balance["issuer"],
-            currency=balance["currency"],
-            value=balance["value"],
-        )
-        if isinstance(balance, dict)
-        else balance,
-        LowLimit=AccountBalance(
-            counterparty=low_limit["issuer"],
-            currency=low_limit["currency"],
-            value=low_limit["value"],
-        )
-        if isinstance(low_limit, dict)
-        else low_limit,
-        HighLimit=AccountBalance(
-            counterparty=high_limit["issuer"],
-            currency=high_limit["currency"],
-            value=high_limit["value"],
-        )
-        if isinstance(high_limit, dict)
-        else high_limit,
-        TakerGets=AccountBalance(
-            counterparty=taker_gets["issuer"],
-            currency=taker_gets["currency"],
-            value=taker_gets["value"],
-        )
-        if isinstance(taker_gets, dict)
-        else taker_gets,
-        TakerPays=AccountBalance(
-            counterparty=taker_pays["issuer"],
-            currency=taker_pays["currency"],
-            value=taker_pays["value"],
-        )
-        if isinstance(taker_pays, dict)
-        else taker_pays,
-        Account=account,
-        Sequence=sequence,
-        Flags=flags,
-        Expiration=expiration,
-    )
-
-    return field_state
+    return NormalizedFields(fields=fields)
 
 
 def normalize_node(affected_node: Dict[str, Any]) -> NormalizedNode:
@@ -156,39 +102,10 @@ def normalize_node(affected_node: Dict[str, Any]) -> NormalizedNode:
 
     Returns:
         NormalizedNode:
-            NormalizedNode object.
+            A view of the affected node that normalizes its fields when
+            accessed.
     """
-    diff_type = cast(
-        Literal["ModifiedNode", "CreatedNode", "DeletedNode"],
-        list(affected_node.keys())[0],
-    )
-    node_fields = list(affected_node.values())[0]
-
-    ledger_entry_type = str(node_fields["LedgerEntryType"])
-    ledger_index = str(node_fields["LedgerIndex"])
-
-    new_fields = None
-    if "NewFields" in node_fields:
-        new_fields = normalize_fields(fields=node_fields["NewFields"])
-
-    final_fields = None
-    if "FinalFields" in node_fields:
-        final_fields = normalize_fields(fields=node_fields["FinalFields"])
-
-    previous_fields = None
-    if "PreviousFields" in node_fields:
-        previous_fields = normalize_fields(fields=node_fields["PreviousFields"])
-
-    normalized_node = NormalizedNode(
-        diff_type=diff_type,
-        entry_type=ledger_entry_type,
-        ledger_index=ledger_index,
-        new_fields=new_fields,
-        final_fields=final_fields,
-        previous_fields=previous_fields,
-    )
-
-    return normalized_node
+    return NormalizedNode(affected_node=affected_node)
 
 
 def normalize_nodes(
@@ -2,14 +2,40 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from decimal import Decimal
+from sys import intern
+from typing import Any, Dict, List, Optional, Union, cast
 
 from typing_extensions import Literal, TypedDict
 from xrpl.constants import XRPLException
 
+from xrpl_trading_bot.txn_parser.utils.amounts import Amount
+
 CURRENCY_AMOUNT_TYPE = Union[Dict[str, str], str]
+OFFER_FIELDS = (
+    "Account",
+    "BookDirectory",
+    "BookNode",
+    "Flags",
+    "OwnerNode",
+    "PreviousTxnID",
+    "PreviousTxnLgrSeq",
+    "Sequence",
+    "TakerGets",
+    "TakerPays",
+    "index",
+    "quality",
+    "LedgerEntryType",
+    "Expiration",
+    "owner_funds",
+    "taker_gets_funded",
+    "taker_pays_funded",
+)
 ORDER_BOOK_SIDE_TYPE = List[Dict[str, Union[str, int, Dict[str, str]]]]
+XRP_UNIT_TYPE = Literal["drops", "XRP"]
+"""The unit XRP amounts are expressed in. The ledger expresses them in drops."""
+XRP_AMOUNT_FIELDS = ("TakerGets", "TakerPays", "taker_gets_funded", "taker_pays_funded")
+"""The offer fields that hold a currency amount."""
 
 
 class MetaDataType(TypedDict):
@@ -60,49 +86,423 @@ class SubscriptionRawTxnType(TypedDict):
     transaction: TransactionFieldsType
 
 
-@dataclass
+def _to_balance(
+    amount: Optional[CURRENCY_AMOUNT_TYPE],
+) -> Optional[Union[AccountBalance, str]]:
+    if isinstance(amount, dict):
+        return AccountBalance(
+            counterparty=amount["issuer"],
+            currency=amount["currency"],
+            value=amount["value"],
+        )
+    return amount
+
+
+BinaryTxnType = Dict[str, Any]
+"""
+Raw transaction data received in binary mode, with the hex blobs `meta` or
+`meta_blob` and `tx` or `tx_blob`.
+"""
+
+
 class NormalizedFields:
-    """NormalizedFields"""
+    """
+    A view of the 'NewFields', 'FinalFields' or 'PreviousFields' of a node.
+    The fields are read from the raw metadata when they are accessed, so a node
+    only pays for the fields its parser reads. Missing fields are None.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self: NormalizedFields, fields: Dict[str, Any]) -> None:
+        """
+        Args:
+            fields: The raw fields of the node.
+        """
+        self.fields = fields
+        """The raw fields of the node."""
+
+    @property
+    def Balance(self: NormalizedFields) -> Optional[Union[AccountBalance, str]]:
+        """The balance of an account root or trust line."""
+        return _to_balance(amount=self.fields.get("Balance"))
+
+    @property
+    def LowLimit(self: NormalizedFields) -> Optional[Union[AccountBalance, str]]:
+        """The limit of the low account of a trust line."""
+        return _to_balance(amount=self.fields.get("LowLimit"))
+
+    @property
+    def HighLimit(self: NormalizedFields) -> Optional[Union[AccountBalance, str]]:
+        """The limit of the high account of a trust line."""
+        return _to_balance(amount=self.fields.get("HighLimit"))
+
+    @property
+    def TakerGets(self: NormalizedFields) -> Optional[Union[AccountBalance, str]]:
+        """The amount the taker of an offer gets."""
+        return _to_balance(amount=self.fields.get("TakerGets"))
+
+    @property
+    def TakerPays(self: NormalizedFields) -> Optional[Union[AccountBalance, str]]:
+        """The amount the taker of an offer pays."""
+        return _to_balance(amount=self.fields.get("TakerPays"))
+
+    @property
+    def Account(self: NormalizedFields) -> Optional[str]:
+        """The account."""
+        return self.fields.get("Account")
+
+    @property
+    def Sequence(self: NormalizedFields) -> Optional[int]:
+        """The sequence."""
+        return self.fields.get("Sequence")
+
+    @property
+    def Flags(self: NormalizedFields) -> Optional[int]:
+        """The flags."""
+        return self.fields.get("Flags")
+
+    @property
+    def Expiration(self: NormalizedFields) -> Optional[Union[int, str]]:
+        """The expiration of an offer."""
+        return self.fields.get("Expiration")
+
+    def __eq__(self: NormalizedFields, other: object) -> bool:
+        if not isinstance(other, NormalizedFields):
+            return NotImplemented
+        return self.fields == other.fields
 
-    Balance: Optional[Union[AccountBalance, str]] = None
-    LowLimit: Optional[Union[AccountBalance, str]] = None
-    HighLimit: Optional[Union[AccountBalance, str]] = None
-    TakerGets: Optional[Union[AccountBalance, str]] = None
-    TakerPays: Optional[Union[AccountBalance, str]] = None
-    Account: Optional[str] = None
-    Sequence: Optional[int] = None
-    Flags: Optional[int] = None
-    Expiration: Optional[Union[int, str]] = None
+    def __repr__(self: NormalizedFields) -> str:
+        return f"NormalizedFields({self.fields!r})"
 
 
-@dataclass
 class NormalizedNode:
-    """A standard format for nodes."""
-
-    diff_type: Literal["ModifiedNode", "CreatedNode", "DeletedNode"]
-    """Node type (ModifiedNode, CreatedNode or DeletedNode)"""
-    entry_type: str
-    """Entry type (e.g. Offer, AccountRoot, …)."""
-    ledger_index: str
-    """Ledger index."""
-    new_fields: Optional[NormalizedFields] = None
-    """New fields created by the transcation."""
-    final_fields: Optional[NormalizedFields] = None
-    """Fields after the transaction occurred."""
-    previous_fields: Optional[NormalizedFields] = None
-    """Fields before the transaction occurred."""
-
-
-@dataclass
+    """
+    A standard format for nodes. The node is a view of the raw affected node,
+    its fields are only normalized when they are accessed.
+    """
+
+    __slots__ = ("diff_type", "node")
+
+    def __init__(self: NormalizedNode, affected_node: Dict[str, Any]) -> None:
+        """
+        Args:
+            affected_node: The raw affected node, e.g. `{"ModifiedNode": {...}}`.
+        """
+        diff_type, node = next(iter(affected_node.items()))
+        self.diff_type = cast(
+            Literal["ModifiedNode", "CreatedNode", "DeletedNode"], diff_type
+        )
+        """Node type (ModifiedNode, CreatedNode or DeletedNode)"""
+        self.node: Dict[str, Any] = node
+        """The raw node."""
+
+    @property
+    def entry_type(self: NormalizedNode) -> str:
+        """Entry type (e.g. Offer, AccountRoot, …)."""
+        return str(self.node["LedgerEntryType"])
+
+    @property
+    def ledger_index(self: NormalizedNode) -> str:
+        """Ledger index."""
+        return str(self.node["LedgerIndex"])
+
+    @property
+    def new_fields(self: NormalizedNode) -> Optional[NormalizedFields]:
+        """New fields created by the transcation."""
+        return self._fields(name="NewFields")
+
+    @property
+    def final_fields(self: NormalizedNode) -> Optional[NormalizedFields]:
+        """Fields after the transaction occurred."""
+        return self._fields(name="FinalFields")
+
+    @property
+    def previous_fields(self: NormalizedNode) -> Optional[NormalizedFields]:
+        """Fields before the transaction occurred."""
+        return self._fields(name="PreviousFields")
+
+    def _fields(self: NormalizedNode, name: str) -> Optional[NormalizedFields]:
+        fields = self.node.get(name)
+        return NormalizedFields(fields=fields) if fields is not None else None
+
+    def __eq__(self: NormalizedNode, other: object) -> bool:
+        if not isinstance(other, NormalizedNode):
+            return NotImplemented
+        return self.diff_type == other.diff_type and self.node == other.node
+
+    def __repr__(self: NormalizedNode) -> str:
+        return f"NormalizedNode({{{self.diff_type!r}: {self.node!r}}})"
+
+
 class AccountBalance:
     """A accounts balance."""
 
-    counterparty: str
-    """Counterparty"""
-    currency: str
-    """Currency"""
-    value: str
-    """Value"""
+    __slots__ = ("counterparty", "currency", "value")
+
+    def __init__(
+        self: AccountBalance, counterparty: str, currency: str, value: str
+    ) -> None:
+        """
+        Args:
+            counterparty: Counterparty, empty for XRP.
+            currency: Currency.
+            value: Value.
+        """
+        self.counterparty = counterparty
+        """Counterparty"""
+        self.currency = currency
+        """Currency"""
+        self.value = value
+        """Value"""
+
+    def to_dict(self: AccountBalance) -> Dict[str, str]:
+        """
+        Returns:
+            The balance as dictionary.
+        """
+        return {
+            "counterparty": self.counterparty,
+            "currency": self.currency,
+            "value": self.value,
+        }
+
+    def __eq__(self: AccountBalance, other: object) -> bool:
+        if isinstance(other, AccountBalance):
+            return (
+                self.counterparty == other.counterparty
+                and self.currency == other.currency
+                and self.value == other.value
+            )
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self: AccountBalance) -> str:
+        return (
+            f"AccountBalance(counterparty={self.counterparty!r}, "
+            f"currency={self.currency!r}, value={self.value!r})"
+        )
+
+
+def _intern_amount(amount: CURRENCY_AMOUNT_TYPE) -> CURRENCY_AMOUNT_TYPE:
+    """
+    Interns the currency and issuer of an issued currency amount, so offers of the
+    same order book share these strings.
+
+    Args:
+        amount: A currency amount.
+
+    Returns:
+        The currency amount.
+    """
+    if isinstance(amount, dict):
+        return {
+            "currency": intern(amount["currency"]),
+            "issuer": intern(amount["issuer"]),
+            "value": amount["value"],
+        }
+    return amount
+
+
+def xrp_unit(to_xrp: bool) -> XRP_UNIT_TYPE:
+    """
+    Args:
+        to_xrp: If XRP amounts are converted from drops to XRP.
+
+    Returns:
+        The unit XRP amounts are expressed in.
+    """
+    return "XRP" if to_xrp else "drops"
+
+
+def convert_xrp_amount(
+    amount: Optional[CURRENCY_AMOUNT_TYPE],
+    unit: XRP_UNIT_TYPE,
+    new_unit: XRP_UNIT_TYPE,
+) -> Optional[CURRENCY_AMOUNT_TYPE]:
+    """
+    Converts an XRP amount between drops and XRP. Issued currency amounts are
+    returned as they are.
+
+    Args:
+        amount: A currency amount.
+        unit: The unit the amount is expressed in.
+        new_unit: The unit the amount gets expressed in.
+
+    Returns:
+        The converted currency amount.
+    """
+    if amount is None or isinstance(amount, dict) or unit == new_unit:
+        return amount
+    return "{:f}".format(Decimal(amount).scaleb(-6 if new_unit == "XRP" else 6))
+
+
+def convert_offer_fields(
+    offer: Dict[str, Any], unit: XRP_UNIT_TYPE, new_unit: XRP_UNIT_TYPE
+) -> Dict[str, Any]:
+    """
+    Converts the XRP amounts of an offer in dictionary form between drops and XRP.
+
+    Args:
+        offer: The offer fields.
+        unit: The unit the XRP amounts are expressed in.
+        new_unit: The unit the XRP amounts get expressed in.
+
+    Returns:
+        The offer fields with converted XRP amounts.
+    """
+    if unit == new_unit:
+        return offer
+    offer = dict(offer)
+    for field in XRP_AMOUNT_FIELDS:
+        if field in offer:
+            offer[field] = convert_xrp_amount(
+                amount=offer[field], unit=unit, new_unit=new_unit
+            )
+    if "owner_funds" in offer and isinstance(offer["TakerGets"], str):
+        offer["owner_funds"] = convert_xrp_amount(
+            amount=offer["owner_funds"], unit=unit, new_unit=new_unit
+        )
+    return offer
+
+
+class Offer:
+    """
+    An offer of an order book side. The record only holds the offer fields,
+    the dictionary form of the offer is built by `to_dict` for exporting.
+    XRP amounts are expressed in the offer's `unit`. The amounts and the
+    quality are parsed into `Amount` once when the record is built.
+    """
+
+    __slots__ = OFFER_FIELDS + (
+        "unit",
+        "taker_gets_amount",
+        "taker_pays_amount",
+        "quality_amount",
+    )
+
+    Account: str
+    BookDirectory: str
+    BookNode: str
+    Flags: Union[int, str]
+    OwnerNode: str
+    PreviousTxnID: str
+    PreviousTxnLgrSeq: int
+    Sequence: Union[int, str]
+    TakerGets: CURRENCY_AMOUNT_TYPE
+    TakerPays: CURRENCY_AMOUNT_TYPE
+    index: str
+    quality: str
+    LedgerEntryType: str
+    Expiration: Optional[int]
+    owner_funds: Optional[str]
+    taker_gets_funded: Optional[CURRENCY_AMOUNT_TYPE]
+    taker_pays_funded: Optional[CURRENCY_AMOUNT_TYPE]
+    unit: XRP_UNIT_TYPE
+    taker_gets_amount: Amount
+    taker_pays_amount: Amount
+    quality_amount: Amount
+
+    def __init__(
+        self: Offer,
+        Account: str,
+        BookDirectory: str,
+        BookNode: str,
+        Flags: Union[int, str],
+        OwnerNode: str,
+        PreviousTxnID: str,
+        PreviousTxnLgrSeq: int,
+        Sequence: Union[int, str],
+        TakerGets: CURRENCY_AMOUNT_TYPE,
+        TakerPays: CURRENCY_AMOUNT_TYPE,
+        index: str,
+        quality: str,
+        LedgerEntryType: str = "Offer",
+        Expiration: Optional[int] = None,
+        owner_funds: Optional[str] = None,
+        taker_gets_funded: Optional[CURRENCY_AMOUNT_TYPE] = None,
+        taker_pays_funded: Optional[CURRENCY_AMOUNT_TYPE] = None,
+        unit: XRP_UNIT_TYPE = "drops",
+        taker_gets_amount: Optional[Amount] = None,
+        taker_pays_amount: Optional[Amount] = None,
+    ) -> None:
+        self.Account = intern(Account)
+        self.BookDirectory = BookDirectory
+        self.BookNode = BookNode
+        self.Flags = Flags
+        self.OwnerNode = OwnerNode
+        self.PreviousTxnID = PreviousTxnID
+        self.PreviousTxnLgrSeq = PreviousTxnLgrSeq
+        self.Sequence = Sequence
+        self.TakerGets = _intern_amount(amount=TakerGets)
+        self.TakerPays = _intern_amount(amount=TakerPays)
+        self.index = index
+        self.quality = quality
+        self.LedgerEntryType = LedgerEntryType
+        self.Expiration = Expiration
+        self.owner_funds = owner_funds
+        self.taker_gets_funded = taker_gets_funded
+        self.taker_pays_funded = taker_pays_funded
+        self.unit = unit
+        self.taker_gets_amount = (
+            taker_gets_amount
+            if taker_gets_amount is not None
+            else Amount.from_currency_amount(amount=self.TakerGets)
+        )
+        self.taker_pays_amount = (
+            taker_pays_amount
+            if taker_pays_amount is not None
+            else Amount.from_currency_amount(amount=self.TakerPays)
+        )
+        self.quality_amount = Amount.from_value(value=quality)
+
+    @classmethod
+    def from_dict(cls, offer: Dict[str, Any]) -> Offer:
+        """
+        Builds the record of an offer in dictionary form, e.g. from a snapshot.
+        XRP amounts are taken as drops, the way the ledger expresses them.
+
+        Args:
+            offer: The offer.
+
+        Returns:
+            The offer record.
+        """
+        return cls(**{field: offer[field] for field in OFFER_FIELDS if field in offer})
+
+    def to_dict(self: Offer, unit: Optional[XRP_UNIT_TYPE] = None) -> Dict[str, Any]:
+        """
+        Args:
+            unit: The unit XRP amounts are expressed in. Defaults to the unit
+                of the offer.
+
+        Returns:
+            The offer as dictionary without the fields that are not set.
+        """
+        offer = {
+            field: getattr(self, field)
+            for field in OFFER_FIELDS
+            if getattr(self, field) is not None
+        }
+        if unit is None:
+            return offer
+        return convert_offer_fields(offer=offer, unit=self.unit, new_unit=unit)
+
+    def __getitem__(self: Offer, field: str) -> Any:
+        if field not in OFFER_FIELDS or getattr(self, field) is None:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __eq__(self: Offer, other: object) -> bool:
+        if isinstance(other, Offer):
+            return self.unit == other.unit and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self: Offer) -> str:
+        return f"Offer({self.to_dict()!r})"
 
 
 class XRPLTxnFieldsException(XRPLException):